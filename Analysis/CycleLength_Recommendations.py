@@ -1,60 +1,63 @@
 import streamlit as st
 import pandas as pd
-from chart_components.title_section import find_column
-from helpers.reporting import get_hourly_cycle_length, get_existing_cycle_length, filter_by_period
+from helpers.schema import frame_schema
+from analytics import PERIOD_LABELS, period_key as get_period_key, hourly_recommendations, recommendation_summary, \
+    filter_by_dates, DEFAULT_LANES, LOST_TIME, SATURATION_FLOW, MIN_CYCLE, MAX_CYCLE, CYCLE_STEP
+
+# Presentation of the analytics status codes
+STATUS_HTML = {
+    "OPTIMAL": '<span style="color: #51CF66; font-weight: bold;">✅ OPTIMAL</span>',
+    "REDUCE": '<span style="color: #FF6B6B; font-weight: bold;">⬇️ REDUCE</span>',
+    "INCREASE": '<span style="color: #4ECDC4; font-weight: bold;">⬆️ INCREASE</span>',
+    "ADJUST": '<span style="color: #FFE66D; font-weight: bold;">⚠️ ADJUST</span>',
+}
 
 ## == CREATE FUNCTION FOR TOGGLE ==
-def render_volume_analysis(df, time_period, direction):
+def render_volume_analysis(df, time_period, direction, webster_cycles=None, dates=None):
     """Render the complete volume analysis section"""
     show_cycle_length = st.toggle("🚦 Get Cycle Length Recommendations", value=False)
 
     if show_cycle_length:
-        render_cycle_length_analysis(df, time_period, direction)
+        render_cycle_length_analysis(df, time_period, direction, webster_cycles, dates)
     else:
         render_volume_summary(df)
 
 ## == CREATE THE TABLE ==
-def render_cycle_length_analysis(df, time_period, direction):
-    """Render cycle length analysis section"""
+def render_cycle_length_analysis(df, time_period, direction, webster_cycles=None, dates=None):
+    """Render cycle length analysis section.
+
+    ``dates`` is the (start, end) days analysed (inclusive); ``webster_cycles`` is an optional hour-of-day
+    (cycles, flow ratios) profile averaged over the same days.
+    """
     st.markdown("### 🚦 Cycle Length Recommendations - Hourly Analysis")
     st.markdown(f"**Time Period:** {time_period} | **Direction:** {direction}")
 
-    # --- 1. Find the time column flexibly ---
-    time_col = None
-    possible_time_cols = ['Time', 'time', 'hour', 'Hour', 'TIME', 'DateTime', 'datetime']
-
-    # Direct match first
-    for col_name in possible_time_cols:
-        if col_name in df.columns:
-            time_col = col_name
-            break
-    # Try fuzzy search if not found
-    if not time_col:
-        time_col = find_column(df, ['time', 'hour', 'datetime'])
-    # Last-ditch: any column containing time/hour/date in name and is datetime-convertible
-    if not time_col:
-        for col in df.columns:
-            if 'time' in col.lower() or 'hour' in col.lower() or 'date' in col.lower():
-                try:
-                    pd.to_datetime(df[col].iloc[0])
-                    time_col = col
-                    break
-                except:
-                    continue
+    # --- 1. Column roles (time, NB, SB) resolved once per set of column names ---
+    schema = frame_schema(df)
+    time_col = schema["time"]
     if not time_col:
         st.error("❌ No time column found. Please ensure your data has a time/hour column.")
         st.error(f"Available columns: {list(df.columns)}")
         st.stop()
 
-    # --- 2. Find volume column(s) based on direction ---
+    # --- 2. Make sure time is datetime ---
+    if not pd.api.types.is_datetime64_any_dtype(df[time_col]):
+        try:
+            df[time_col] = pd.to_datetime(df[time_col])
+        except:
+            st.error(f"❌ Cannot convert '{time_col}' to datetime format.")
+            st.stop()
+
+    # --- 3. Keep the selected days (the days the Webster column is averaged over) ---
+    if dates is not None:
+        df = filter_by_dates(df, time_col, *dates).copy()
+        if df.empty:
+            st.warning("⚠️ No volume data for the selected dates.")
+            return
+
+    # --- 4. Find volume column(s) based on direction ---
     if direction == "NB":
-        vol_col = find_column(df, ['northbound', 'NB', 'north'])
-        if not vol_col:
-            # Try fuzzy match: search for any column containing 'north'
-            for col in df.columns:
-                if 'north' in col.lower():
-                    vol_col = col
-                    break
+        vol_col = schema["nb"]
         if not vol_col:
             st.error("❌ Cannot find Northbound volume column.")
             st.info(f"Columns: {list(df.columns)}")
@@ -62,12 +65,7 @@ def render_cycle_length_analysis(df, time_period, direction):
         st.info(f"Using Northbound column: {vol_col}")
 
     elif direction == "SB":
-        vol_col = find_column(df, ['southbound', 'SB', 'south'])
-        if not vol_col:
-            for col in df.columns:
-                if 'south' in col.lower():
-                    vol_col = col
-                    break
+        vol_col = schema["sb"]
         if not vol_col:
             st.error("❌ Cannot find Southbound volume column.")
             st.info(f"Columns: {list(df.columns)}")
@@ -75,20 +73,8 @@ def render_cycle_length_analysis(df, time_period, direction):
         st.info(f"Using Southbound column: {vol_col}")
 
     elif direction == "Both":  # Only sum when "Both" is selected
-        nb_col = find_column(df, ['northbound', 'NB', 'north'])
-        sb_col = find_column(df, ['southbound', 'SB', 'south'])
-        # Fuzzy for NB
-        if not nb_col:
-            for col in df.columns:
-                if 'north' in col.lower():
-                    nb_col = col
-                    break
-        # Fuzzy for SB
-        if not sb_col:
-            for col in df.columns:
-                if 'south' in col.lower():
-                    sb_col = col
-                    break
+        nb_col = schema["nb"]
+        sb_col = schema["sb"]
         if not nb_col or not sb_col:
             st.error(f"❌ Cannot find required columns. Found NB: {nb_col}, SB: {sb_col}")
             st.info(f"Columns: {list(df.columns)}")
@@ -116,79 +102,42 @@ def render_cycle_length_analysis(df, time_period, direction):
         st.error("❌ Invalid direction selection.")
         st.stop()
 
-    # --- 3. Make sure time is datetime ---
-    if not pd.api.types.is_datetime64_any_dtype(df[time_col]):
-        try:
-            df[time_col] = pd.to_datetime(df[time_col])
-        except:
-            st.error(f"❌ Cannot convert '{time_col}' to datetime format.")
-            st.stop()
-
-    # --- 4. Only single day allowed for recommendations ---
+    # --- 5. Only single day allowed for recommendations ---
     if 'Date' in df.columns and len(df['Date'].unique()) > 1:
         st.warning(
             "⚠️ Cycle Length Recommendations are only available for single-day analysis. Please select a single date to view hourly cycle length recommendations.")
     else:
-        # Filter data by period
-        period_key = time_period.split()[0]
-        filtered_df = filter_by_period(df, time_col, period_key)
+        period_key = get_period_key(time_period)
 
         # Make sure vol_col is defined before using it in aggregation
         if vol_col is None:
             st.error("❌ Volume column not found. Cannot proceed with analysis.")
             st.stop()
 
-        # Hourly aggregation using the correct vol_col
+        # Hourly aggregation + recommendations (pure analytics)
         try:
-            hourly_df = filtered_df.groupby(filtered_df[time_col].dt.hour).agg({
-                vol_col: 'sum'
-            }).reset_index()
+            recommendations = hourly_recommendations(df, time_col, vol_col, period_key)
         except KeyError as e:
-            st.error(f"❌ Column '{vol_col}' not found in data. Available columns: {list(filtered_df.columns)}")
+            st.error(f"❌ Column '{vol_col}' not found in data. Available columns: {list(df.columns)}")
             st.stop()
         except Exception as e:
             st.error(f"❌ Error during aggregation: {str(e)}")
             st.stop()
 
-        # Build recommendations table
-        table_df = []
-        for _, row in hourly_df.iterrows():
-            hour = int(row[time_col])
-            volume = row[vol_col]
-
-            cvag_recommendation = get_hourly_cycle_length(volume)
-            current_system = get_existing_cycle_length(volume)
-            hour_display = f"{hour:02d}:00"
-            needs_change = cvag_recommendation != current_system
-
-            if needs_change:
-                if cvag_recommendation == "Free mode" and current_system == "140 sec":
-                    status_html = '<span style="color: #FF6B6B; font-weight: bold;">⬇️ REDUCE</span>'
-                    status_text = "⬇️ REDUCE"
-                elif cvag_recommendation == "140 sec" and current_system == "Free mode":
-                    status_html = '<span style="color: #4ECDC4; font-weight: bold;">⬆️ INCREASE</span>'
-                    status_text = "⬆️ INCREASE"
-                else:
-                    status_html = '<span style="color: #FFE66D; font-weight: bold;">⚠️ ADJUST</span>'
-                    status_text = "⚠️ ADJUST"
-            else:
-                status_html = '<span style="color: #51CF66; font-weight: bold;">✅ OPTIMAL</span>'
-                status_text = "✅ OPTIMAL"
-
-            table_df.append({
-                "Hour": hour_display,
-                "Volume": f"{volume:,.0f}",
-                "Current System": current_system,
-                "CVAG Recommendation": cvag_recommendation,
-                "Status": status_html,
-                "Status_Text": status_text
-            })
-
-        # Sort by hour
-        table_df = sorted(table_df, key=lambda x: int(x["Hour"].split(":")[0]))
-
         # Show table with HTML styling
-        df_display = pd.DataFrame([{k: v for k, v in row.items() if k != "Status_Text"} for row in table_df])
+        df_display = pd.DataFrame({
+            "Hour": recommendations["Hour"].map(lambda hour: f"{hour:02d}:00"),
+            "Avg Volume (veh/h)": recommendations["Volume"].map(lambda volume: f"{volume:,.0f}"),
+            "Current System": recommendations["Current System"],
+            "CVAG Recommendation": recommendations["CVAG Recommendation"],
+            "Status": recommendations["Status"].map(STATUS_HTML),
+        })
+        if webster_cycles is not None:
+            # Webster's optimal cycle from all four approaches, next to the CVAG volume bins
+            cycles, flow_ratios = webster_cycles
+            df_display.insert(4, "Webster Optimal (avg hour)", recommendations["Hour"].map(
+                lambda hour: "No data" if pd.isna(cycles[hour])
+                else f"{cycles[hour]:.0f} sec (Y = {flow_ratios[hour]:.2f})"))
         st.markdown(df_display.to_html(escape=False, index=False), unsafe_allow_html=True)
 
         # --- Table CSS ---
@@ -217,33 +166,40 @@ def render_cycle_length_analysis(df, time_period, direction):
             </style>
             """, unsafe_allow_html=True)
 
+        st.caption("Avg Volume is the average vehicles per hour at each hour of day over the selected dates; "
+                   "the current system and CVAG recommendation apply their volume bins to it.")
+        if webster_cycles is not None:
+            lanes = ", ".join(f"{approach} {count}" for approach, count in DEFAULT_LANES.items())
+            st.caption(f"Webster Optimal: (1.5 L + 5) / (1 - Y) from the average hourly critical NB/SB and EB/WB "
+                       f"approach volumes (veh/h) of the same dates, with {SATURATION_FLOW:,} veh/h/lane saturation flow, L = {LOST_TIME} s "
+                       f"lost time and assumed through lanes ({lanes}); rounded up to {CYCLE_STEP} s within "
+                       f"{MIN_CYCLE}-{MAX_CYCLE} s. Y is the critical flow ratio (1.0 = saturated).")
+
         # --- Metrics summary section ---
+        summary = recommendation_summary(recommendations)
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            total_hours = len(df_display)
+            total_hours = summary["total_hours"]
             period_name = time_period.split()[0]
             st.metric(f"{period_name} Hours Analyzed", total_hours)
         with col2:
-            changes_needed = len([x for x in table_df if "OPTIMAL" not in x["Status_Text"]])
+            changes_needed = summary["changes_needed"]
             st.metric("Hours Needing Changes", changes_needed,
                       delta=f"{changes_needed}/{total_hours}" if total_hours > 0 else "0/0")
         with col3:
-            if total_hours > 0:
-                efficiency = ((total_hours - changes_needed) / total_hours) * 100
+            if summary["efficiency"] is not None:
+                efficiency = summary["efficiency"]
                 st.metric("Current System Efficiency", f"{efficiency:.1f}%",
                           delta=f"{'Good' if efficiency >= 80 else 'Needs Improvement'}")
             else:
                 st.metric("Current System Efficiency", "N/A")
         with col4:
-            reduce_count = len([x for x in table_df if "REDUCE" in x["Status_Text"]])
-            increase_count = len([x for x in table_df if "INCREASE" in x["Status_Text"]])
-            adjust_count = len([x for x in table_df if "ADJUST" in x["Status_Text"]])
-            if reduce_count > 0:
-                st.metric("🔽 Hours to Reduce", reduce_count)
-            elif increase_count > 0:
-                st.metric("🔼 Hours to Increase", increase_count)
-            elif adjust_count > 0:
-                st.metric("🔄 Hours to Adjust", adjust_count)
+            if summary["reduce"] > 0:
+                st.metric("🔽 Hours to Reduce", summary["reduce"])
+            elif summary["increase"] > 0:
+                st.metric("🔼 Hours to Increase", summary["increase"])
+            elif summary["adjust"] > 0:
+                st.metric("🔄 Hours to Adjust", summary["adjust"])
             else:
                 st.metric("✅ Optimal Hours", total_hours - changes_needed)
 
@@ -269,22 +225,18 @@ def render_cycle_length_analysis(df, time_period, direction):
                 unsafe_allow_html=True)
 
         # --- Analysis period info ---
-        period_info = {
-            "AM": "5:00 - 10:00 (6 hours)",
-            "MD": "11:00 - 15:00 (5 hours)",
-            "PM": "16:00 - 20:00 (5 hours)"
-        }
         st.info(
-            f"📅 **Analysis Period:** {period_info.get(period_key, 'Full Day')} | **Direction:** {direction}")
+            f"📅 **Analysis Period:** {PERIOD_LABELS.get(period_key, 'Full Day')} | **Direction:** {direction}")
 
 
 def render_volume_summary(df):
     """Render volume summary section"""
     st.subheader("📈 Traffic Volume Summary")
 
-    # Find the correct volume columns using the existing helper function
-    nb_vol_col = find_column(df, ['north', 'nb'])
-    sb_vol_col = find_column(df, ['south', 'sb'])
+    # Volume columns from the resolved column roles
+    schema = frame_schema(df)
+    nb_vol_col = schema["nb"]
+    sb_vol_col = schema["sb"]
 
     if nb_vol_col and sb_vol_col:
         col1, col2, col3 = st.columns(3)
@@ -0,0 +1,16 @@
+# Pure analytics (pandas/numpy only) shared by the dashboard, reports and CLI - no Streamlit imports here
+from analytics.periods import PERIOD_HOURS, PERIOD_LABELS, filter_by_dates, filter_by_period, period_key
+from analytics.cycle_length import get_hourly_cycle_length, get_existing_cycle_length, \
+    get_cycle_length_recommendation, classify_cycle_lengths, classify_existing_cycle_lengths, \
+    cycle_length_seconds, existing_cycle_seconds, cycle_length_status, hourly_recommendations, \
+    recommendation_summary
+from analytics.kpis import activation_period, volume_kpis, speed_kpis, cycle_length_table, volume_summary
+from analytics.corridor import corridor_rollup
+from analytics.distributions import BOX_GROUPINGS, box_stats
+from analytics.density import POINT_LIMIT, align_on_time, density_grid, scatter_density, time_scatter_density
+from analytics.approaches import APPROACHES, PHASE_PAIRS, total_entering_volume, phase_critical_volumes, \
+    critical_volume_sum, hour_of_day_profile
+from analytics.webster import SATURATION_FLOW, LOST_TIME, DEFAULT_LANES, MIN_CYCLE, MAX_CYCLE, CYCLE_STEP, \
+    critical_flow_ratio, webster_cycle_length, webster_cycle_lengths
+from analytics.plan_breaks import PLAN_CYCLES, DEFAULT_PLANS, cycle_label, format_schedule, optimize_plan_breaks, \
+    schedule_cycles, schedule_mismatch, plan_break_table
@@ -0,0 +1,55 @@
+import numpy as np
+
+# Intersection approaches, named by direction of travel (NB = vehicles entering northbound)
+APPROACHES = ("NB", "SB", "EB", "WB")
+
+# Opposing approaches that share a signal phase pair: Washington St first, then the cross street
+PHASE_PAIRS = {
+    "main street": ("NB", "SB"),
+    "cross street": ("EB", "WB"),
+}
+
+
+def _nansum(values, axis):
+    """np.nansum that stays NaN where every value summed is NaN (no count is not zero volume)"""
+    return np.where(np.isnan(values).all(axis=axis), np.nan, np.nansum(values, axis=axis))
+
+
+def total_entering_volume(volumes):
+    """Vehicles entering from all approaches: sums the approach axis of an (..., approach, hour) array"""
+    return _nansum(np.asarray(volumes, dtype=float), axis=-2)
+
+
+def phase_critical_volumes(volumes, lanes=1):
+    """Critical per-lane volume of each phase pair: (..., approach, hour) -> (..., phase, hour).
+
+    The counts are per approach (no turning movements), so the critical movement of a phase pair
+    is its heavier opposing approach per lane. ``lanes`` is a scalar or broadcasts against the
+    (..., approach, 1) shape, e.g. an (intersection, approach, 1) array of lane counts.
+    """
+    per_lane = np.asarray(volumes, dtype=float) / np.asarray(lanes, dtype=float)
+    pairs = [[APPROACHES.index(approach) for approach in pair] for pair in PHASE_PAIRS.values()]
+    first = per_lane[..., [a for a, _ in pairs], :]
+    second = per_lane[..., [b for _, b in pairs], :]
+    return np.fmax(first, second)  # fmax ignores a NaN side
+
+
+def critical_volume_sum(volumes, lanes=1):
+    """Sum of the phase pairs' critical per-lane volumes (the intersection's critical lane volume)"""
+    return _nansum(phase_critical_volumes(volumes, lanes), axis=-2)
+
+
+def hour_of_day_profile(values, day_mask=None):
+    """Average hour of day of an hourly (..., hour) array that starts at midnight and spans whole days.
+
+    Returns (..., 24). ``day_mask`` (one bool per day) keeps only some days, e.g. weekdays; hours
+    without any count stay NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    by_day = values.reshape(*values.shape[:-1], -1, 24)
+    if day_mask is not None:
+        by_day = by_day[..., np.asarray(day_mask, dtype=bool), :]
+    counted = ~np.isnan(by_day)
+    totals = np.where(counted, by_day, 0).sum(axis=-2)
+    counts = counted.sum(axis=-2)
+    return np.divide(totals, counts, out=np.full(totals.shape, np.nan), where=counts > 0)
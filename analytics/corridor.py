@@ -0,0 +1,35 @@
+import pandas as pd
+
+from analytics.cycle_length import get_cycle_length_recommendation
+from analytics.periods import filter_by_period
+
+
+def corridor_rollup(frames, period, time_col="datetime", nb_col="Northbound", sb_col="Southbound"):
+    """One row per intersection plus a corridor total: period volumes, peak hour and recommended cycle length.
+
+    ``frames`` maps a location name to its hourly NB/SB volume frame.
+    """
+    rows = []
+    for name, df in frames.items():
+        period_df = filter_by_period(df, time_col, period)
+        if period_df.empty:
+            continue
+        hourly = period_df.groupby(period_df[time_col].dt.hour)[[nb_col, sb_col]].mean()
+        combined = hourly[nb_col] + hourly[sb_col]
+        rows.append({
+            "Location": name,
+            "Days": period_df[time_col].dt.date.nunique(),
+            "NB Volume": period_df[nb_col].sum(),
+            "SB Volume": period_df[sb_col].sum(),
+            "Avg Peak Hour": f"{int(combined.idxmax()):02d}:00",
+            "Avg Peak Hour Volume": round(combined.max(), 1),
+            "NB Recommended Cycle": get_cycle_length_recommendation(hourly[nb_col]),
+            "SB Recommended Cycle": get_cycle_length_recommendation(hourly[sb_col]),
+        })
+
+    rollup = pd.DataFrame(rows)
+    if not rollup.empty:
+        total = {"Location": "Corridor Total", "Days": rollup["Days"].max(),
+                 "NB Volume": rollup["NB Volume"].sum(), "SB Volume": rollup["SB Volume"].sum()}
+        rollup = pd.concat([rollup, pd.DataFrame([total])], ignore_index=True)
+    return rollup
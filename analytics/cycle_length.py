@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from analytics.periods import filter_by_period
+
+# CVAG volume thresholds (vehicles / hour) and the cycle length each one triggers
+CYCLE_LENGTH_THRESHOLDS = [(2400, "140 sec"), (1500, "130 sec"), (600, "120 sec"), (300, "110 sec")]
+EXISTING_THRESHOLD = 300
+
+
+def get_hourly_cycle_length(volume):
+    """Get CVAG recommended cycle length based on volume"""
+    for threshold, cycle in CYCLE_LENGTH_THRESHOLDS:
+        if volume >= threshold:
+            return cycle
+    return "Free mode"
+
+
+def get_existing_cycle_length(volume):
+    """Get current system cycle length based on volume"""
+    if volume >= EXISTING_THRESHOLD:
+        return "140 sec"
+    else:
+        return "Free mode"
+
+
+def get_cycle_length_recommendation(hourly_volumes):
+    """
+    Return recommended cycle length based on the highest volume hour in the period.
+    Volume thresholds are: 305, 605, 1505, 2405 (all +5 from your original table).
+    """
+    cycle = "Free mode"
+    for v in hourly_volumes:
+        if v >= 2400:
+            return "140 sec"
+        elif v >= 1500:
+            cycle = "130 sec"
+        elif v >= 600:
+            if cycle not in ["130 sec", "140 sec"]:
+                cycle = "120 sec"
+        elif v >= 300:
+            if cycle not in ["120 sec", "130 sec", "140 sec"]:
+                cycle = "110 sec"
+    return cycle
+
+
+def classify_cycle_lengths(volumes):
+    """Vectorized get_hourly_cycle_length over a Series/array of volumes"""
+    volumes = np.asarray(volumes, dtype=float)
+    return np.select([volumes >= threshold for threshold, _ in CYCLE_LENGTH_THRESHOLDS],
+                     [cycle for _, cycle in CYCLE_LENGTH_THRESHOLDS], default="Free mode").astype(object)
+
+
+def classify_existing_cycle_lengths(volumes):
+    """Vectorized get_existing_cycle_length"""
+    volumes = np.asarray(volumes, dtype=float)
+    return np.where(volumes >= EXISTING_THRESHOLD, "140 sec", "Free mode").astype(object)
+
+
+def cycle_length_seconds(volumes):
+    """classify_cycle_lengths as seconds (0 = Free mode); NaN volumes stay NaN"""
+    volumes = np.asarray(volumes, dtype=float)
+    seconds = np.select([volumes >= threshold for threshold, _ in CYCLE_LENGTH_THRESHOLDS],
+                        [int(cycle.split()[0]) for _, cycle in CYCLE_LENGTH_THRESHOLDS], default=0)
+    return np.where(np.isnan(volumes), np.nan, seconds)
+
+
+def existing_cycle_seconds(volumes):
+    """classify_existing_cycle_lengths as seconds (0 = Free mode); NaN volumes stay NaN"""
+    volumes = np.asarray(volumes, dtype=float)
+    return np.where(np.isnan(volumes), np.nan, np.where(volumes >= EXISTING_THRESHOLD, 140, 0))
+
+
+def cycle_length_status(recommended, existing):
+    """OPTIMAL / REDUCE / INCREASE / ADJUST for one hour"""
+    if recommended == existing:
+        return "OPTIMAL"
+    if recommended == "Free mode" and existing == "140 sec":
+        return "REDUCE"
+    if recommended == "140 sec" and existing == "Free mode":
+        return "INCREASE"
+    return "ADJUST"
+
+
+def hourly_recommendations(df, time_col, vol_col, period):
+    """Average volume per hour of day (vehicles per hour) for the period with current vs CVAG cycle lengths.
+
+    Over a single day this is that day's hourly volume; over several days it is the typical hour,
+    the scale the CVAG bins are defined on.
+    """
+    period_df = filter_by_period(df, time_col, period)
+    hourly = period_df.groupby(period_df[time_col].dt.hour)[vol_col].mean()
+
+    table = pd.DataFrame({"Hour": hourly.index.astype(int), "Volume": hourly.to_numpy()})
+    table["Current System"] = classify_existing_cycle_lengths(table["Volume"])
+    table["CVAG Recommendation"] = classify_cycle_lengths(table["Volume"])
+    table["Status"] = [cycle_length_status(rec, cur)
+                       for rec, cur in zip(table["CVAG Recommendation"], table["Current System"])]
+    return table.sort_values("Hour").reset_index(drop=True)
+
+
+def recommendation_summary(table):
+    """Counts behind the recommendation metrics row"""
+    total_hours = len(table)
+    status_counts = table["Status"].value_counts() if total_hours else pd.Series(dtype=int)
+    changes_needed = total_hours - int(status_counts.get("OPTIMAL", 0))
+    return {
+        "total_hours": total_hours,
+        "changes_needed": changes_needed,
+        "efficiency": (total_hours - changes_needed) / total_hours * 100 if total_hours else None,
+        "reduce": int(status_counts.get("REDUCE", 0)),
+        "increase": int(status_counts.get("INCREASE", 0)),
+        "adjust": int(status_counts.get("ADJUST", 0)),
+    }
@@ -0,0 +1,51 @@
+import numpy as np
+
+# Up to this many points a scatter is sent as points; above it, as a binned density grid
+POINT_LIMIT = 2000
+DENSITY_BINS = 40
+
+# Time axis of a time-series density grid: finer than the value axis so the season's shape survives
+TIME_BINS = 120
+
+
+def align_on_time(times_a, values_a, times_b, values_b):
+    """Values of two hourly series at the timestamps they share (rows with a NaN on either side dropped)"""
+    # Not assume_unique: local times repeat at the DST fall-back hour (the first reading is used)
+    _, index_a, index_b = np.intersect1d(np.asarray(times_a), np.asarray(times_b), return_indices=True)
+    a = np.asarray(values_a, dtype=float)[index_a]
+    b = np.asarray(values_b, dtype=float)[index_b]
+    valid = ~(np.isnan(a) | np.isnan(b))
+    return a[valid], b[valid]
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    """2D histogram of (x, y): bin centers plus counts indexed [y bin, x bin]"""
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return {
+        "x": (x_edges[:-1] + x_edges[1:]) / 2,
+        "y": (y_edges[:-1] + y_edges[1:]) / 2,
+        "counts": counts.T.astype(np.int32),
+    }
+
+
+def scatter_density(x, y, point_limit=POINT_LIMIT, bins=DENSITY_BINS):
+    """Small scatters as points, large ones as a density grid: {"n", "points": (x, y) or None, "grid": ... or None}"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) <= point_limit:
+        return {"n": len(x), "points": (x, y), "grid": None}
+    return {"n": len(x), "points": None, "grid": density_grid(x, y, bins)}
+
+
+def time_scatter_density(times, values, point_limit=POINT_LIMIT, bins=(TIME_BINS, DENSITY_BINS)):
+    """scatter_density of a time series; x (point times / bin centers) comes back as datetime64, NaNs dropped"""
+    times = np.asarray(times, dtype="datetime64[ns]")
+    values = np.asarray(values, dtype=float)
+    valid = ~(np.isnat(times) | np.isnan(values))
+    times, values = times[valid], values[valid]
+    density = scatter_density(times.astype(np.int64).astype(float), values, point_limit, bins)
+    if density["grid"] is not None:
+        density["grid"]["x"] = density["grid"]["x"].astype(np.int64).astype("datetime64[ns]")
+    else:
+        density["points"] = (times, values)
+    return density
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# Box grouping options -> (group key from a DatetimeIndex, key -> label)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+BOX_GROUPINGS = {
+    "hour": (lambda times: times.hour, lambda key: f"{key:02d}:00"),
+    "weekday": (lambda times: times.weekday, lambda key: WEEKDAYS[key]),
+    "month": (lambda times: times.year * 12 + times.month - 1,
+              lambda key: pd.Timestamp(year=key // 12, month=key % 12 + 1, day=1).strftime("%b %Y")),
+}
+
+# Outlier points kept per box (evenly spread over the sorted outliers, extremes included)
+MAX_OUTLIERS = 50
+
+
+def _sample(values, limit):
+    if len(values) <= limit:
+        return values
+    return values[np.linspace(0, len(values) - 1, limit).round().astype(int)]
+
+
+def box_stats(values, times=None, by=None, max_outliers=MAX_OUTLIERS):
+    """Tukey box statistics of ``values``, optionally grouped by hour / weekday / month of ``times``.
+
+    Quartiles use linear interpolation (Plotly's default), whiskers end at the last value within
+    1.5 IQR of the box and up to ``max_outliers`` points beyond them are kept per box. Returns a dict
+    of per-box arrays: group (labels), count, mean, q1, median, q3, lowerfence, upperfence, outliers.
+    """
+    values = np.asarray(values, dtype=float)
+    if by is None:
+        keys = np.zeros(len(values), dtype=np.int64)
+    else:
+        group_key, _ = BOX_GROUPINGS[by]
+        keys = np.asarray(group_key(pd.DatetimeIndex(times)), dtype=np.int64)
+    valid = ~np.isnan(values)
+    values, keys = values[valid], keys[valid]
+
+    # Sort by group, then value: every group is one contiguous sorted run
+    order = np.lexsort((values, keys))
+    values, keys = values[order], keys[order]
+    groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+
+    def quantile(q):
+        position = starts + q * (counts - 1)
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    low_limit = np.repeat(q1 - 1.5 * iqr, counts)
+    high_limit = np.repeat(q3 + 1.5 * iqr, counts)
+    inside = (values >= low_limit) & (values <= high_limit)
+    if len(values):
+        lowerfence = np.minimum.reduceat(np.where(inside, values, np.inf), starts)
+        upperfence = np.maximum.reduceat(np.where(inside, values, -np.inf), starts)
+        mean = np.add.reduceat(values, starts) / counts
+    else:
+        lowerfence = upperfence = mean = np.empty(0)
+
+    outliers = [_sample(values[start:start + count][~inside[start:start + count]], max_outliers)
+                for start, count in zip(starts, counts)]
+    labels = [BOX_GROUPINGS[by][1](int(key)) for key in groups] if by else ["All"] * len(groups)
+    return {"group": labels, "count": counts, "mean": mean, "q1": q1, "median": median, "q3": q3,
+            "lowerfence": lowerfence, "upperfence": upperfence, "outliers": outliers}
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from analytics.cycle_length import get_cycle_length_recommendation, classify_cycle_lengths, \
+    classify_existing_cycle_lengths
+from analytics.periods import filter_by_period
+
+
+def activation_period(period_df, time_col, vol_col, threshold=300):
+    """Longest run of consecutive rows with volume >= threshold (the cycle-length activation period)"""
+    longest, current = [], []
+    for timestamp, volume in zip(period_df[time_col], period_df[vol_col]):
+        if volume >= threshold:
+            current.append((timestamp, volume))
+        else:
+            if len(current) > len(longest):
+                longest = current
+            current = []
+    return current if len(current) > len(longest) else longest
+
+
+def volume_summary(period_df, full_df, time_col, nb_col, sb_col):
+    """Busiest direction, activation period and recommended cycle length (the Vehicle Volume Summary panel)"""
+    nb_total, sb_total = period_df[nb_col].sum(), period_df[sb_col].sum()
+    peak_direction, peak_col = ("NB", nb_col) if nb_total >= sb_total else ("SB", sb_col)
+
+    run = activation_period(period_df, time_col, peak_col)
+    if run:
+        hours_str = f"{run[0][0].strftime('%H:%M')} - {run[-1][0].strftime('%H:%M')}"
+        run_volume = sum(volume for _, volume in run)
+        cycle_rec = get_cycle_length_recommendation([volume for _, volume in run])
+    else:
+        hours_str, run_volume, cycle_rec = "Free mode", None, "Free mode"
+
+    return {
+        "Busiest Direction": peak_direction,
+        "NB Period Volume": nb_total,
+        "SB Period Volume": sb_total,
+        "Activation Period": hours_str,
+        "Activation Period Volume": run_volume,
+        "Recommended Cycle Length": cycle_rec,
+        "Total (direction) Volume": full_df[peak_col].sum(),
+    }
+
+
+def volume_kpis(df, period, time_col="datetime", nb_col="Northbound", sb_col="Southbound"):
+    """Daily volume KPIs for one intersection"""
+    rows = []
+    for day, day_df in df.groupby(df[time_col].dt.date):
+        period_df = filter_by_period(day_df, time_col, period)
+        if period_df.empty:
+            continue
+        summary = volume_summary(period_df, day_df, time_col, nb_col, sb_col)
+        summary["Activation Period Volume"] = summary["Activation Period Volume"] or 0
+        rows.append({"Date": day, **summary})
+    return pd.DataFrame(rows)
+
+
+def cycle_length_table(df, period, time_col="datetime", nb_col="Northbound", sb_col="Southbound"):
+    """Hourly existing vs recommended cycle lengths for both directions"""
+    period_df = filter_by_period(df, time_col, period)
+    return pd.DataFrame({
+        "Date": period_df[time_col].dt.date,
+        "Hour": period_df[time_col].dt.strftime("%H:%M"),
+        "NB Volume": period_df[nb_col],
+        "NB Existing": classify_existing_cycle_lengths(period_df[nb_col]),
+        "NB Rec": classify_cycle_lengths(period_df[nb_col]),
+        "SB Volume": period_df[sb_col],
+        "SB Existing": classify_existing_cycle_lengths(period_df[sb_col]),
+        "SB Rec": classify_cycle_lengths(period_df[sb_col]),
+    }).reset_index(drop=True)
+
+
+def speed_kpis(df, period, time_col="datetime", nb_col="Northbound", sb_col="Southbound"):
+    """Daily average speed and congestion (minimum speed) per direction for one segment"""
+    rows = []
+    for day, day_df in df.groupby(df[time_col].dt.date):
+        period_df = filter_by_period(day_df, time_col, period).dropna(subset=[nb_col, sb_col], how="all")
+        for direction, col in (("NB", nb_col), ("SB", sb_col)):
+            speeds = period_df[col].dropna()
+            if speeds.empty:
+                continue
+            rows.append({
+                "Date": day,
+                "Direction": direction,
+                "Average Speed": round(speeds.mean(), 1),
+                "Congestion (Min Speed)": speeds.min(),
+                "Congestion Time": period_df.loc[speeds.idxmin(), time_col].strftime("%H:%M"),
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,37 @@
+import pandas as pd
+
+# Hour windows used by the KPI / cycle-length periods (inclusive)
+PERIOD_HOURS = {
+    "AM": (5, 10),
+    "MD": (11, 15),
+    "PM": (16, 20),
+}
+
+PERIOD_LABELS = {
+    "AM": "5:00 - 10:00 (6 hours)",
+    "MD": "11:00 - 15:00 (5 hours)",
+    "PM": "16:00 - 20:00 (5 hours)",
+}
+
+
+def period_key(time_period):
+    """'AM (5:00-10:00)' -> 'AM'"""
+    return time_period.split(" ")[0]
+
+
+def filter_by_period(df, time_col, period):
+    """Filter dataframe by time period"""
+    if period not in PERIOD_HOURS:
+        return df
+    start_hour, end_hour = PERIOD_HOURS[period]
+    return df[df[time_col].dt.hour.between(start_hour, end_hour)]
+
+
+def filter_by_dates(df, time_col, start=None, end=None):
+    """Rows on the days start..end (inclusive; either may be None)"""
+    keep = pd.Series(True, index=df.index)
+    if start is not None:
+        keep &= df[time_col] >= pd.Timestamp(start).normalize()
+    if end is not None:
+        keep &= df[time_col] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return df[keep]
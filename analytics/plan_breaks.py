@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from analytics.cycle_length import cycle_length_seconds, existing_cycle_seconds
+
+# Cycle lengths a time-of-day plan can run (seconds; 0 = Free mode), the CVAG bins
+PLAN_CYCLES = (0, 110, 120, 130, 140)
+DEFAULT_PLANS = 4
+
+
+def cycle_label(seconds):
+    """140 -> '140 sec', 0 -> 'Free mode'"""
+    return "Free mode" if seconds == 0 else f"{seconds:.0f} sec"
+
+
+def schedule_mismatch(recommended, weights, run):
+    """Volume-weighted |recommended - run| cycle seconds summed over the hours of (..., 24) profiles"""
+    recommended, weights = np.asarray(recommended, dtype=float), np.asarray(weights, dtype=float)
+    counted = ~(np.isnan(recommended) | np.isnan(weights))
+    return np.where(counted, weights * np.abs(recommended - run), 0).sum(axis=-1)
+
+
+def _segment_costs(recommended, weights, cycles):
+    """Cheapest cycle and its mismatch for every span of hours, under every rotation of the day.
+
+    (N, 24) profiles -> cost and cycle index shaped (N * 24 first hours, start, end), hours start..end
+    counted from the first hour; spans ending before they start cost inf.
+    """
+    counted = ~(np.isnan(recommended) | np.isnan(weights))
+    weights = np.where(counted, weights, 0)
+    recommended = np.where(counted, recommended, 0)
+
+    # Circular spans once per profile: (N, start hour, length - 1) from prefix sums over two days
+    lengths = np.arange(1, 25)
+    circular = np.full((len(recommended), 24, 24), np.inf)
+    circular_choice = np.zeros(circular.shape, dtype=np.int8)
+    for index, cycle in enumerate(cycles):
+        errors = weights * np.abs(recommended - cycle)
+        prefix = np.zeros((len(recommended), 49))
+        np.cumsum(np.concatenate([errors, errors], axis=1), axis=1, out=prefix[:, 1:])
+        spans = prefix[:, np.arange(24)[:, None] + lengths[None, :]] - prefix[:, :24, None]
+        circular_choice = np.where(spans < circular, index, circular_choice)
+        circular = np.minimum(spans, circular)
+
+    # Gathered per rotation: span start..end after rotating by first hour r starts at hour (r + start) % 24
+    hours = np.arange(24)
+    first_hours = (hours[:, None, None] + hours[None, :, None]) % 24  # (r, start, 1)
+    span_lengths = np.clip(hours[None, :] - hours[:, None], 0, None)[None]  # (1, start, end)
+    cost = circular[:, first_hours, span_lengths].reshape(-1, 24, 24)
+    choice = circular_choice[:, first_hours, span_lengths].reshape(-1, 24, 24)
+    cost[:, np.tril(np.ones((24, 24), dtype=bool), -1)] = np.inf  # end before start
+    return cost, choice
+
+
+def _best_splits(cost, plans):
+    """Interval DP: best[k, n, t] = least mismatch covering hours [0, t) with k plans, plus the split points"""
+    n = cost.shape[0]
+    best = np.full((plans + 1, n, 25), np.inf)
+    best[0, :, 0] = 0
+    split = np.zeros((plans + 1, n, 25), dtype=int)
+    for k in range(1, plans + 1):
+        # Last plan runs hours s..t-1: previous plans cover [0, s)
+        total = best[k - 1][:, :24, None] + cost  # (N, s, t - 1)
+        split[k, :, 1:] = total.argmin(axis=1)
+        best[k, :, 1:] = np.take_along_axis(total, split[k, :, None, 1:], axis=1)[:, 0]
+    return best, split
+
+
+def optimize_plan_breaks(recommended, weights, plans=DEFAULT_PLANS, cycles=PLAN_CYCLES):
+    """Best daily schedule of at most ``plans`` time-of-day plans for every (N, 24) typical-day profile at once.
+
+    Each plan runs one of ``cycles`` over a contiguous run of hours (the last may wrap past midnight);
+    the schedule minimizes the ``weights``-weighted |recommended - run| cycle seconds, so busy hours
+    count more. Returns (schedules, mismatch): one [(start hour, end hour, cycle), ...] list per profile
+    (end exclusive, fewest plans on ties) and the (N,) mismatch. All-NaN profiles get an empty schedule.
+    """
+    recommended = np.asarray(recommended, dtype=float).reshape(-1, 24)
+    weights = np.asarray(weights, dtype=float).reshape(-1, 24)
+    cycles = np.asarray(cycles, dtype=float)
+
+    # Every profile under all 24 rotations, so a plan break can fall at any hour including midnight
+    cost, choice = _segment_costs(recommended, weights, cycles)
+    best, split = _best_splits(cost, plans)
+
+    # (profile, plans - 1, first hour); rounded so float noise between rotations never adds a plan
+    totals = best[1:, :, 24].reshape(plans, -1, 24).transpose(1, 0, 2).reshape(len(recommended), -1)
+    picks = np.round(totals, 6).argmin(axis=1)
+    mismatch = totals[np.arange(len(recommended)), picks]
+
+    schedules = []
+    for profile, pick in enumerate(picks):
+        if np.isnan(recommended[profile]).all():
+            schedules.append([])
+            continue
+        used, first_hour = divmod(int(pick), 24)
+        row = profile * 24 + first_hour
+        schedule, end = [], 24
+        for k in range(used + 1, 0, -1):
+            start = int(split[k, row, end])
+            cycle = float(cycles[choice[row, start, end - 1]])
+            schedule.append(((start + first_hour) % 24, (end + first_hour) % 24, cycle))
+            end = start
+        schedules.append(_merge(schedule[::-1]))
+    return schedules, mismatch
+
+
+def _merge(schedule):
+    """Joins neighbouring plans (including across midnight) that run the same cycle"""
+    merged = []
+    for start, end, cycle in schedule:
+        if merged and merged[-1][2] == cycle:
+            merged[-1] = (merged[-1][0], end, cycle)
+        else:
+            merged.append((start, end, cycle))
+    if len(merged) > 1 and merged[0][2] == merged[-1][2]:
+        merged[0] = (merged[-1][0], merged[0][1], merged[0][2])
+        merged.pop()
+    return merged
+
+
+def schedule_cycles(schedule):
+    """Cycle run in each of the 24 hours under a schedule from optimize_plan_breaks"""
+    run = np.full(24, np.nan)
+    for start, end, cycle in schedule:
+        hours = np.arange(start, start + ((end - start) % 24 or 24)) % 24
+        run[hours] = cycle
+    return run
+
+
+def format_schedule(schedule):
+    """'05:00-09:00 120 sec | 09:00-05:00 Free mode'"""
+    return " | ".join(f"{start:02d}:00-{end:02d}:00 {cycle_label(cycle)}" for start, end, cycle in schedule)
+
+
+def plan_break_table(profiles, plans=DEFAULT_PLANS):
+    """Optimized time-of-day plans for many typical days at once, against the current system.
+
+    ``profiles`` maps (intersection, day type) to its 24 typical hourly volumes (the busier
+    Washington St direction, the volume the CVAG bins apply to). Mismatch is the volume-weighted
+    average |CVAG recommendation - cycle run| in seconds per vehicle.
+    """
+    keys = list(profiles)
+    volumes = np.array([profiles[key] for key in keys], dtype=float).reshape(-1, 24)
+    recommended = cycle_length_seconds(volumes)
+    schedules, mismatch = optimize_plan_breaks(recommended, volumes, plans)
+    vehicles = np.nansum(volumes, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        current = schedule_mismatch(recommended, volumes, existing_cycle_seconds(volumes)) / vehicles
+        optimized = mismatch / vehicles
+    return pd.DataFrame({
+        "Intersection": [intersection for intersection, _ in keys],
+        "Day Type": [day_type for _, day_type in keys],
+        "Plans": [len(schedule) for schedule in schedules],
+        "Schedule": [format_schedule(schedule) for schedule in schedules],
+        "Current Mismatch (s/veh)": current,
+        "Optimized Mismatch (s/veh)": optimized,
+    })[[bool(schedule) for schedule in schedules]].reset_index(drop=True)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from analytics.approaches import APPROACHES, phase_critical_volumes
+
+# Planning defaults (HCM): saturation flow per through lane and 4 s lost per critical phase over a
+# dual-ring sequence of 4 critical phases (left turn + through for each street)
+SATURATION_FLOW = 1900
+LOST_TIME = 16
+
+# Through lanes per approach. The KMOB counts carry no lane data, so these are corridor-wide
+# assumptions (three lanes each way on Washington St, two on the cross streets)
+DEFAULT_LANES = {"NB": 3, "SB": 3, "EB": 2, "WB": 2}
+
+# Practical cycle bounds (seconds) and controller granularity; at or past saturation the cycle
+# is the maximum
+MIN_CYCLE = 60
+MAX_CYCLE = 150
+CYCLE_STEP = 5
+
+
+def lanes_array(lanes=None):
+    """Per-approach lane counts shaped to broadcast against (..., approach, hour) volumes"""
+    lanes = {**DEFAULT_LANES, **(lanes or {})}
+    return np.array([lanes[approach] for approach in APPROACHES], dtype=float)[:, None]
+
+
+def critical_flow_ratio(volumes, lanes=None, saturation_flow=SATURATION_FLOW):
+    """Y = sum over phase pairs of critical per-lane volume / saturation flow: (..., approach, hour) -> (..., hour).
+
+    ``lanes`` overrides DEFAULT_LANES per approach, e.g. {"EB": 1}.
+    """
+    return phase_critical_volumes(volumes, lanes_array(lanes)).sum(axis=-2) / saturation_flow
+
+
+def webster_cycle_length(flow_ratio, lost_time=LOST_TIME, min_cycle=MIN_CYCLE, max_cycle=MAX_CYCLE,
+                         step=CYCLE_STEP):
+    """Webster's optimal cycle C0 = (1.5 L + 5) / (1 - Y), rounded up to ``step`` and clipped.
+
+    Works on any array of critical flow ratios Y; NaN (no count) stays NaN and Y >= 1 gives ``max_cycle``.
+    """
+    flow_ratio = np.asarray(flow_ratio, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cycle = (1.5 * lost_time + 5) / (1 - flow_ratio)
+    cycle = np.where(flow_ratio >= 1, max_cycle, cycle)
+    cycle = np.clip(np.ceil(cycle / step) * step, min_cycle, max_cycle)
+    return np.where(np.isnan(flow_ratio), np.nan, cycle)
+
+
+def webster_cycle_lengths(volumes, lanes=None, saturation_flow=SATURATION_FLOW, lost_time=LOST_TIME,
+                          min_cycle=MIN_CYCLE, max_cycle=MAX_CYCLE, step=CYCLE_STEP):
+    """Optimal cycle (s) for every hour of (..., approach, hour) approach volumes -> (..., hour)"""
+    return webster_cycle_length(critical_flow_ratio(volumes, lanes, saturation_flow), lost_time,
+                                min_cycle, max_cycle, step)
@@ -0,0 +1,80 @@
+"""Import time and per-call overhead of the pure analytics package vs the old Streamlit-cached helpers.
+
+"Before" reproduces the previous helpers/reporting.py: the same functions wrapped in
+``st.cache_data`` (which means importing Streamlit and hashing every argument).
+
+    python -m benchmarks.bench_analytics
+"""
+import logging
+import subprocess
+import sys
+import time
+
+from analytics import filter_by_period, get_hourly_cycle_length, classify_cycle_lengths, hourly_recommendations
+from helpers.data_catalog import get_washington_st_data_paths, load_washington_st_data
+
+IMPORT_REPEATS = 5
+CALL_REPEATS = 5
+
+
+def import_seconds(statement):
+    """Best-of wall time for a fresh interpreter to run an import statement"""
+    timings = []
+    for _ in range(IMPORT_REPEATS):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def best_of(fn, repeats=CALL_REPEATS):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    baseline = import_seconds("pass")
+    print("== import time (fresh interpreter, minus bare startup) ==")
+    for label, statement in [
+        ("before: streamlit + cached helpers", "import streamlit, pandas"),
+        ("after:  analytics", "import analytics"),
+        ("after:  helpers.reporting", "import helpers.reporting"),
+    ]:
+        print(f"{label:<38}{(import_seconds(statement) - baseline) * 1000:>9.0f} ms")
+
+    import streamlit as st
+
+    logging.disable(logging.WARNING)  # bare-mode cache_data warns about the missing script context on every call
+    cached_cycle_length = st.cache_data(get_hourly_cycle_length)
+    cached_filter = st.cache_data(filter_by_period)
+
+    key = next(k for k, v in get_washington_st_data_paths().items() if v["data_type"] == "intersection")
+    df, _ = load_washington_st_data("Vehicle Volume", "Both", key, prefer_local=True)
+    month = df[(df["datetime"] >= "2025-05-01") & (df["datetime"] < "2025-06-01")]
+    volumes = month["Southbound"]
+
+    print(f"\n== per-call overhead ({len(month):,} hourly rows) ==")
+    print(f"{'call':<44}{'before ms':>11}{'after ms':>11}")
+    cases = [
+        ("cycle length, 1 scalar call",
+         lambda: cached_cycle_length(1234), lambda: get_hourly_cycle_length(1234), 200),
+        ("cycle length for every row",
+         lambda: volumes.apply(cached_cycle_length), lambda: classify_cycle_lengths(volumes), CALL_REPEATS),
+        ("filter_by_period (PM)",
+         lambda: cached_filter(month, "datetime", "PM"), lambda: filter_by_period(month, "datetime", "PM"),
+         CALL_REPEATS),
+    ]
+    for label, before_fn, after_fn, repeats in cases:
+        print(f"{label:<44}{best_of(before_fn, repeats):>11.3f}{best_of(after_fn, repeats):>11.3f}")
+
+    started = time.perf_counter()
+    hourly_recommendations(month, "datetime", "Southbound", "PM")
+    print(f"\nhourly_recommendations (PM, one month): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Paginated REST loads through helpers.api_connector against a local stub API.
+
+Serves a JSON API from a local HTTP server with a fixed per-request latency. Pages come back as
+{"data": [...], "total_pages": N} (page-number pagination) or {"data": [...], "next": "..."}
+(cursor pagination), and every request's Authorization header is recorded. Reported per case:
+wall time, requests sent to the server and the page cache hits / misses of that fetch:
+
+    serial     page numbers with max_workers=1 (one request at a time)
+    parallel   page numbers fetched concurrently
+    warm       the same fetch again through the shared page cache (no requests)
+    other key  the same fetch with another bearer token (must miss the cache)
+    cursor     cursor pagination (followed one link at a time)
+
+Then checks the guards: a cursor that links back to an earlier page stops there, a
+total_pages larger than max_pages is capped and reported as truncated, cursor pages keep the
+caller's query parameters, and an error body (/error) raises instead of becoming a record.
+
+    python -m benchmarks.bench_api_connector
+    python -m benchmarks.bench_api_connector --pages 40 --latency-ms 20
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from helpers.api_connector import PageCache, RestApiConnector, build_auth_headers
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    """JSON pages of hourly NB/SB records; /pages, /cursor, /loop and /error endpoints"""
+
+    pages = 20
+    rows_per_page = 200
+    latency = 0.01
+    requests = Counter()
+    tokens = Counter()
+    filters = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _records(self, page):
+        start = (page - 1) * self.rows_per_page
+        return [{"date": f"2025-04-{1 + hour // 24 % 28:02d}T{hour % 24:02d}:00:00Z",
+                 "direction": "NB" if hour % 2 else "SB", "value": hour % 900}
+                for hour in range(start, start + self.rows_per_page)]
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parsed = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        page = int(query.get("page", 1))
+        with self.lock:
+            type(self).requests[parsed.path] += 1
+            type(self).tokens[self.headers.get("Authorization")] += 1
+            type(self).filters[query.get("station")] += 1
+
+        if parsed.path == "/pages":
+            body = {"data": self._records(page), "total_pages": int(query.get("total", self.pages))}
+        elif parsed.path == "/cursor":
+            body = {"data": self._records(page), "next": f"/cursor?page={page + 1}" if page < self.pages else None}
+        elif parsed.path == "/loop":
+            # Page 3 links back to page 2: a broken cursor that would otherwise never end
+            body = {"data": self._records(page), "next": f"/loop?page={page + 1 if page < 3 else 2}"}
+        elif parsed.path == "/error":
+            body = {"error": "invalid api key"}  # an error body sent with a 200
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def timed_fetch(connector, url, token, params=None):
+    StubApiHandler.requests.clear()
+    headers = build_auth_headers({"auth_method": "Bearer Token", "bearer_token": token})
+    started = time.perf_counter()
+    df, stats = connector.fetch(url, params=params, headers=headers)
+    return df, stats, time.perf_counter() - started, sum(StubApiHandler.requests.values())
+
+
+def report(label, elapsed, sent, stats):
+    print(f"{label:<10}{elapsed * 1000:>10.0f}{sent:>10}{stats['pages']:>8}{stats['rows']:>8}"
+          f"{stats['cache_hits']:>7}{stats['cache_misses']:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="pages per endpoint")
+    parser.add_argument("--latency-ms", type=float, default=10, help="server delay per request")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent page requests")
+    args = parser.parse_args(argv)
+    StubApiHandler.pages = args.pages
+    StubApiHandler.latency = args.latency_ms / 1000
+
+    server, base_url = serve()
+    print(f"stub API at {base_url}: {args.pages} pages x {StubApiHandler.rows_per_page} rows, "
+          f"{args.latency_ms:.0f} ms per request\n")
+    print(f"{'case':<10}{'ms':>10}{'requests':>10}{'pages':>8}{'rows':>8}{'hits':>7}{'misses':>7}")
+    try:
+        cache = PageCache(ttl=300)
+        serial = RestApiConnector(max_workers=1, cache=PageCache(ttl=300))
+        parallel = RestApiConnector(max_workers=args.workers, cache=cache)
+
+        expected, stats, elapsed, sent = timed_fetch(serial, f"{base_url}/pages", "token-a")
+        report("serial", elapsed, sent, stats)
+
+        df, stats, elapsed, sent = timed_fetch(parallel, f"{base_url}/pages", "token-a")
+        report("parallel", elapsed, sent, stats)
+        assert df.equals(expected) and stats["cache_misses"] == args.pages
+
+        df, stats, elapsed, sent = timed_fetch(parallel, f"{base_url}/pages", "token-a")
+        report("warm", elapsed, sent, stats)
+        assert sent == 0 and stats["cache_hits"] == args.pages and df.equals(expected)
+
+        # Same URL and parameters with another credential: nothing may come from token-a's pages
+        StubApiHandler.tokens.clear()
+        df, stats, elapsed, sent = timed_fetch(parallel, f"{base_url}/pages", "token-b")
+        report("other key", elapsed, sent, stats)
+        assert stats["cache_hits"] == 0 and sent == args.pages
+        assert set(StubApiHandler.tokens) == {"Bearer token-b"}
+
+        StubApiHandler.filters.clear()
+        df, stats, elapsed, sent = timed_fetch(parallel, f"{base_url}/cursor", "token-a", params={"station": "7"})
+        report("cursor", elapsed, sent, stats)
+        assert df.equals(expected)
+        assert StubApiHandler.filters == {"7": args.pages}  # every page after the first kept the filter
+
+        # Guards: a looping cursor stops at the repeat, a huge total_pages is capped
+        looping = RestApiConnector(cache=None)
+        _, stats, _, sent = timed_fetch(looping, f"{base_url}/loop", "token-a")
+        assert stats["pages"] == 3 and sent == 3 and not stats["truncated"]
+
+        capped = RestApiConnector(max_workers=args.workers, cache=None, max_pages=5)
+        _, stats, _, sent = timed_fetch(capped, f"{base_url}/pages", "token-a", params={"total": 10 ** 6})
+        assert stats["pages"] == 5 and sent == 5 and stats["truncated"]
+
+        try:
+            timed_fetch(looping, f"{base_url}/error", "token-a")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an error body was returned as data")
+    finally:
+        server.shutdown()
+
+    print("\nframes match the serial fetch; another credential never hits the cache; cursor pages keep the "
+          "query parameters; looping cursors and oversized page counts stop; error bodies raise")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Plotly figure payloads: ISO-string / float64 traces vs epoch-ms / float32 binary typed arrays.
+
+Builds the Both-direction line chart the dashboard shows for a 1-day, 1-month and full-range
+window and serializes it the way st.plotly_chart does (plotly.io.to_json). "before" is the same
+figure with the traces as pandas Series (one ISO timestamp string per point, float64 values);
+"after" is what chart_components.charts now emits. Reported per window: payload bytes (raw and
+gzip, as a compressing proxy would send them), server-side serialization time and client-side
+parse time - JSON.parse plus turning x into numbers the way plotly.js must (Date parsing for
+strings, base64 -> typed array for binary specs), timed in Node when it is installed.
+
+    python -m benchmarks.bench_chart_payload
+    python -m benchmarks.bench_chart_payload --repeats 20
+"""
+import argparse
+import gzip
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from helpers.data_catalog import load_washington_st_data
+
+logging.disable(logging.WARNING)  # the chart builders import Streamlit
+
+from chart_components.charts import create_enhanced_multi_line_chart  # noqa: E402
+
+SEGMENT = "segment_ave48_to_ave47"
+WINDOWS = {
+    "1 day": ("2025-05-06", "2025-05-06"),
+    "1 month": ("2025-05-01", "2025-05-31"),
+    "full range": (None, None),
+}
+
+# Client side: what plotly.js has to do before it can lay out the traces
+NODE_PARSE = r"""
+const fs = require("fs");
+const [path, repeats] = [process.argv[1], Number(process.argv[2])];
+const text = fs.readFileSync(path, "utf8");
+const DTYPES = {f4: Float32Array, f8: Float64Array, i4: Int32Array, u4: Uint32Array, i2: Int16Array, u1: Uint8Array};
+function decode(value) {
+  if (value && value.bdata) {
+    const bytes = Buffer.from(value.bdata, "base64");
+    return new DTYPES[value.dtype](bytes.buffer, bytes.byteOffset, bytes.length / DTYPES[value.dtype].BYTES_PER_ELEMENT);
+  }
+  if (Array.isArray(value) && typeof value[0] === "string") return value.map(s => Date.parse(s.slice(0, 23)));
+  return value;
+}
+const times = [];
+for (let i = 0; i < repeats; i++) {
+  const started = process.hrtime.bigint();
+  const figure = JSON.parse(text);
+  for (const trace of figure.data) { trace.x = decode(trace.x); trace.y = decode(trace.y); }
+  times.push(Number(process.hrtime.bigint() - started) / 1e6);
+}
+times.sort((a, b) => a - b);
+console.log(times[Math.floor(times.length / 2)]);
+"""
+
+
+def window(df, start, end):
+    if start is not None:
+        df = df[(df["datetime"] >= pd.Timestamp(start)) & (df["datetime"] < pd.Timestamp(end) + pd.Timedelta(days=1))]
+    return df.reset_index(drop=True)
+
+
+def legacy_traces(fig, df):
+    """The same figure with traces as the Series the chart used to pass (ISO strings, float64)"""
+    fig = go.Figure(fig)
+    for trace in fig.data:
+        trace.x = df["datetime"]
+        trace.y = df[trace.name]
+    return fig
+
+
+def serialize(fig, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        payload = pio.to_json(fig, validate=False)
+        times.append(time.perf_counter() - started)
+    return payload, statistics.median(times) * 1000
+
+
+def client_parse_ms(payload, repeats):
+    node = shutil.which("node")
+    if not node:
+        return None
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "figure.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        output = subprocess.run([node, "-e", NODE_PARSE, path, str(repeats)], capture_output=True, text=True,
+                                check=True)
+    return float(output.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    df, _ = load_washington_st_data("Speed", "Both", SEGMENT, prefer_local=True)
+    if not shutil.which("node"):
+        print("node is not installed: client parse times are skipped")
+    print(f"{SEGMENT} speed, both directions, median of {args.repeats} runs\n")
+    print(f"{'window':<12}{'rows':>6}  {'payload':<8}{'KiB':>9}{'gzip KiB':>10}{'to_json ms':>12}{'parse ms':>10}")
+    for label, (start, end) in WINDOWS.items():
+        frame = window(df, start, end)
+        fig = create_enhanced_multi_line_chart(frame, "datetime", ["Northbound", "Southbound"], "Speed")
+        for name, variant in (("before", legacy_traces(fig, frame)), ("after", fig)):
+            payload, serialize_ms = serialize(variant, args.repeats)
+            parse_ms = client_parse_ms(payload, args.repeats)
+            print(f"{label:<12}{len(frame):>6}  {name:<8}{len(payload) / 1024:>9.1f}"
+                  f"{len(gzip.compress(payload.encode())) / 1024:>10.1f}{serialize_ms:>12.1f}"
+                  f"{parse_ms if parse_ms is not None else float('nan'):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Concurrent cold loads of one dataset: single-flight coalescing and stale-while-revalidate in DatasetStore.
+
+N threads released together by a barrier ask a cold DatasetStore for the same segment, the way
+sessions opened right after a deploy do. Every load reads the bundled CSV after sleeping --latency
+seconds to stand in for the download. Checked and reported:
+
+    cold       N simultaneous gets -> exactly one load, every caller gets the same dataset
+    failing    N simultaneous gets of a load that raises -> one attempt, every caller sees the error
+    expired    N simultaneous gets after the TTL -> all answered from the stale copy without
+               waiting, exactly one background reload, which then replaces it
+
+Exits 1 when a check fails.
+
+    python -m benchmarks.bench_cold_load
+    python -m benchmarks.bench_cold_load --threads 64 --latency 1.0
+"""
+import argparse
+import sys
+import threading
+import time
+
+from helpers.dataset_store import DatasetStore
+
+LOCATION = "segment_ave48_to_ave47"
+
+
+class SlowStore(DatasetStore):
+    """DatasetStore whose loads take ``latency`` seconds longer (and raise when ``fail`` is set)"""
+
+    def __init__(self, latency, fail=False, **kwargs):
+        super().__init__(prefer_local=True, **kwargs)
+        self.latency = latency
+        self.fail = fail
+
+    def _load(self, location_key):
+        dataset = super()._load(location_key)
+        time.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError("simulated download failure")
+        return dataset
+
+
+def fire(threads, call):
+    """Run ``call`` on ``threads`` threads released at once: (results or exceptions, per-call seconds)"""
+    results = [None] * threads
+    latencies = [0.0] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        started = time.perf_counter()
+        try:
+            results[index] = call()
+        except Exception as exc:
+            results[index] = exc
+        latencies[index] = time.perf_counter() - started
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32, help="simultaneous requesters")
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds added to every load")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    def check(condition, message):
+        print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+        if not condition:
+            failures.append(message)
+
+    print(f"{args.threads} simultaneous gets of {LOCATION}, {args.latency:.2f}s per load\n")
+
+    store = SlowStore(args.latency)
+    results, latencies = fire(args.threads, lambda: store.get(LOCATION))
+    print(f"cold: slowest caller {max(latencies):.2f}s")
+    check(store.stats["loads"] == 1, f"exactly one load ({store.stats['loads']})")
+    check(all(result is results[0] for result in results), "every caller got the same dataset")
+
+    store = SlowStore(args.latency, fail=True)
+    results, latencies = fire(args.threads, lambda: store.get(LOCATION))
+    print(f"failing: slowest caller {max(latencies):.2f}s")
+    check(store.stats["loads"] == 1, f"exactly one attempt ({store.stats['loads']})")
+    check(all(isinstance(result, ConnectionError) for result in results), "every caller saw the error")
+
+    ttl = 0.2
+    store = SlowStore(args.latency, ttl=ttl)
+    stale = store.get(LOCATION)
+    time.sleep(ttl * 1.5)
+    results, latencies = fire(args.threads, lambda: store.get(LOCATION))
+    print(f"expired: slowest caller {max(latencies) * 1000:.1f} ms")
+    check(all(result is stale for result in results), "every caller was answered from the stale copy")
+    check(max(latencies) < args.latency / 2, "no caller waited for the reload")
+    time.sleep(args.latency * 2)
+    check(store.stats["loads"] == 2, f"exactly one background reload ({store.stats['loads'] - 1})")
+    check(store.get(LOCATION) is not stale, "the reloaded dataset replaced the stale one")
+
+    if failures:
+        print(f"\nFAILED: {len(failures)} check(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Remote CSV loads: plain download vs the conditional-GET disk cache (helpers.http_cache).
+
+Serves the hwy111_to_ave52/ tree from a local HTTP server (Last-Modified + If-Modified-Since as
+http.server does, plus an ETag / If-None-Match built from size and mtime, as a CDN would) and
+loads every catalog dataset from it four ways:
+
+    download   pd.read_csv(url), what a cold in-process cache used to cost
+    cold       HttpCsvCache with an empty directory (download + parse + write the parquet copy)
+    fresh      a fresh HttpCsvCache on the same directory within max_age (parquet read, no request)
+    restart    the same past max_age (max_age=0: one 304 + parquet read per file)
+
+Then one file's mtime is bumped to show that a changed file is downloaded again once revalidated. Reported per
+mode: wall time, requests by status and response bytes; frames are checked equal to pd.read_csv.
+
+    python -m benchmarks.bench_http_cache
+    python -m benchmarks.bench_http_cache --last-modified-only
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from helpers import data_catalog
+from helpers.http_cache import HttpCsvCache
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """Static file handler that counts responses and optionally answers If-None-Match"""
+
+    use_etag = True
+    statuses = Counter()
+    bytes_sent = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _etag(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def send_head(self):
+        etag = self._etag() if self.use_etag else None
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+        self._etag_value = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, "_etag_value", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self._etag_value = None
+        super().end_headers()
+
+    def send_response(self, code, message=None):
+        with self.lock:
+            type(self).statuses[code] += 1
+        super().send_response(code, message)
+
+    def copyfile(self, source, outputfile):
+        before = source.tell()
+        super().copyfile(source, outputfile)
+        with self.lock:
+            type(self).bytes_sent += source.tell() - before
+
+
+def serve(directory, use_etag):
+    CountingHandler.use_etag = use_etag
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(CountingHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def catalog_urls(base_url):
+    return {key: base_url + info["url"][len(data_catalog.BASE_URL):]
+            for key, info in data_catalog.get_washington_st_data_paths().items()}
+
+
+def timed_loads(urls, read):
+    CountingHandler.statuses.clear()
+    CountingHandler.bytes_sent = 0
+    started = time.perf_counter()
+    frames = {key: read(url) for key, url in urls.items()}
+    elapsed = time.perf_counter() - started
+    return frames, elapsed, dict(CountingHandler.statuses), CountingHandler.bytes_sent
+
+
+def report(label, elapsed, statuses, sent):
+    requests = ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items()))
+    print(f"{label:<10}{elapsed * 1000:>10.0f}{sent / 2 ** 20:>10.2f}  {requests}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--last-modified-only", action="store_true",
+                        help="serve no ETag (revalidation relies on If-Modified-Since alone)")
+    args = parser.parse_args(argv)
+
+    server, base_url = serve(data_catalog.DATA_DIR, not args.last_modified_only)
+    urls = catalog_urls(base_url)
+    print(f"{len(urls)} catalog files served from {base_url} "
+          f"({'Last-Modified only' if args.last_modified_only else 'ETag + Last-Modified'})\n")
+    print(f"{'mode':<10}{'ms':>10}{'MiB sent':>10}  requests")
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected, elapsed, statuses, sent = timed_loads(urls, pd.read_csv)
+            report("download", elapsed, statuses, sent)
+
+            cold = HttpCsvCache(cache_dir)
+            frames, elapsed, statuses, sent = timed_loads(urls, cold.read_csv)
+            report("cold", elapsed, statuses, sent)
+
+            for label, max_age in (("fresh", 300), ("restart", 0)):
+                restart = HttpCsvCache(cache_dir, max_age=max_age)
+                frames, elapsed, statuses, sent = timed_loads(urls, restart.read_csv)
+                report(label, elapsed, statuses, sent)
+                for key, frame in frames.items():
+                    pd.testing.assert_frame_equal(frame, expected[key])
+
+            key, url = next(iter(urls.items()))
+            path = os.path.join(data_catalog.DATA_DIR, url[len(base_url):])
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+            try:
+                _, elapsed, statuses, sent = timed_loads(urls, HttpCsvCache(cache_dir, max_age=0).read_csv)
+                report("1 changed", elapsed, statuses, sent)
+            finally:
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    finally:
+        server.shutdown()
+
+    print("\nframes read back from the cache match pd.read_csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmarks for the dashboard's data and chart hot paths over the bundled hwy111_to_ave52 CSVs.
+
+Reports best / median time and tracemalloc peak memory per case. Save a run with --json and
+pass it as --baseline before a deploy; the script exits 1 when a case regresses.
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --json bench_baseline.json
+    python -m benchmarks.bench_pipeline --baseline bench_baseline.json -k charts
+    python -m benchmarks.bench_pipeline --skip-slow
+"""
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from analytics import box_stats, hourly_recommendations, recommendation_summary, critical_flow_ratio, \
+    webster_cycle_length, DEFAULT_LANES, LOST_TIME, SATURATION_FLOW, MIN_CYCLE, MAX_CYCLE, cycle_length_seconds, \
+    optimize_plan_breaks, phase_critical_volumes
+from benchmarks.harness import Suite, main
+from helpers.approach_volumes import load_approach_volumes
+from helpers.data_catalog import VARIABLE_METRICS, get_washington_st_data_paths, load_washington_st_data
+from helpers.dataset_store import DatasetStore
+from helpers.granularity import GRANULARITIES, load_at_granularity
+from helpers.reporting import create_pdf_report
+
+# The chart builders import Streamlit; silence its bare-mode warnings
+logging.disable(logging.WARNING)
+
+from chart_components.charts import create_enhanced_line_chart, create_enhanced_multi_line_chart  # noqa: E402
+
+SEGMENT = "segment_ave48_to_ave47"
+INTERSECTION = "intersection_washington_ave50"
+
+# Windows used for the chart cases (full range = the whole season in the file)
+WINDOWS = {
+    "1 day": ("2025-05-06", "2025-05-06"),
+    "1 month": ("2025-05-01", "2025-05-31"),
+    "full range": (None, None),
+}
+
+
+def window(df, start, end):
+    if start is not None:
+        df = df[df["datetime"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["datetime"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+    return df.reset_index(drop=True)
+
+
+def heatmap_pivot(df, value_col):
+    """Same day x hour pivot the Heatmap chart type builds"""
+    df_heat = df.copy()
+    df_heat["hour"] = df_heat["datetime"].dt.hour
+    df_heat = df_heat.sort_values("datetime")
+    df_heat["day"] = df_heat["datetime"].dt.strftime("%a %m/%d")
+    pivot_table = df_heat.pivot_table(values=value_col, index="day", columns="hour")
+    return pivot_table.reindex(sorted(pivot_table.index, key=lambda x: pd.to_datetime(x, format="%a %m/%d")))
+
+
+def build_suite():
+    suite = Suite("pipeline")
+
+    # === DATA LOADING (local copies) ===
+    for key, info in get_washington_st_data_paths().items():
+        variable = next(name for name, metric in VARIABLE_METRICS.items() if f"nb_{metric}" in info["columns"])
+        suite.add("load_washington_st_data", key,
+                  lambda key=key, variable=variable: load_washington_st_data(variable, "Both", key, prefer_local=True),
+                  repeats=3)
+
+    speed, _ = load_washington_st_data("Speed", "Both", SEGMENT, prefer_local=True)
+    volume, _ = load_washington_st_data("Vehicle Volume", "Both", INTERSECTION, prefer_local=True)
+
+    # === CHART BUILDERS ===
+    for label, (start, end) in WINDOWS.items():
+        frame = window(speed, start, end)
+        # Day shading adds one shape per day, so the full-range charts take close to a minute each
+        slow = label == "full range"
+        suite.add("charts", f"line {label} ({len(frame):,} rows)",
+                  lambda frame=frame: create_enhanced_line_chart(frame, "datetime", "Southbound", "Speed"),
+                  repeats=3, slow=slow)
+        suite.add("charts", f"multi-line {label} ({len(frame):,} rows)",
+                  lambda frame=frame: create_enhanced_multi_line_chart(frame, "datetime",
+                                                                       ["Northbound", "Southbound"], "Speed"),
+                  repeats=3, slow=slow)
+
+    # === HEATMAP PIVOTS ===
+    for label, (start, end) in WINDOWS.items():
+        frame = window(speed, start, end)
+        suite.add("heatmap pivots", f"day x hour {label}", lambda frame=frame: heatmap_pivot(frame, "Southbound"))
+
+    # === BOX STATISTICS (Box chart type: server-side quartiles, optionally grouped) ===
+    for label, (start, end) in WINDOWS.items():
+        frame = window(volume, start, end)
+        for by in (None, "hour", "month"):
+            suite.add("box stats", f"{by or 'ungrouped'} {label}",
+                      lambda frame=frame, by=by: box_stats(frame["Southbound"], frame["datetime"], by))
+
+    # === GRANULARITY (cold weekly view: hourly file + resample vs the coarsest source that fits) ===
+    def weekly_from_hourly(key, variable):
+        hourly, _ = load_washington_st_data(variable, "Both", key, prefer_local=True)
+        hourly = window(hourly, "2024-11-01", "2025-05-31")
+        return hourly.set_index("datetime").resample(GRANULARITIES["1 Week"], closed="left", label="left").agg(
+            "sum" if variable == "Vehicle Volume" else "mean")
+
+    # Whole-corridor volume: the shipped Daily_SUM file
+    suite.add("granularity", "corridor_washington_volume 1 Week from the hourly file",
+              lambda: weekly_from_hourly("corridor_washington_volume", "Vehicle Volume"))
+    suite.add("granularity", "corridor_washington_volume 1 Week via the daily file",
+              lambda: load_at_granularity("Vehicle Volume", "Both", "corridor_washington_volume", "1 Week",
+                                          "2024-11-01", "2025-05-31", prefer_local=True))
+
+    # Per-location datasets and averaged values: the shared store's daily rollup (built on the first
+    # call, as in the app), whose hourly sums and counts keep weekly averages equal to the hourly ones
+    store = DatasetStore(prefer_local=True)
+    for key, variable in ((INTERSECTION, "Vehicle Volume"), ("corridor_washington_speed", "Speed")):
+        suite.add("granularity", f"{key} 1 Week from the hourly file",
+                  lambda key=key, variable=variable: weekly_from_hourly(key, variable))
+        suite.add("granularity", f"{key} 1 Week via the store's daily rollup",
+                  lambda key=key, variable=variable: load_at_granularity(
+                      variable, "Both", key, "1 Week", "2024-11-01", "2025-05-31",
+                      hourly_loader=store.frame, daily_loader=store.daily_frame))
+
+    # === APPROACH VOLUMES (total entering + critical sum by hour of day, every intersection, whole season) ===
+    approaches = load_approach_volumes(prefer_local=True)
+
+    def profiles_per_intersection():
+        profiles = {}
+        for key in approaches.intersections:
+            frame = approaches.frame(key)
+            profiles[key] = frame.groupby(frame["datetime"].dt.hour)[["Total Entering", "Critical Sum"]].mean()
+        return profiles
+
+    suite.add("approach volumes", "load all NSEWB files", lambda: load_approach_volumes(prefer_local=True),
+              repeats=3)
+    suite.add("approach volumes", "hour-of-day profiles per intersection (pandas)", profiles_per_intersection)
+    suite.add("approach volumes", "hour-of-day profiles, one array", approaches.hourly_profiles)
+
+    # === CYCLE LENGTH ANALYSIS (render_cycle_length_analysis computations) ===
+    for label, (start, end) in WINDOWS.items():
+        frame = window(volume, start, end)
+        for period in ("AM", "PM"):
+            suite.add("cycle length", f"{period} recommendations {label}",
+                      lambda frame=frame, period=period: recommendation_summary(
+                          hourly_recommendations(frame, "datetime", "Southbound", period)))
+
+    # === WEBSTER CYCLE LENGTH (every intersection x hour of the season) ===
+    def webster_per_hour():
+        cycles = {}
+        for key in approaches.intersections:
+            for row in approaches.frame(key).itertuples(index=False):
+                y = (max(row.NB / DEFAULT_LANES["NB"], row.SB / DEFAULT_LANES["SB"])
+                     + max(row.EB / DEFAULT_LANES["EB"], row.WB / DEFAULT_LANES["WB"])) / SATURATION_FLOW
+                cycle = MAX_CYCLE if y >= 1 else math.ceil((1.5 * LOST_TIME + 5) / (1 - y) / 5) * 5
+                cycles[key, row.datetime] = min(max(cycle, MIN_CYCLE), MAX_CYCLE)
+        return cycles
+
+    suite.add("cycle length", f"Webster per hour, Python loop ({approaches.volumes.shape[-1]:,} h x 8)",
+              webster_per_hour)
+    suite.add("cycle length", "Webster whole season, one array",
+              lambda: webster_cycle_length(critical_flow_ratio(approaches.volumes)))
+
+    # === PLAN BREAKS (4-plan DP over weekday + weekend typical days of every intersection) ===
+    typical = np.concatenate([phase_critical_volumes(days)[:, 0, :]
+                              for days in approaches.typical_days().values()])
+    recommended = cycle_length_seconds(typical)
+    suite.add("plan breaks", f"one profile at a time ({len(typical)} profiles)",
+              lambda: [optimize_plan_breaks(recommended[i:i + 1], typical[i:i + 1]) for i in range(len(typical))])
+    suite.add("plan breaks", f"all {len(typical)} profiles in one batch",
+              lambda: optimize_plan_breaks(recommended, typical))
+
+    # === PDF REPORT ===
+    month_speed = window(speed, *WINDOWS["1 month"])
+    chart = create_enhanced_multi_line_chart(month_speed, "datetime", ["Northbound", "Southbound"], "Speed")
+    suite.add("create_pdf_report", "no chart",
+              lambda: create_pdf_report("Speed", "05/01/2025 - 05/31/2025", None, "Data Source: GitHub Repository"))
+    suite.add("create_pdf_report", "vector chart (1 month hourly)",
+              lambda: create_pdf_report("Speed", "05/01/2025 - 05/31/2025", chart, "Data Source: GitHub Repository"),
+              repeats=3)
+    return suite
+
+
+if __name__ == "__main__":
+    main(build_suite())
@@ -0,0 +1,111 @@
+"""Compare the DuckDB query engine against the equivalent pandas chains.
+
+Every query runs over the local copies of the catalog datasets.
+
+    python -m benchmarks.bench_query_engine
+"""
+import time
+
+import pandas as pd
+
+from helpers.data_catalog import get_washington_st_data_paths
+from helpers.query_engine import CorridorQueryEngine, PERIOD_HOURS
+
+REPEATS = 5
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def load_frames(data_paths):
+    frames = {}
+    for key, info in data_paths.items():
+        df = pd.read_csv(info["path"])
+        df[info["columns"]["datetime"]] = pd.to_datetime(df[info["columns"]["datetime"]], format="%m/%d/%Y %H:%M")
+        frames[key] = df.rename(columns={v: k for k, v in info["columns"].items()})
+    return frames
+
+
+def pandas_top_hours(frames, data_paths, n=10):
+    parts = []
+    for key, info in data_paths.items():
+        if info["data_type"] == "intersection":
+            df = frames[key][["datetime", "sb_volume"]].rename(columns={"sb_volume": "value"})
+            df["location_key"] = key
+            parts.append(df)
+    return pd.concat(parts).nlargest(n, "value")
+
+
+def pandas_period_totals(df, period):
+    start_hour, end_hour = PERIOD_HOURS[period]
+    hours = df["datetime"].dt.hour
+    period_df = df[(hours >= start_hour) & (hours <= end_hour)]
+    return period_df["nb_volume"].sum(), period_df["sb_volume"].sum()
+
+
+def pandas_hourly_profile(df):
+    return df.groupby(df["datetime"].dt.hour)["sb_volume"].mean()
+
+
+def pandas_cycle_length_hours(df, period):
+    start_hour, end_hour = PERIOD_HOURS[period]
+    hours = df["datetime"].dt.hour
+    period_df = df[(hours >= start_hour) & (hours <= end_hour)]
+    hourly = period_df.groupby(period_df["datetime"].dt.hour)["sb_volume"].sum().rename("volume").reset_index()
+    hourly["cvag_recommendation"] = pd.cut(hourly["volume"], [-float("inf"), 300, 600, 1500, 2400, float("inf")],
+                                           right=False,
+                                           labels=["Free mode", "110 sec", "120 sec", "130 sec", "140 sec"])
+    return hourly
+
+
+def pandas_heatmap(df):
+    heat = df[["datetime", "sb_speed"]].copy()
+    heat["hour"] = heat["datetime"].dt.hour
+    heat["day"] = heat["datetime"].dt.date
+    return heat.pivot_table(values="sb_speed", index="day", columns="hour")
+
+
+def main():
+    data_paths = get_washington_st_data_paths()
+
+    started = time.perf_counter()
+    engine = CorridorQueryEngine(data_paths)
+    print(f"DuckDB registration (materialized): {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    frames = load_frames(data_paths)
+    print(f"pandas read_csv + parse:            {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    intersection = "intersection_washington_ave50"
+    segment = "segment_ave48_to_ave47"
+    cases = [
+        ("top 10 SB volume hours (8 intersections)",
+         lambda: pandas_top_hours(frames, data_paths),
+         lambda: engine.top_hours("Vehicle Volume", "SB", 10)),
+        ("AM period NB/SB totals",
+         lambda: pandas_period_totals(frames[intersection], "AM"),
+         lambda: engine.period_totals(intersection, "AM")),
+        ("hour-of-day SB volume profile",
+         lambda: pandas_hourly_profile(frames[intersection]),
+         lambda: engine.hourly_profile("Vehicle Volume", intersection, "SB")),
+        ("day x hour SB speed heatmap",
+         lambda: pandas_heatmap(frames[segment]),
+         lambda: engine.heatmap_matrix("Speed", segment, "SB")),
+        ("PM cycle-length hourly sums",
+         lambda: pandas_cycle_length_hours(frames[intersection], "PM"),
+         lambda: engine.cycle_length_hours(intersection, "SB", "PM")),
+    ]
+
+    print(f"{'query':<44}{'pandas ms':>11}{'duckdb ms':>11}")
+    for label, pandas_fn, duck_fn in cases:
+        print(f"{label:<44}{best_of(pandas_fn):>11.2f}{best_of(duck_fn):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare native vector charts against Kaleido PNG rasterization in PDF reports.
+
+Builds one single-chart page per catalog dataset (hourly data for one month) with each
+chart mode and reports milliseconds and bytes per page. The PNG path needs Kaleido and
+Chrome; it is skipped with a note when they are unavailable.
+
+    python -m benchmarks.bench_report_charts
+"""
+import io
+import time
+
+from reportlab.graphics import renderPDF
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from helpers.batch_report import BATCH_VARIABLES, build_chart_figure, load_chart_data, plan_batch_pages
+from helpers.reporting import render_chart_image, start_image_exporter
+from helpers.vector_charts import build_line_drawing, frame_series
+
+START, END = "2025-05-01", "2025-05-31"
+
+
+def build_page(df, variable, title, chart_mode):
+    """One letter page holding a single 500x300 chart; returns the PDF bytes"""
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    if chart_mode == "vector":
+        drawing = build_line_drawing(frame_series(df, "datetime", ["Northbound", "Southbound"]), 500, 300, title)
+        renderPDF.draw(drawing, p, 50, 400)
+    else:
+        img_bytes = render_chart_image(build_chart_figure(df, variable, title), width=500, height=300)
+        p.drawImage(ImageReader(io.BytesIO(img_bytes)), 50, 400, width=500, height=300)
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def run_mode(charts, chart_mode):
+    timings, sizes = [], []
+    for df, variable, title in charts:
+        started = time.perf_counter()
+        pdf_bytes = build_page(df, variable, title, chart_mode)
+        timings.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(pdf_bytes))
+    return sum(timings) / len(timings), sum(sizes) / len(sizes)
+
+
+def main():
+    charts = []
+    for key, name, data_type, variables in plan_batch_pages():
+        variable = BATCH_VARIABLES[data_type][0]
+        df = load_chart_data(variable, key, START, END, resample_rule="h")
+        charts.append((df, variable, f"{name} - {variable}"))
+    print(f"{len(charts)} charts, ~{len(charts[0][0]):,} hourly points per series ({START} to {END})\n")
+
+    print(f"{'mode':<8}{'ms/page':>10}{'KB/page':>10}")
+    vector_ms, vector_bytes = run_mode(charts, "vector")
+    print(f"{'vector':<8}{vector_ms:>10.1f}{vector_bytes / 1024:>10.1f}")
+
+    if not start_image_exporter():
+        print("png       unavailable (Kaleido / Chrome not installed)")
+        return
+    try:
+        run_mode(charts[:1], "png")  # warm-up: first export pays the browser start
+        png_ms, png_bytes = run_mode(charts, "png")
+    except Exception as e:
+        print(f"{'png':<8}  failed: {' '.join(str(e).split())}")
+        return
+    print(f"{'png':<8}{png_ms:>10.1f}{png_bytes / 1024:>10.1f}")
+    print(f"\nvector is {png_ms / vector_ms:.1f}x faster and {png_bytes / vector_bytes:.1f}x smaller per page")
+
+
+if __name__ == "__main__":
+    main()
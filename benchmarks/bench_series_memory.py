@@ -0,0 +1,53 @@
+"""Memory held by the data cache: per-selection DataFrames vs one packed HourlySeries per dataset.
+
+"Before" is what st.cache_data used to hold once every variable and direction had been viewed:
+one float64 DataFrame per (location, variable, direction). st.cache_data keeps pickled values,
+so both the in-memory and the pickled size are reported.
+
+    python -m benchmarks.bench_series_memory
+"""
+import pickle
+import time
+
+from helpers.data_catalog import (get_washington_st_data_paths, load_hourly_series,
+                                  load_washington_st_data, series_frame)
+
+VARIABLES = {
+    "segment": ("Speed", "Travel Time", "Delay"),
+    "intersection": ("Vehicle Volume",),
+}
+DIRECTIONS = ("NB", "SB", "Both")
+
+
+def main():
+    frame_bytes = frame_pickled = series_bytes = series_pickled = 0
+    rebuild_ms = []
+    rows = 0
+
+    for key, info in get_washington_st_data_paths().items():
+        series, _ = load_hourly_series(key, prefer_local=True)
+        series_bytes += series.nbytes
+        series_pickled += len(pickle.dumps(series))
+        rows += len(series)
+
+        for variable in VARIABLES[info["data_type"]]:
+            for direction in DIRECTIONS:
+                df, _ = load_washington_st_data(variable, direction, key, prefer_local=True)
+                frame_bytes += int(df.memory_usage(deep=True).sum())
+                frame_pickled += len(pickle.dumps(df))
+
+                started = time.perf_counter()
+                series_frame(series, variable, direction)
+                rebuild_ms.append((time.perf_counter() - started) * 1000)
+
+    print(f"{rows:,} hourly rows across {len(get_washington_st_data_paths())} datasets\n")
+    print(f"{'':<34}{'in memory':>12}{'pickled':>12}")
+    print(f"{'before: DataFrame per selection':<34}{frame_bytes / 2**20:>10.2f} M{frame_pickled / 2**20:>10.2f} M")
+    print(f"{'after:  HourlySeries per dataset':<34}{series_bytes / 2**20:>10.2f} M{series_pickled / 2**20:>10.2f} M")
+    print(f"{'reduction':<34}{frame_bytes / series_bytes:>11.1f}x{frame_pickled / series_pickled:>11.1f}x")
+    print(f"\nframe rebuilt per rerun: median {sorted(rebuild_ms)[len(rebuild_ms) // 2]:.2f} ms, "
+          f"max {max(rebuild_ms):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
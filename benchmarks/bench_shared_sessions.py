@@ -0,0 +1,91 @@
+"""Simulated concurrent sessions: st.cache_data copies vs the shared read-only DatasetStore.
+
+Each simulated session is a thread that repeatedly does what a rerun of the corridor view does:
+fetch the Both-direction frame for the selected segment and keep it (as the session's current
+frame). "Before" fetches through st.cache_data, which unpickles a private copy on every hit;
+"after" asks the shared store for a zero-copy frame. Reported per N sessions: median / p95
+latency of one fetch and the memory held by the N live frames (tracemalloc).
+
+    python -m benchmarks.bench_shared_sessions
+    python -m benchmarks.bench_shared_sessions --sessions 1 10 30 60 --interactions 20
+"""
+import argparse
+import logging
+import statistics
+import threading
+import time
+import tracemalloc
+
+from helpers.data_catalog import load_washington_st_data
+from helpers.dataset_store import DatasetStore
+
+LOCATION = "segment_ave48_to_ave47"
+VARIABLES = ("Speed", "Travel Time", "Delay")
+
+
+def run_sessions(fetch, sessions, interactions):
+    """Latencies of every fetch plus bytes still allocated by the sessions' current frames"""
+    latencies = []
+    latencies_lock = threading.Lock()
+    current = [None] * sessions
+    barrier = threading.Barrier(sessions)
+
+    def session(index):
+        barrier.wait()
+        for step in range(interactions):
+            started = time.perf_counter()
+            df, _ = fetch(VARIABLES[step % len(VARIABLES)], "Both", LOCATION)
+            elapsed = (time.perf_counter() - started) * 1000
+            current[index] = df
+            with latencies_lock:
+                latencies.append(elapsed)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencies, held - baseline
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--interactions", type=int, default=12, help="fetches per session")
+    args = parser.parse_args(argv)
+
+    import streamlit as st
+
+    logging.disable(logging.WARNING)  # bare-mode cache_data warns about the missing script context
+
+    @st.cache_data
+    def cached_load(variable, direction, location_key):
+        return load_washington_st_data(variable, direction, location_key, prefer_local=True)
+
+    store = DatasetStore(prefer_local=True)
+    for variable in VARIABLES:  # warm both caches so only hits are timed
+        cached_load(variable, "Both", LOCATION)
+        store.frame(variable, "Both", LOCATION)
+
+    print(f"{LOCATION}, {args.interactions} fetches per session "
+          f"(shared store holds {store.nbytes / 2 ** 20:.2f} MiB for the whole process)\n")
+    print(f"{'sessions':>8}  {'path':<16}{'median ms':>10}{'p95 ms':>9}{'held MiB':>10}{'per session KiB':>17}")
+    for sessions in args.sessions:
+        for label, fetch in (("st.cache_data", cached_load), ("DatasetStore", store.frame)):
+            latencies, held = run_sessions(fetch, sessions, args.interactions)
+            median, p95 = summarize(latencies)
+            print(f"{sessions:>8}  {label:<16}{median:>10.3f}{p95:>9.3f}{held / 2 ** 20:>10.2f}"
+                  f"{held / sessions / 1024:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare server-side aggregation (pushdown) against pulling raw hourly rows.
+
+Builds a long-format ``traffic_data`` table (date, direction, value) from the bundled
+segment speed CSVs in SQLite, and in DuckDB when ``duckdb_engine`` is installed, then
+times both strategies for each granularity.
+
+    python -m benchmarks.bench_sql_pushdown
+"""
+import glob
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from helpers.sql_source import get_engine, load_aggregated, load_raw, dispose_engines
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hwy111_to_ave52")
+GRANULARITIES = ["1 Hour", "1 Day", "1 Week", "1 Month"]
+PANDAS_RULES = {"1 Hour": "h", "1 Day": "D", "1 Week": "W-MON", "1 Month": "MS"}
+REPEATS = 5
+
+
+def build_long_table():
+    """Melt every segment speed file into one long date/direction/value frame"""
+    frames = []
+    pattern = os.path.join(DATA_DIR, "DELAY_TRAVELTIME_SPEED_byintersection", "*.csv")
+    for path in sorted(glob.glob(pattern)):
+        df = pd.read_csv(path, usecols=["local_datetime", "NB_average_speed", "SB_average_speed"])
+        df["local_datetime"] = pd.to_datetime(df["local_datetime"], format="%m/%d/%Y %H:%M")
+        long_df = df.melt(id_vars="local_datetime", var_name="direction", value_name="value")
+        long_df["direction"] = long_df["direction"].str[:2]
+        frames.append(long_df.rename(columns={"local_datetime": "date"}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def pandas_resample(df, granularity):
+    """The client-side equivalent: filter + resample the raw rows in pandas"""
+    df = df.set_index("date")
+    return (df.groupby("direction")["value"].resample(PANDAS_RULES[granularity], label="left", closed="left")
+            .mean().dropna().reset_index())
+
+
+def best_of(fn):
+    timings = []
+    result = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def run(engine, label):
+    print(f"\n== {label} ==")
+    print(f"{'granularity':<12}{'pushdown ms':>14}{'rows':>8}{'raw+pandas ms':>16}{'rows pulled':>13}{'speedup':>9}")
+    filters = dict(start="2024-10-01", end="2025-05-31", direction="SB")
+    for granularity in GRANULARITIES:
+        push_ms, pushed = best_of(lambda: load_aggregated(engine, "traffic_data", granularity=granularity,
+                                                          agg="avg", **filters))
+        raw_rows = {}
+
+        def pull_and_resample():
+            raw = load_raw(engine, "traffic_data", **filters)
+            raw_rows["n"] = len(raw)
+            return pandas_resample(raw, granularity)
+
+        raw_ms, _ = best_of(pull_and_resample)
+        print(f"{granularity:<12}{push_ms:>14.1f}{len(pushed):>8,}{raw_ms:>16.1f}{raw_rows['n']:>13,}"
+              f"{raw_ms / push_ms:>8.1f}x")
+
+
+def main():
+    long_df = build_long_table()
+    print(f"Loaded {len(long_df):,} long-format rows from the segment speed files")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_engine = get_engine(f"sqlite:///{os.path.join(tmp, 'traffic.sqlite')}")
+        long_df.to_sql("traffic_data", sqlite_engine, index=False)
+        with sqlite_engine.begin() as conn:
+            conn.exec_driver_sql("CREATE INDEX ix_traffic_date ON traffic_data (direction, date)")
+        run(sqlite_engine, "SQLite")
+
+        try:
+            import duckdb_engine  # noqa: F401
+        except ImportError:
+            print("\n(duckdb_engine not installed - skipping DuckDB)")
+        else:
+            duck_engine = get_engine(f"duckdb:///{os.path.join(tmp, 'traffic.duckdb')}")
+            long_df.to_sql("traffic_data", duck_engine, index=False)
+            run(duck_engine, "DuckDB")
+
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
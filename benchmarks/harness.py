@@ -0,0 +1,108 @@
+"""Tiny benchmark harness: wall time plus tracemalloc peak memory, JSON results and baseline comparison."""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+
+def measure(fn, repeats=5, warmup=1):
+    """Best / median wall time over ``repeats`` runs, then one traced run for peak memory"""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Tracing slows Python code down a lot, so memory gets its own run
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"best_ms": min(timings), "median_ms": statistics.median(timings), "peak_kib": peak / 1024}
+
+
+class Suite:
+    """Named benchmark cases grouped for reporting"""
+
+    def __init__(self, name):
+        self.name = name
+        self.cases = []
+
+    def add(self, group, name, fn, repeats=5, slow=False):
+        """Register a case; slow cases run once without warm-up and can be skipped with --skip-slow"""
+        self.cases.append((group, name, fn, 1 if slow else repeats, slow))
+
+    def run(self, pattern=None, repeats=None, skip_slow=False):
+        results = []
+        current_group = None
+        for group, name, fn, case_repeats, slow in self.cases:
+            case_id = f"{group}/{name}"
+            if (pattern and pattern not in case_id) or (slow and skip_slow):
+                continue
+            if group != current_group:
+                print(f"\n== {group} ==")
+                print(f"{'case':<46}{'best ms':>10}{'median ms':>11}{'peak MiB':>10}")
+                current_group = group
+            stats = measure(fn, case_repeats if slow else repeats or case_repeats, warmup=0 if slow else 1)
+            print(f"{name:<46}{stats['best_ms']:>10.2f}{stats['median_ms']:>11.2f}{stats['peak_kib'] / 1024:>10.2f}")
+            results.append({"id": case_id, **stats})
+        return results
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Cases whose median time or peak memory grew by more than the tolerance over the baseline"""
+    previous = {case["id"]: case for case in baseline["results"]}
+    regressions = []
+    for case in results:
+        old = previous.get(case["id"])
+        if old is None:
+            continue
+        if case["median_ms"] > old["median_ms"] * (1 + time_tolerance):
+            regressions.append((case["id"], "time", old["median_ms"], case["median_ms"], "ms"))
+        if case["peak_kib"] > old["peak_kib"] * (1 + memory_tolerance):
+            regressions.append((case["id"], "memory", old["peak_kib"] / 1024, case["peak_kib"] / 1024, "MiB"))
+    return regressions
+
+
+def main(suite, argv=None):
+    """Run a suite from the command line; exits 1 when a baseline comparison finds regressions"""
+    parser = argparse.ArgumentParser(description=f"{suite.name} benchmarks")
+    parser.add_argument("-k", "--filter", help="only run cases whose group/name contains this text")
+    parser.add_argument("--repeats", type=int, help="override the per-case repeat count")
+    parser.add_argument("--skip-slow", action="store_true", help="skip cases that take several seconds each")
+    parser.add_argument("--json", metavar="PATH", help="write results to a JSON file (use as a later --baseline)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a previous --json run")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="allowed median time growth (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed peak memory growth")
+    args = parser.parse_args(argv)
+
+    results = suite.run(args.filter, args.repeats, args.skip_slow)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"suite": suite.name, "python": platform.python_version(), "created_at": time.time(),
+                       "results": results}, f, indent=2)
+        print(f"\nwrote {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for case_id, kind, old, new, unit in regressions:
+                print(f"  {case_id}: {kind} {old:,.2f} -> {new:,.2f} {unit}")
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
@@ -0,0 +1,128 @@
+"""Local load test of the multi-process serving mode: reruns per second as the worker count grows.
+
+For each worker count this starts ``python -m helpers.serve``, then drives it with simulated
+browser sessions over the Streamlit websocket (/_stcore/stream): each session sends a rerun
+request and waits for script_finished, back to back, for the test duration. Sessions connect from
+distinct loopback addresses (127.0.0.10, .11, ...) so the balancer's client-IP stickiness spreads
+them over the workers as it would real users.
+
+Memory is the summed proportional set size (PSS) of the worker processes: pages of the
+memory-mapped data tier are split between the workers that map them, so PSS shows what each
+worker really adds. Linux only (reads /proc).
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --workers 1 2 4 8 --sessions 16 --duration 30
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from tornado import httpclient, ioloop, websocket
+from tornado.gen import multi
+
+from helpers.data_tier import build_data_tier, tier_is_current
+from helpers.serve import DEFAULT_TIER, wait_until_healthy
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+
+def _rerun_message():
+    message = BackMsg()
+    message.rerun_script.query_string = ""
+    message.rerun_script.page_script_hash = ""
+    return message.SerializeToString()
+
+
+async def rerun(connection, payload):
+    """Request one script run and wait for it to finish; returns seconds taken"""
+    started = time.perf_counter()
+    await connection.write_message(payload, binary=True)
+    while True:
+        raw = await connection.read_message()
+        if raw is None:
+            raise ConnectionError("session closed by the server")
+        message = ForwardMsg()
+        message.ParseFromString(raw)
+        if message.WhichOneof("type") == "script_finished":
+            return time.perf_counter() - started
+
+
+async def session(port, index, deadline, latencies):
+    request = httpclient.HTTPRequest(f"ws://127.0.0.1:{port}/_stcore/stream",
+                                     network_interface=f"127.0.0.{10 + index}")
+    connection = await websocket.websocket_connect(request, subprotocols=["streamlit"])
+    payload = _rerun_message()
+    try:
+        await rerun(connection, payload)  # first run builds the session; not timed
+        while time.perf_counter() < deadline:
+            latencies.append(await rerun(connection, payload))
+    finally:
+        connection.close()
+
+
+def worker_pids(parent_pid):
+    children = set()
+    for task in os.listdir(f"/proc/{parent_pid}/task"):
+        with open(f"/proc/{parent_pid}/task/{task}/children") as f:
+            children.update(int(pid) for pid in f.read().split())
+    return sorted(children)
+
+
+def pss_mib(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_load(workers, sessions, duration, port, data_tier):
+    serve = subprocess.Popen([sys.executable, "-m", "helpers.serve", "--workers", str(workers),
+                              "--port", str(port), "--host", "127.0.0.1", "--data-tier", data_tier],
+                             stderr=subprocess.DEVNULL)
+    try:
+        wait_until_healthy([port])
+        time.sleep(1)  # the balancer starts once every worker is healthy
+
+        latencies = []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        ioloop.IOLoop.current().run_sync(
+            lambda: multi([session(port, i, deadline, latencies) for i in range(sessions)]))
+        elapsed = time.perf_counter() - started
+
+        memory = sum(pss_mib(pid) for pid in worker_pids(serve.pid))
+        return len(latencies) / elapsed, latencies, memory
+    finally:
+        serve.terminate()
+        serve.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reruns per second vs dashboard worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated browser sessions")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per worker count")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--data-tier", default=DEFAULT_TIER)
+    args = parser.parse_args(argv)
+
+    if not tier_is_current(args.data_tier):
+        build_data_tier(args.data_tier)
+
+    print(f"{args.sessions} sessions, {args.duration:.0f}s per run, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>7}{'reruns/s':>10}{'median ms':>11}{'p95 ms':>9}{'PSS MiB':>10}{'per worker':>12}")
+    for workers in args.workers:
+        rps, latencies, memory = run_load(workers, args.sessions, args.duration, args.port, args.data_tier)
+        ordered = sorted(latencies)
+        p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)] if ordered else float("nan")
+        median = statistics.median(ordered) if ordered else float("nan")
+        print(f"{workers:>7}{rps:>10.2f}{median * 1000:>11.0f}{p95 * 1000:>9.0f}{memory:>10.0f}"
+              f"{memory / workers:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
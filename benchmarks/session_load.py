@@ -0,0 +1,241 @@
+"""Concurrent dashboard sessions driven headlessly through Streamlit's AppTest, for release gating.
+
+Each simulated session is its own AppTest (own session state) changing the sidebar the way a
+user would - variable, direction, location, chart type and date range, picked from the options
+the app itself renders - and rerunning. AppTest swaps a process-wide mock runtime in and out
+around every run, so runs cannot overlap inside one process: sessions are spread over worker
+processes that run in parallel, and the sessions inside one process take turns, sharing its
+caches like sessions on one server. The app reads the corridor CSVs bundled with the repository
+(DASHBOARD_LOCAL_DATA=1), so nothing touches the network.
+
+Reports p50 / p95 / p99 rerun latency (overall, per chart type and per date range), reruns that
+raised, and worker memory. With --max-p95-ms / --max-errors the script exits 1 when a gate is missed.
+
+    python -m benchmarks.session_load
+    python -m benchmarks.session_load --sessions 8 --processes 4 --interactions 10 --json load.json
+    python -m benchmarks.session_load --chart-types Bar Box Heatmap --max-p95-ms 5000 --max-errors 0
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "streamlit_app.py")
+
+# Date ranges offered to a session, as (label, days from the start of the data; None = everything)
+DATE_RANGES = [("1 day", 1), ("1 week", 7), ("1 month", 31), ("full range", None)]
+
+# Sidebar widgets a session changes between reruns
+CHANGES = ("variable", "direction", "location", "chart type", "date range")
+
+
+def rss_mib():
+    """Current resident set size (falls back to the peak where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mib()
+
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Session:
+    """One simulated user: an AppTest instance plus a seeded random walk over the sidebar"""
+
+    def __init__(self, index, seed, chart_types, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.random = random.Random(seed)
+        self.chart_types = chart_types
+        self.timeout = timeout
+        self.app = AppTest.from_file(APP_SCRIPT, default_timeout=timeout)
+        self.samples = []  # (latency_s, chart_type, date_range_label, change, ok)
+
+    def _rerun(self, change, chart_type, range_label):
+        started = time.perf_counter()
+        try:
+            self.app.run(timeout=self.timeout)
+            ok = not self.app.exception
+        except Exception:
+            ok = False
+        self.samples.append((time.perf_counter() - started, chart_type, range_label, change, ok))
+
+    def _options(self, kind, key):
+        try:
+            return list(getattr(self.app, kind)(key=key).options)
+        except (KeyError, AttributeError):
+            return []
+
+    def _set(self, kind, key, value):
+        try:
+            getattr(self.app, kind)(key=key).set_value(value)
+        except (KeyError, AttributeError):
+            pass
+
+    def _set_date_range(self, days):
+        try:
+            widget = self.app.date_input(key="smart_date_range")
+        except KeyError:
+            return
+        # The widget's default value is the full range of data for the selected variable
+        first, last = widget.value
+        if days is not None:
+            start = first + timedelta(days=self.random.randrange(max((last - first).days - days, 1)))
+            first, last = start, start + timedelta(days=days - 1)
+        widget.set_value((first, last))
+
+    def start(self):
+        self.chart_type = self.random.choice(self.chart_types)
+        self.range_label = "full range"
+        self.app.session_state["chart_type_static"] = self.chart_type
+        self._rerun("first load", self.chart_type, self.range_label)
+
+    def step(self):
+        """Change one sidebar widget and rerun"""
+        change = self.random.choice(CHANGES)
+        if change == "variable":
+            options = self._options("selectbox", "variable")
+            if options:
+                self._set("selectbox", "variable", self.random.choice(options))
+        elif change == "direction":
+            options = self._options("radio", "direction")
+            if options:
+                self._set("radio", "direction", self.random.choice(options))
+        elif change == "location":
+            options = self._options("selectbox", "location_selector")
+            if options:
+                self._set("selectbox", "location_selector", self.random.choice(options))
+        elif change == "chart type":
+            self.chart_type = self.random.choice(self.chart_types)
+            self._set("selectbox", "chart_type_static", self.chart_type)
+        else:
+            self.range_label, days = self.random.choice(DATE_RANGES)
+            self._set_date_range(days)
+        self._rerun(change, self.chart_type, self.range_label)
+
+
+def run_worker(session_indices, interactions, chart_types, timeout, seed):
+    """Run a group of sessions in this process, taking turns; returns samples and memory"""
+    os.environ["DASHBOARD_LOCAL_DATA"] = "1"
+    sys.path.insert(0, APP_DIR)
+    logging.disable(logging.WARNING)  # bare-mode Streamlit logs a missing ScriptRunContext per call
+
+    rss_start = rss_mib()
+    sessions = [Session(index, seed + index, chart_types, timeout) for index in session_indices]
+    for session in sessions:
+        session.start()
+    for _ in range(interactions):
+        for session in sessions:
+            session.step()
+    samples = [sample for session in sessions for sample in session.samples]
+    return samples, rss_start, rss_mib(), peak_rss_mib()
+
+
+def run_sessions(sessions, processes, interactions, chart_types, timeout, seed):
+    groups = [list(range(sessions))[i::processes] for i in range(processes)]
+    groups = [group for group in groups if group]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+        futures = [pool.submit(run_worker, group, interactions, chart_types, timeout, seed) for group in groups]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+    samples = [sample for worker_samples, *_ in results for sample in worker_samples]
+    memory = {
+        "workers": len(groups),
+        "rss_start_mib": sum(result[1] for result in results),
+        "rss_end_mib": sum(result[2] for result in results),
+        "peak_mib_per_worker": max(result[3] for result in results),
+    }
+    return samples, elapsed, memory
+
+
+def summarize(samples):
+    latencies = [latency * 1000 for latency, *_ in samples]
+    return {
+        "reruns": len(samples),
+        "errors": sum(1 for *_, ok in samples if not ok),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": max(latencies) if latencies else float("nan"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent AppTest sessions against the bundled data")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent simulated sessions")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="worker processes the sessions are spread over")
+    parser.add_argument("--interactions", type=int, default=6, help="sidebar changes per session")
+    parser.add_argument("--chart-types", nargs="+", default=["Line", "Bar", "Scatter", "Box", "Heatmap"])
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed for one rerun")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", metavar="PATH", help="write the summary and every sample to a JSON file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail when overall p95 rerun latency exceeds this")
+    parser.add_argument("--max-errors", type=int, help="fail when more reruns than this raise")
+    args = parser.parse_args(argv)
+
+    samples, elapsed, memory = run_sessions(args.sessions, args.processes, args.interactions, args.chart_types,
+                                            args.timeout, args.seed)
+    overall = summarize(samples)
+
+    print(f"{args.sessions} sessions in {memory['workers']} processes x {args.interactions + 1} reruns "
+          f"in {elapsed:.1f}s ({overall['reruns'] / elapsed:.2f} reruns/s), {overall['errors']} with exceptions")
+    print(f"memory: worker RSS {memory['rss_start_mib']:.0f} -> {memory['rss_end_mib']:.0f} MiB in total, "
+          f"peak {memory['peak_mib_per_worker']:.0f} MiB in one worker\n")
+    print(f"{'':<22}{'reruns':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    groups = defaultdict(list)
+    for sample in samples:
+        groups[f"chart: {sample[1]}"].append(sample)
+        groups[f"range: {sample[2]}"].append(sample)
+    rows = [("all reruns", overall)] + [(name, summarize(group)) for name, group in sorted(groups.items())]
+    for name, stats in rows:
+        print(f"{name:<22}{stats['reruns']:>7}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}"
+              f"{stats['p99_ms']:>10.0f}{stats['max_ms']:>10.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "sessions": args.sessions, "interactions": args.interactions, "elapsed_s": elapsed,
+                "memory_mib": memory,
+                "summary": dict(rows),
+                "samples": [{"ms": latency * 1000, "chart_type": chart_type, "date_range": date_range,
+                             "change": change, "ok": ok}
+                            for latency, chart_type, date_range, change, ok in samples],
+            }, f, indent=2)
+
+    failures = []
+    if args.max_p95_ms is not None and overall["p95_ms"] > args.max_p95_ms:
+        failures.append(f"p95 {overall['p95_ms']:.0f} ms > {args.max_p95_ms:.0f} ms")
+    if args.max_errors is not None and overall["errors"] > args.max_errors:
+        failures.append(f"{overall['errors']} reruns raised > {args.max_errors}")
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,35 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import timedelta, time  # Add 'time' import
+from plotly.subplots import make_subplots
+from datetime import time
 import numpy as np
 
 
+# === BINARY TRACE DATA ===
+# plotly.io.to_json (what st.plotly_chart sends) writes numeric numpy arrays as base64 typed arrays,
+# but datetimes as one ISO string per point. Date axes read plain numbers as epoch milliseconds,
+# so times go out as a float64 array and values as float32.
+
+def epoch_ms(values):
+    """Wall-clock datetimes as float64 epoch milliseconds (NaT -> NaN)"""
+    times = pd.DatetimeIndex(values)
+    if times.tz is not None:
+        times = times.tz_localize(None)
+    ms = times.asi8 // 1_000_000
+    return np.where(times.isna(), np.nan, ms.astype(np.float64))
+
+
+def binary_x(values):
+    """Trace x for a binary payload: epoch ms for datetimes, anything else unchanged"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return epoch_ms(values)
+    return values
+
+
+def binary_y(values):
+    """Trace y for a binary payload: float32 typed array"""
+    return np.asarray(pd.to_numeric(pd.Series(values), errors="coerce"), dtype=np.float32)
 
 
 def is_single_day_data(df, x_col):
@@ -144,28 +169,17 @@ def add_alternating_day_shading(fig, df, x_col):
     # Colors for alternating days
     day_colors = ["rgba(52, 152, 219, 0.08)", "rgba(155, 186, 227, 0.08)"]  # Very light blue shades
 
-    # Iterate through each day and add alternating shading
-    current_date = start_datetime.date()
-    end_date = end_datetime.date()
-    day_index = 0
-
-    while current_date <= end_date:
-        day_start = pd.Timestamp.combine(current_date, time(0, 0))
-        day_end = pd.Timestamp.combine(current_date, time(23, 59, 59))
-
-        # Only add shading if the day overlaps with our data range
-        if day_start <= end_datetime and day_end >= start_datetime:
-            fig.add_vrect(
-                x0=max(day_start, start_datetime),
-                x1=min(day_end, end_datetime),
-                fillcolor=day_colors[day_index % 2],
-                opacity=1.0,
-                layer="below",
-                line_width=0,
-            )
-
-        current_date += timedelta(days=1)
-        day_index += 1
+    # One rect per day, clipped to the data range; added in one layout update, since each
+    # fig.add_vrect call re-validates every shape added before it
+    day_starts = pd.date_range(start_datetime.normalize(), end_datetime.normalize(), freq="D")
+    x0 = np.maximum(epoch_ms(day_starts), epoch_ms([start_datetime]))
+    x1 = np.minimum(epoch_ms(day_starts + pd.Timedelta(hours=23, minutes=59, seconds=59)), epoch_ms([end_datetime]))
+    day_shapes = [
+        dict(type="rect", xref="x", yref="y domain", x0=start, x1=end, y0=0, y1=1,
+             fillcolor=day_colors[day_index % 2], opacity=1.0, layer="below", line_width=0)
+        for day_index, (start, end) in enumerate(zip(x0, x1))
+    ]
+    fig.update_layout(shapes=list(fig.layout.shapes) + day_shapes)
 
 
 def create_enhanced_line_chart(df, x_col, y_col, chart_title):
@@ -174,8 +188,8 @@ def create_enhanced_line_chart(df, x_col, y_col, chart_title):
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y_col],
+        x=binary_x(df[x_col]),
+        y=binary_y(df[y_col]),
         mode='lines+markers',
         name=y_col,
         line=dict(
@@ -262,6 +276,8 @@ def create_enhanced_line_chart(df, x_col, y_col, chart_title):
 
     # Smart X-axis tick configuration based on data span
     data_span = get_data_span_days(df, x_col)
+    if pd.api.types.is_datetime64_any_dtype(df[x_col]):
+        fig.update_xaxes(type="date")  # x is sent as epoch milliseconds
 
     if data_span == 1:
         # Single day - show every hour (00:00, 01:00, 02:00, etc.)
@@ -328,8 +344,8 @@ def create_enhanced_multi_line_chart(df, x_col, y_cols, chart_title):
     # Add traces for each direction with enhanced styling
     for i, col in enumerate(y_cols):
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[col],
+            x=binary_x(df[x_col]),
+            y=binary_y(df[col]),
             mode='lines+markers',
             name=col,
             line=dict(
@@ -424,6 +440,8 @@ def create_enhanced_multi_line_chart(df, x_col, y_cols, chart_title):
 
     # Smart X-axis tick configuration based on data span
     data_span = get_data_span_days(df, x_col)
+    if pd.api.types.is_datetime64_any_dtype(df[x_col]):
+        fig.update_xaxes(type="date")  # x is sent as epoch milliseconds
 
     if data_span == 1:
         # Single day - show every hour (00:00, 01:00, 02:00, etc.)
@@ -547,3 +565,91 @@ def create_box_plot(df, x_col, y_col, chart_title):
     return fig
 
 
+def create_box_stats_chart(stats_by_series, chart_title, y_title, x_title=None):
+    """Box plot from precomputed statistics (analytics.box_stats) - one box trace per series"""
+    fig = go.Figure()
+    colors = ["#2E86C1", "#C0392B"]
+
+    for i, (name, stats) in enumerate(stats_by_series.items()):
+        color = colors[i % len(colors)]
+        # Ungrouped boxes sit at their series name; grouped ones at their hour / weekday / month
+        x = [name] * len(stats["group"]) if x_title is None else stats["group"]
+        fig.add_trace(go.Box(
+            name=name, x=x, offsetgroup=name,
+            q1=stats["q1"], median=stats["median"], q3=stats["q3"], mean=stats["mean"],
+            lowerfence=stats["lowerfence"], upperfence=stats["upperfence"],
+            marker_color=color, boxpoints=False,
+        ))
+        outlier_x = [label for label, points in zip(x, stats["outliers"]) for _ in points]
+        if outlier_x:
+            fig.add_trace(go.Scatter(
+                x=outlier_x, y=np.concatenate(stats["outliers"]), mode="markers", name=f"{name} outliers",
+                offsetgroup=name, marker=dict(color=color, size=4, opacity=0.6), showlegend=False,
+            ))
+
+    fig.update_layout(
+        title=chart_title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        boxmode="group",
+        scattermode="group",
+    )
+    return fig
+
+
+def create_density_scatter_chart(density, chart_title, x_title, y_title):
+    """Scatter from analytics.scatter_density: a count heatmap for large scatters, plain points otherwise"""
+    fig = go.Figure()
+    if density["grid"] is not None:
+        grid = density["grid"]
+        # Empty bins stay transparent so the shape of the cloud reads like a scatter
+        counts = np.where(grid["counts"] > 0, grid["counts"], np.nan)
+        fig.add_trace(go.Heatmap(
+            x=grid["x"], y=grid["y"], z=counts, colorscale="Blues",
+            colorbar=dict(title="Hours"), hovertemplate="%{x:.0f}, %{y:.1f}: %{z} hours<extra></extra>",
+        ))
+    elif density["points"] is not None:
+        x, y = density["points"]
+        fig.add_trace(go.Scattergl(x=x, y=y, mode="markers", marker=dict(color="#2E86C1", size=5, opacity=0.6)))
+
+    fig.update_layout(title=chart_title, xaxis_title=x_title, yaxis_title=y_title, plot_bgcolor="white")
+    return fig
+
+
+def create_time_density_chart(densities, chart_title, y_title):
+    """Time-series scatter from analytics.time_scatter_density (series name -> density).
+
+    Small series are drawn as points in one chart; when any series is binned, each gets its own
+    count heatmap row over a shared time axis.
+    """
+    colors = ["#2E86C1", "#C0392B"]
+    if all(density["grid"] is None for density in densities.values()):
+        fig = go.Figure()
+        for i, (name, density) in enumerate(densities.items()):
+            x, y = density["points"]
+            fig.add_trace(go.Scattergl(x=x, y=y, mode="markers", name=name,
+                                       marker=dict(color=colors[i % len(colors)], size=5, opacity=0.6)))
+        fig.update_layout(title=chart_title, xaxis_title="Time", yaxis_title=y_title, plot_bgcolor="white")
+        return fig
+
+    fig = make_subplots(rows=len(densities), cols=1, shared_xaxes=True, vertical_spacing=0.08,
+                        subplot_titles=list(densities))
+    for row, (name, density) in enumerate(densities.items(), start=1):
+        if density["grid"] is not None:
+            grid = density["grid"]
+            # Empty bins stay transparent so the shape of the cloud reads like a scatter
+            counts = np.where(grid["counts"] > 0, grid["counts"], np.nan)
+            fig.add_trace(go.Heatmap(
+                x=grid["x"], y=grid["y"], z=counts, coloraxis="coloraxis", name=name,
+                hovertemplate="%{x|%b %d, %Y}, %{y:.1f}: %{z} hours<extra></extra>",
+            ), row=row, col=1)
+        else:
+            x, y = density["points"]
+            fig.add_trace(go.Scattergl(x=x, y=y, mode="markers", name=name, showlegend=False,
+                                       marker=dict(color=colors[(row - 1) % len(colors)], size=5, opacity=0.6)),
+                          row=row, col=1)
+        fig.update_yaxes(title_text=y_title, row=row, col=1)
+    fig.update_layout(title=chart_title, coloraxis=dict(colorscale="Blues", colorbar=dict(title="Hours")),
+                      plot_bgcolor="white", height=300 + 200 * len(densities))
+    return fig
+
@@ -1,15 +1,6 @@
 import streamlit as st
 
 
-def find_column(df, patterns):
-    """Find column that matches any of the patterns (case-insensitive)"""
-    for pattern in patterns:
-        for col in df.columns:
-            if pattern.lower() in col.lower():
-                return col
-    return None
-
-
 def get_base_title(variable, direction):
     """Get the base title for charts"""
     if direction == "Both":
@@ -0,0 +1,307 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Canonical long-format columns every API source is mapped into
+CANONICAL_COLUMNS = ['date', 'direction', 'value']
+
+# Response keys we understand when following paginated responses
+RECORD_KEYS = ['data', 'results', 'items', 'records']
+TOTAL_PAGES_KEYS = ['total_pages', 'totalPages', 'page_count', 'pages']
+NEXT_KEYS = ['next', 'next_url', 'nextPage']
+
+# Upper bound on pages followed in one fetch (a runaway cursor or an inflated total_pages)
+MAX_PAGES = 1000
+
+
+# === POOLED HTTP SESSION ===
+def build_session(pool_size=10, retries=3, backoff_factor=0.5):
+    """Create a pooled HTTP session that retries transient errors with exponential backoff"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def build_auth_headers(config):
+    """Build request headers from the sidebar authentication settings"""
+    headers = {'Accept': 'application/json'}
+    if config.get('auth_method') == 'API Key':
+        headers[config.get('key_header') or 'X-API-Key'] = config.get('api_key') or ''
+    elif config.get('auth_method') == 'Bearer Token':
+        headers['Authorization'] = f"Bearer {config.get('bearer_token')}"
+    elif config.get('auth_method') == 'Basic Auth':
+        credentials = f"{config.get('username', '')}:{config.get('password', '')}".encode('utf-8')
+        headers['Authorization'] = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+    return headers
+
+
+def parse_query_params(raw):
+    """Parse the optional JSON query parameters text area into a dict"""
+    if not raw:
+        return {}
+    if isinstance(raw, dict):
+        return raw
+    params = json.loads(raw)
+    if not isinstance(params, dict):
+        raise ValueError("Query parameters must be a JSON object")
+    return params
+
+
+# === PAGE CACHE ===
+class PageCache:
+    """Thread-safe TTL cache for API pages keyed by URL, query parameters and request headers.
+
+    The headers carry the credentials, so a page fetched with one API key or token is never served
+    to a request made with another (the cache is shared by every session of the server process).
+    """
+
+    def __init__(self, ttl=300, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(url, params, headers=None):
+        """Build a stable cache key (parameter and header order do not matter; credentials are hashed)"""
+        query = urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        header_items = sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())
+        digest = hashlib.sha256(json.dumps(header_items).encode('utf-8')).hexdigest()[:32]
+        return f"{url}?{query}#{digest}"
+
+    def get(self, url, params, headers=None):
+        key = self.make_key(url, params, headers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, url, params, payload, headers=None):
+        key = self.make_key(url, params, headers)
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop the oldest page to stay within the entry cap
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic(), payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# === RESPONSE PARSING ===
+def _extract_records(payload):
+    """Return the list of records from a page payload.
+
+    Raises ValueError for an object without a record list (e.g. an error body sent with a 200).
+    """
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in RECORD_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        raise ValueError(f"Response has no record list under {RECORD_KEYS}; keys found: {sorted(payload)[:10]}")
+    return []
+
+
+def _missing_params(url, params):
+    """The ``params`` that ``url`` does not already carry in its query string"""
+    present = {name for name, _ in urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, keep_blank_values=True)}
+    return {name: value for name, value in params.items() if name not in present}
+
+
+def _find_meta_value(payload, keys):
+    """Look up pagination metadata at the top level or under meta/pagination"""
+    if not isinstance(payload, dict):
+        return None
+    for container in (payload, payload.get('meta') or {}, payload.get('pagination') or {}):
+        if not isinstance(container, dict):
+            continue
+        for key in keys:
+            if container.get(key) is not None:
+                return container[key]
+    return None
+
+
+def records_to_frame(records, field_map=None):
+    """Stream a list of JSON records into the canonical date/direction/value frame"""
+    field_map = field_map or {}
+    date_key = field_map.get('date', 'date')
+    direction_key = field_map.get('direction', 'direction')
+    value_key = field_map.get('value', 'value')
+
+    dates, directions, values = [], [], []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        dates.append(record.get(date_key))
+        directions.append(record.get(direction_key))
+        values.append(record.get(value_key))
+
+    return pd.DataFrame({
+        'date': pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce', utc=True).dt.tz_localize(None),
+        'direction': pd.Series(directions, dtype=object).astype('string').str.upper().astype('category'),
+        'value': pd.to_numeric(pd.Series(values, dtype=object), errors='coerce'),
+    })
+
+
+# === CONNECTOR ===
+class RestApiConnector:
+    """Fetch paginated REST responses concurrently over a pooled session"""
+
+    def __init__(self, session=None, cache=None, max_workers=8, timeout=30,
+                 page_param='page', page_size_param='page_size', page_size=500, max_pages=MAX_PAGES):
+        self.session = session or build_session(pool_size=max_workers)
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.page_param = page_param
+        self.page_size_param = page_size_param
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+
+    def _get_json(self, url, params, headers, counts=None):
+        """GET one page, serving it from the page cache when still fresh (hits / misses tallied in ``counts``)"""
+        if self.cache is not None:
+            cached = self.cache.get(url, params, headers)
+            if counts is not None:
+                with self._lock:
+                    counts['cache_hits' if cached is not None else 'cache_misses'] += 1
+            if cached is not None:
+                return cached
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+
+        if self.cache is not None:
+            self.cache.put(url, params, payload, headers)
+        return payload
+
+    def _page_params(self, base_params, page):
+        params = dict(base_params)
+        if self.page_param:
+            params[self.page_param] = page
+        if self.page_size_param and self.page_size:
+            params.setdefault(self.page_size_param, self.page_size)
+        return params
+
+    def fetch(self, url, params=None, headers=None, field_map=None):
+        """Fetch every page (at most max_pages) and return (canonical DataFrame, throughput stats).
+
+        ``stats['truncated']`` is True when pages were left unfetched because of the page cap; a
+        cursor that links back to a page already fetched ends the fetch.
+        """
+        started = time.perf_counter()
+        base_params = dict(params or {})
+        headers = headers or {}
+        counts = {'cache_hits': 0, 'cache_misses': 0}
+        truncated = False
+
+        first = self._get_json(url, self._page_params(base_params, 1), headers, counts)
+        frames = {1: records_to_frame(_extract_records(first), field_map)}
+
+        total_pages = _find_meta_value(first, TOTAL_PAGES_KEYS)
+        if total_pages and int(total_pages) > 1:
+            # Page count is known up front: fetch the remaining pages concurrently
+            truncated = int(total_pages) > self.max_pages
+            pages = range(2, min(int(total_pages), self.max_pages) + 1)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(self._get_json, url, self._page_params(base_params, page), headers, counts): page
+                    for page in pages
+                }
+                for future in as_completed(futures):
+                    # Each page is converted as soon as it lands instead of buffering raw JSON
+                    frames[futures[future]] = records_to_frame(_extract_records(future.result()), field_map)
+        else:
+            # Cursor pagination can only be followed one link at a time; next links keep the caller's
+            # parameters (filters, page size, keys) unless they carry their own value for them
+            cursor_params = {name: value for name, value in self._page_params(base_params, 1).items()
+                             if name != self.page_param or name in base_params}
+            next_url = _find_meta_value(first, NEXT_KEYS)
+            seen = {url}
+            page = 1
+            while next_url:
+                next_url = urllib.parse.urljoin(url, next_url)
+                if next_url in seen:
+                    break  # the cursor points back at a page already fetched
+                if page >= self.max_pages:
+                    truncated = True
+                    break
+                seen.add(next_url)
+                page += 1
+                payload = self._get_json(next_url, _missing_params(next_url, cursor_params), headers, counts)
+                frames[page] = records_to_frame(_extract_records(payload), field_map)
+                next_url = _find_meta_value(payload, NEXT_KEYS)
+
+        df = pd.concat([frames[p] for p in sorted(frames)], ignore_index=True)
+        df = df.dropna(subset=['date']).sort_values('date', kind='stable').reset_index(drop=True)
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            'pages': len(frames),
+            'rows': len(df),
+            'elapsed_sec': elapsed,
+            'pages_per_sec': len(frames) / elapsed if elapsed > 0 else float('inf'),
+            'rows_per_sec': len(df) / elapsed if elapsed > 0 else float('inf'),
+            'truncated': truncated,
+            **counts,
+        }
+        return df, stats
+
+    def test_connection(self, url, params=None, headers=None):
+        """Fetch only the first page to validate the endpoint and auth settings"""
+        payload = self._get_json(url, self._page_params(dict(params or {}), 1), headers or {})
+        return {
+            'records_on_first_page': len(_extract_records(payload)),
+            'total_pages': _find_meta_value(payload, TOTAL_PAGES_KEYS),
+            'has_next_link': _find_meta_value(payload, NEXT_KEYS) is not None,
+        }
+
+
+def fetch_rest_api(config, session=None, cache=None):
+    """Load a REST API source described by the sidebar config dict"""
+    connector = RestApiConnector(
+        session=session,
+        cache=cache,
+        max_workers=int(config.get('max_workers') or 8),
+        page_param=config.get('page_param', 'page'),
+        page_size_param=config.get('page_size_param', 'page_size'),
+        page_size=int(config.get('page_size') or 500),
+        max_pages=int(config.get('max_pages') or MAX_PAGES),
+    )
+    return connector.fetch(
+        config.get('url'),
+        params=parse_query_params(config.get('query_params')),
+        headers=build_auth_headers(config),
+        field_map=config.get('field_map'),
+    )
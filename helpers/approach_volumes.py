@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from analytics.approaches import APPROACHES, critical_volume_sum, hour_of_day_profile, \
+    phase_critical_volumes, total_entering_volume
+from analytics.webster import critical_flow_ratio, webster_cycle_length
+from helpers import http_cache
+from helpers.data_catalog import APPROACH_VOLUME_FILES, approach_volume_sources
+
+# Typical-day types by pandas day of week (Monday = 0)
+DAY_TYPES = {"Weekday": (0, 1, 2, 3, 4), "Weekend": (5, 6)}
+
+# Direction word in the KMOB column headers -> approach (direction of travel)
+DIRECTION_WORDS = {"NORTH": "NB", "SOUTH": "SB", "EAST": "EB", "WEST": "WB"}
+
+
+def parse_wide_file(df):
+    """(dates, approach indexes, hours, values) of a wide KMOB file; values is (hour row, date-approach column)"""
+    hours = pd.to_datetime(df.iloc[:, 0].astype(str).str.strip(), format="%H:%M").dt.hour.to_numpy()
+    # Headers carry a BOM and padding ("01/01/2025    EAST  ")
+    labels = [" ".join(str(column).replace("\ufeff", "").split()) for column in df.columns[1:]]
+    dates = pd.to_datetime([label.split(" ")[0] for label in labels], format="%m/%d/%Y")
+    approaches = np.array([APPROACHES.index(DIRECTION_WORDS[label.split(" ")[-1].upper()]) for label in labels])
+    values = df.iloc[:, 1:]
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in values.dtypes):
+        values = values.apply(pd.to_numeric, errors="coerce")  # blanks / text cells become NaN
+    values = values.to_numpy(dtype=np.float32)
+    return dates.to_numpy(dtype="datetime64[D]"), approaches, hours, values
+
+
+class ApproachVolumes:
+    """Hourly entering volume of every approach at every corridor intersection, as one array.
+
+    ``volumes[i, a, t]`` is the volume of ``APPROACHES[a]`` at ``intersections[i]`` in hour ``times[t]``
+    (float32). The time axis is whole days from midnight, NaN wherever an intersection has no count;
+    approaches an intersection does not have (T-intersections) are 0 wherever it was counted.
+    """
+
+    def __init__(self, intersections, times, volumes, flow_ratios=None, cycle_lengths=None):
+        self.intersections = tuple(intersections)
+        self.approaches = APPROACHES
+        self.times = pd.DatetimeIndex(times)
+        self.volumes = volumes
+        self._flow_ratios = flow_ratios
+        self._cycle_lengths = cycle_lengths
+
+    @classmethod
+    def from_files(cls, sources, read_csv=http_cache.read_csv):
+        """Build from {intersection_key: [path or URL, ...]} of wide KMOB files (later files win on overlap)"""
+        parsed = {key: [parse_wide_file(read_csv(source)) for source in files] for key, files in sources.items()}
+        all_dates = np.concatenate([dates for files in parsed.values() for dates, _, _, _ in files])
+        first, last = all_dates.min(), all_dates.max()
+        days = int((last - first).astype(int)) + 1
+
+        volumes = np.full((len(parsed), len(APPROACHES), days * 24), np.nan, dtype=np.float32)
+        for i, files in enumerate(parsed.values()):
+            counted = np.zeros(days * 24, dtype=bool)
+            for dates, approaches, hours, values in files:
+                # Every cell lands at (approach of its column, day of its column * 24 + hour of its row)
+                slots = (dates - first).astype(int)[None, :] * 24 + hours[:, None]
+                volumes[i, np.broadcast_to(approaches, slots.shape), slots] = values
+                counted[slots.ravel()] = True
+            absent = np.isnan(volumes[i]).all(axis=1)
+            volumes[i, absent[:, None] & counted[None, :]] = 0
+
+        times = pd.date_range(pd.Timestamp(first), periods=days * 24, freq="h")
+        return cls(parsed, times, volumes)
+
+    def index(self, intersection_key):
+        return self.intersections.index(intersection_key)
+
+    def _time_slice(self, start=None, end=None):
+        """Slice of whole days from ``start`` through ``end`` (dates, inclusive)"""
+        lo = 0 if start is None else self.times.searchsorted(pd.Timestamp(start).normalize())
+        hi = len(self.times) if end is None else \
+            self.times.searchsorted(pd.Timestamp(end).normalize() + pd.Timedelta(days=1))
+        return slice(lo, hi)
+
+    def select(self, intersections=None, start=None, end=None):
+        """(intersection keys, times, volumes) for some intersections over whole days start..end"""
+        keys = self.intersections if intersections is None else tuple(intersections)
+        rows = [self.index(key) for key in keys]
+        window = self._time_slice(start, end)
+        return keys, self.times[window], self.volumes[rows, :, window]
+
+    def frame(self, intersection_key, start=None, end=None):
+        """One intersection as a DataFrame: datetime, NB, SB, EB, WB, Total Entering, Critical Sum"""
+        _, times, volumes = self.select([intersection_key], start, end)
+        volumes = volumes[0]
+        df = pd.DataFrame(volumes.T, columns=list(APPROACHES))
+        df.insert(0, "datetime", times)
+        df["Total Entering"] = total_entering_volume(volumes)
+        df["Critical Sum"] = critical_volume_sum(volumes)
+        return df.dropna(subset=["Total Entering"]).reset_index(drop=True)
+
+    def hourly_profiles(self, start=None, end=None, weekdays_only=False):
+        """Average hour of day for every intersection at once, computed on the whole array.
+
+        Returns {"approaches": (I, A, 24), "total": (I, 24), "critical": (I, phase, 24),
+        "critical_sum": (I, 24)}; NaN where an intersection has no count in the window.
+        """
+        _, times, volumes = self.select(start=start, end=end)
+        day_mask = times[::24].dayofweek < 5 if weekdays_only else None
+        return {
+            "approaches": hour_of_day_profile(volumes, day_mask),
+            "total": hour_of_day_profile(total_entering_volume(volumes), day_mask),
+            "critical": hour_of_day_profile(phase_critical_volumes(volumes), day_mask),
+            "critical_sum": hour_of_day_profile(critical_volume_sum(volumes), day_mask),
+        }
+
+    def typical_days(self, start=None, end=None):
+        """{day type: (intersection, approach, 24) average day} over whole days start..end, every intersection at once"""
+        _, times, volumes = self.select(start=start, end=end)
+        weekdays = times[::24].dayofweek
+        return {day_type: hour_of_day_profile(volumes, np.isin(weekdays, days)) for day_type, days in DAY_TYPES.items()}
+
+    @property
+    def flow_ratios(self):
+        """Critical flow ratio Y per (intersection, hour) with the default lanes and saturation flow, computed once"""
+        if self._flow_ratios is None:
+            self._flow_ratios = critical_flow_ratio(self.volumes).astype(np.float32)
+        return self._flow_ratios
+
+    @property
+    def cycle_lengths(self):
+        """Webster optimal cycle (s) per (intersection, hour), computed once from flow_ratios"""
+        if self._cycle_lengths is None:
+            self._cycle_lengths = webster_cycle_length(self.flow_ratios).astype(np.float32)
+        return self._cycle_lengths
+
+    def cycle_length_profile(self, intersection_key, start=None, end=None):
+        """(cycles, flow ratios): average Webster cycle and Y by hour of day at one intersection, days start..end"""
+        row, window = self.index(intersection_key), self._time_slice(start, end)
+        return (hour_of_day_profile(self.cycle_lengths[row, window]),
+                hour_of_day_profile(self.flow_ratios[row, window]))
+
+    @property
+    def nbytes(self):
+        return self.volumes.nbytes
+
+
+def load_approach_volumes(prefer_local=False):
+    """Every intersection's four-approach KMOB files (APPROACH_VOLUME_FILES) in one ApproachVolumes"""
+    return ApproachVolumes.from_files(
+        {key: approach_volume_sources(key, prefer_local) for key in APPROACH_VOLUME_FILES})
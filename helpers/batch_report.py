@@ -0,0 +1,234 @@
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+from reportlab.graphics import renderPDF
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from helpers.data_catalog import frame_columns, get_washington_st_data_paths, load_hourly_series, series_frame
+from helpers.data_tier import daily_frame
+from helpers.reporting import render_chart_image, start_image_exporter
+from helpers.vector_charts import build_line_drawing, frame_series
+
+# Charts drawn on each page of the weekly corridor report
+BATCH_VARIABLES = {
+    "segment": ["Speed", "Travel Time"],
+    "intersection": ["Vehicle Volume"],
+}
+
+# Volumes are totals per bucket; speed / travel time are averaged
+BATCH_AGGREGATIONS = {
+    "Speed": "mean",
+    "Travel Time": "mean",
+    "Vehicle Volume": "sum",
+}
+
+UNITS = {"Speed": "mph", "Travel Time": "min", "Vehicle Volume": "vehicles"}
+
+# Memory-mapped data tier (helpers.data_tier); daily charts read its precomputed rollups
+DATA_TIER = os.environ.get("DASHBOARD_DATA_TIER")
+
+CHART_WIDTH = 500
+CHART_HEIGHT = 260
+
+
+def plan_batch_pages(data_paths=None):
+    """One page per catalog dataset: (location_key, display name, data type, variables)"""
+    data_paths = data_paths or get_washington_st_data_paths()
+    pages = []
+    for data_type in ("intersection", "segment"):
+        for key, info in data_paths.items():
+            if info["data_type"] == data_type:
+                name = info.get("intersection_name") or info.get("segment_name")
+                pages.append((key, name, data_type, BATCH_VARIABLES[data_type]))
+    return pages
+
+
+def load_chart_data(variable, location_key, start=None, end=None, resample_rule="D"):
+    """NB/SB series for one chart, filtered to the date range and resampled"""
+    if DATA_TIER and resample_rule == "D":
+        df = daily_frame(DATA_TIER, location_key, frame_columns(variable, "Both"), start, end)
+        if df is not None:
+            return df
+
+    series, _ = load_hourly_series(location_key, prefer_local=True)
+    if series is None:
+        return pd.DataFrame(columns=["datetime", "Northbound", "Southbound"])
+
+    # Slice the packed arrays before expanding them into a frame
+    series = series.slice(start, None if end is None else pd.Timestamp(end) + pd.Timedelta(days=1))
+    df = series_frame(series, variable, "Both")
+    if resample_rule:
+        df = df.set_index("datetime").resample(resample_rule).agg(BATCH_AGGREGATIONS[variable]).reset_index()
+    return df
+
+
+def build_chart_figure(df, variable, title):
+    """Plain NB/SB line chart sized for a report page"""
+    fig = go.Figure()
+    for col, color in (("Northbound", "#2E86C1"), ("Southbound", "#C0392B")):
+        fig.add_trace(go.Scatter(x=df["datetime"], y=df[col], mode="lines", name=col, line=dict(color=color)))
+    fig.update_layout(
+        title=title,
+        template="plotly_white",
+        yaxis_title=f"{variable} ({UNITS[variable]})",
+        margin=dict(l=50, r=20, t=40, b=40),
+        legend=dict(orientation="h", y=-0.15),
+    )
+    return fig
+
+
+def summarize_chart(df):
+    """NB/SB averages and row count for the summary table"""
+    if df.empty:
+        return {"nb_avg": None, "sb_avg": None, "rows": 0}
+    return {"nb_avg": df["Northbound"].mean(), "sb_avg": df["Southbound"].mean(), "rows": len(df)}
+
+
+def prepare_chart(location_key, name, variable, start=None, end=None, resample_rule="D", chart_mode="vector"):
+    """Load, summarize and draw or rasterize one chart (runs on a worker thread)"""
+    started = time.perf_counter()
+    df = load_chart_data(variable, location_key, start, end, resample_rule)
+    loaded = time.perf_counter()
+
+    chart = {"location_key": location_key, "name": name, "variable": variable, "image": None, "drawing": None,
+             "error": None}
+    chart.update(summarize_chart(df))
+    if df.empty:
+        chart["error"] = "No data in the selected date range"
+    elif chart_mode == "vector":
+        chart["drawing"] = build_line_drawing(frame_series(df, "datetime", ["Northbound", "Southbound"]),
+                                              width=CHART_WIDTH, height=CHART_HEIGHT, title=f"{name} - {variable}",
+                                              y_label=f"{variable} ({UNITS[variable]})")
+    else:
+        try:
+            chart["image"] = render_chart_image(build_chart_figure(df, variable, f"{name} - {variable}"),
+                                                width=CHART_WIDTH, height=CHART_HEIGHT)
+        except Exception as e:
+            chart["error"] = "Chart unavailable: " + " ".join(str(e).split())
+
+    chart["load_ms"] = (loaded - started) * 1000
+    chart["render_ms"] = (time.perf_counter() - loaded) * 1000
+    return chart
+
+
+def _format_value(value):
+    return "-" if value is None or pd.isna(value) else f"{value:,.1f}"
+
+
+def _draw_summary_page(p, pages, start, end):
+    width, height = letter
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(50, height - 50, "Washington St Corridor - Weekly Traffic Report")
+    p.setFont("Helvetica", 10)
+    p.drawString(50, height - 70, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    p.drawString(50, height - 85, f"Date Range: {start or 'start of data'} to {end or 'end of data'}")
+
+    headers = ["Page", "Location", "Variable", "NB avg", "SB avg", "Prep ms"]
+    x_positions = [50, 85, 320, 420, 475, 530]
+    y = height - 120
+    p.setFont("Helvetica-Bold", 9)
+    for x, header in zip(x_positions, headers):
+        p.drawString(x, y, header)
+    p.line(50, y - 4, width - 40, y - 4)
+
+    p.setFont("Helvetica", 8)
+    for page_number, page in enumerate(pages, start=2):
+        for chart in page["charts"]:
+            y -= 13
+            if y < 50:
+                p.showPage()
+                p.setFont("Helvetica", 8)
+                y = height - 50
+            row = [str(page_number), page["name"][:42], chart["variable"], _format_value(chart["nb_avg"]),
+                   _format_value(chart["sb_avg"]), f"{chart['load_ms'] + chart['render_ms']:,.0f}"]
+            for x, text in zip(x_positions, row):
+                p.drawString(x, y, text)
+    p.showPage()
+
+
+def _draw_location_page(p, page):
+    width, height = letter
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(50, height - 50, page["name"])
+    p.setFont("Helvetica", 10)
+    p.drawString(50, height - 66, f"{page['data_type'].title()} - {', '.join(c['variable'] for c in page['charts'])}")
+
+    y = height - 80
+    for chart in page["charts"]:
+        y -= CHART_HEIGHT + 20
+        if chart["drawing"] is not None:
+            renderPDF.draw(chart["drawing"], p, 50, y)
+        elif chart["image"]:
+            p.drawImage(ImageReader(io.BytesIO(chart["image"])), 50, y, width=CHART_WIDTH, height=CHART_HEIGHT)
+        else:
+            p.setFont("Helvetica-Oblique", 10)
+            p.drawString(50, y + CHART_HEIGHT / 2, f"{chart['variable']}: {chart['error']}")
+        p.setFont("Helvetica", 9)
+        p.drawString(50, y - 12, f"{chart['variable']} - NB avg {_format_value(chart['nb_avg'])}, "
+                                 f"SB avg {_format_value(chart['sb_avg'])} {UNITS[chart['variable']]}")
+    p.showPage()
+
+
+def create_batch_report(start=None, end=None, resample_rule="D", data_paths=None, max_workers=4,
+                        progress_callback=None, chart_mode="vector"):
+    """Build one multi-page PDF covering every intersection and segment in the catalog.
+
+    Returns the PDF buffer and build stats (total seconds plus per-page timings).
+    """
+    def report_progress(fraction, stage):
+        if progress_callback is not None:
+            progress_callback(fraction, stage)
+
+    build_started = time.perf_counter()
+    page_plan = plan_batch_pages(data_paths)
+    chart_jobs = [(key, name, variable) for key, name, _, variables in page_plan for variable in variables]
+
+    if chart_mode == "png":
+        # One warm exporter shared by every render thread
+        report_progress(0.02, "Starting chart renderer")
+        start_image_exporter()
+
+    charts = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-report") as executor:
+        futures = {executor.submit(prepare_chart, key, name, variable, start, end, resample_rule, chart_mode):
+                   (key, variable)
+                   for key, name, variable in chart_jobs}
+        for done_count, future in enumerate(futures, start=1):
+            charts[futures[future]] = future.result()
+            report_progress(0.05 + 0.85 * done_count / len(futures), f"Rendered {done_count}/{len(futures)} charts")
+
+    pages = [{"location_key": key, "name": name, "data_type": data_type,
+              "charts": [charts[(key, variable)] for variable in variables]}
+             for key, name, data_type, variables in page_plan]
+
+    report_progress(0.92, "Writing PDF")
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    _draw_summary_page(p, pages, start, end)
+
+    page_stats = []
+    for page in pages:
+        draw_started = time.perf_counter()
+        _draw_location_page(p, page)
+        page_stats.append({
+            "location_key": page["location_key"],
+            "name": page["name"],
+            "load_ms": sum(c["load_ms"] for c in page["charts"]),
+            "render_ms": sum(c["render_ms"] for c in page["charts"]),
+            "draw_ms": (time.perf_counter() - draw_started) * 1000,
+            "errors": [c["error"] for c in page["charts"] if c["error"]],
+        })
+    p.save()
+    buffer.seek(0)
+
+    stats = {"total_seconds": time.perf_counter() - build_started, "pages": page_stats,
+             "charts": len(chart_jobs)}
+    report_progress(1.0, "Done")
+    return buffer, stats
@@ -0,0 +1,140 @@
+import functools
+import os
+import threading
+
+# Applied to any cached function without an entry below. ttl is in seconds, max_mb caps the
+# pickled bytes a function may keep; None means unbounded for that setting.
+DEFAULT_POLICY = {"ttl": 3600, "max_entries": 32, "max_mb": 64}
+
+# Per-function overrides, keyed by function name
+CACHE_POLICIES = {
+    # Catalog metadata never changes while the server runs
+    "get_washington_st_data_paths": {"ttl": None, "max_entries": 1, "max_mb": 1},
+    # Raw GitHub CSVs and uploads are full DataFrames - fewer, shorter-lived entries
+    "load_github_data_cached": {"ttl": 3600, "max_entries": 16, "max_mb": 128},
+    "_load_github_data_cached": {"ttl": 3600, "max_entries": 16, "max_mb": 128},
+    "process_uploaded_data": {"ttl": 1800, "max_entries": 16, "max_mb": 128},
+    # Small binned grids (or up to POINT_LIMIT points) per location pair and date range
+    "speed_volume_density": {"ttl": 3600, "max_entries": 64, "max_mb": 8},
+    # Resampled series: a few hundred rows at daily and coarser granularities
+    "granular_series": {"ttl": 3600, "max_entries": 64, "max_mb": 16},
+    # One small table per date range and plan count
+    "plan_break_schedules": {"ttl": 3600, "max_entries": 32, "max_mb": 4},
+    # Live sources go stale quickly
+    "load_api_data_cached": {"ttl": 300, "max_entries": 16, "max_mb": 64},
+    "_load_api_data_cached": {"ttl": 300, "max_entries": 16, "max_mb": 64},
+    "_load_database_api_cached": {"ttl": 300, "max_entries": 16, "max_mb": 64},
+}
+
+# Scale every max_mb at once when sizing a server (e.g. DASHBOARD_CACHE_MB_SCALE=0.5)
+MB_SCALE = float(os.environ.get("DASHBOARD_CACHE_MB_SCALE", "1"))
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def policy_for(name, overrides=None):
+    """Effective policy for a function: defaults, then CACHE_POLICIES, then decorator arguments"""
+    policy = {**DEFAULT_POLICY, **CACHE_POLICIES.get(name, {}), **(overrides or {})}
+    if policy["max_mb"] is not None:
+        policy["max_mb"] *= MB_SCALE
+    return policy
+
+
+class _Tracker:
+    """Policy, eviction count and access to the in-memory store of one cached function"""
+
+    def __init__(self, name, cached, policy):
+        self.name = name
+        self.cached = cached
+        self.policy = policy
+        self.evictions = 0
+
+    def _mem_cache(self):
+        """Streamlit's per-function TTLCache of pickled values (None if its internals change)"""
+        try:
+            storage = self.cached._info.get_function_cache(self.cached._function_key).storage
+            return storage._mem_cache, storage._mem_cache_lock
+        except AttributeError:
+            return None, None
+
+    def usage(self):
+        mem_cache, lock = self._mem_cache()
+        if mem_cache is None:
+            return None, None
+        with lock:
+            mem_cache.expire()
+            return len(mem_cache), sum(len(entry) for entry in mem_cache.values())
+
+    def enforce_bytes(self):
+        """Evict least recently used entries until the function is back under max_mb"""
+        max_mb = self.policy["max_mb"]
+        mem_cache, lock = self._mem_cache()
+        if max_mb is None or mem_cache is None:
+            return
+        limit = max_mb * 2 ** 20
+        with lock:
+            used = sum(len(entry) for entry in mem_cache.values())
+            # Always keep the newest entry, even when it alone is over the cap
+            while used > limit and len(mem_cache) > 1:
+                _, entry = mem_cache.popitem()
+                used -= len(entry)
+                self.evictions += 1
+
+
+def bounded(cache_decorator):
+    """Wrap st.cache_data so every function gets its ttl / max_entries / max_mb from CACHE_POLICIES.
+
+    Streamlit's own TTL + LRU cache handles ttl and max_entries; max_mb is enforced after each
+    miss by evicting least recently used entries. Supports ``@decorator`` and ``@decorator(ttl=...)``.
+    """
+    def decorate(func, **overrides):
+        policy = policy_for(func.__name__, overrides)
+        computing = threading.local()
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            computing.missed = True
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(ttl=policy["ttl"], max_entries=policy["max_entries"])(compute)
+        tracker = _Tracker(func.__qualname__, cached, policy)
+        with _registry_lock:
+            _registry[tracker.name] = tracker
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            computing.missed = False
+            result = cached(*args, **kwargs)
+            if computing.missed:
+                tracker.enforce_bytes()
+            return result
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+
+    def decorator(func=None, **overrides):
+        if func is None:
+            return lambda f: decorate(f, **overrides)
+        return decorate(func, **overrides)
+
+    return decorator
+
+
+def cache_usage():
+    """Entries, bytes and limits per cached function (for sizing the server)"""
+    with _registry_lock:
+        trackers = list(_registry.values())
+    rows = []
+    for tracker in trackers:
+        entries, used = tracker.usage()
+        rows.append({
+            "function": tracker.name,
+            "entries": entries,
+            "max_entries": tracker.policy["max_entries"],
+            "mb": None if used is None else used / 2 ** 20,
+            "max_mb": tracker.policy["max_mb"],
+            "ttl": tracker.policy["ttl"],
+            "evictions": tracker.evictions,
+        })
+    return rows
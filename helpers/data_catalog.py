@@ -0,0 +1,515 @@
+import os
+
+from helpers import http_cache
+from helpers.hourly_series import HourlySeries
+from helpers.schema import resolve_schema
+
+# Corridor datasets ship with the repository and are also served from GitHub
+# (DASHBOARD_DATA_URL points the catalog at another server of the same tree, e.g. a local mirror)
+BASE_URL = os.environ.get(
+    "DASHBOARD_DATA_URL",
+    "https://raw.githubusercontent.com/chrquija/Advantec-Dashboard-app/refs/heads/main/hwy111_to_ave52/")
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hwy111_to_ave52")
+
+# Local timestamps in the corridor files are Pacific time
+TIMEZONE = "America/Los_Angeles"
+
+# Variable -> metric name prefix in the catalog "columns" mapping
+VARIABLE_METRICS = {
+    "Speed": "speed",
+    "Travel Time": "travel_time",
+    "Delay": "delay",
+    "Vehicle Volume": "volume",
+}
+
+
+# Intersection -> the segment that starts there heading north; its speeds and travel times pair
+# with the intersection's volumes (speed-volume views)
+ADJACENT_SEGMENTS = {
+    "intersection_washington_ave52": "segment_ave52_to_calle_tampico",
+    "intersection_washington_calle_tampico": "segment_calle_tampico_to_village",
+    "intersection_washington_village": "segment_village_to_ave50",
+    "intersection_washington_ave50": "segment_ave50_to_sagebrush",
+    "intersection_washington_sagebrush": "segment_sagebrush_to_eisenhower",
+    "intersection_washington_eisenhower": "segment_eisenhower_to_ave48",
+    "intersection_washington_ave48": "segment_ave48_to_ave47",
+    "intersection_washington_ave47": "segment_ave47_to_point_happy",
+}
+
+# Intersection -> KMOB files with all four approaches: one row per hour of day, one column per
+# date and approach ("01/01/2025 EAST"). NORTH / SOUTH are the northbound / southbound volumes of
+# the NB/SB datasets above. Each season is split over two files; T-intersections lack an approach.
+APPROACH_VOLUME_FILES = {
+    "intersection_washington_ave52": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Ave52_1hr_NSEWB_VOLUME_1030_12312024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Ave_52_NSEWB_VOLUME_0101_06162025.csv",
+    ),
+    "intersection_washington_calle_tampico": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Calle_Tampico_1hr_NSEWB_VOLUME_1030_12312024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_CalleTampico_1hr_NSEWB_VOLUME_0101_06162025.csv",
+    ),
+    "intersection_washington_village": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Village_Shop_Ctr_1hr_NSEWB_VOLUME_1030_12232024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Village_Shop_Ctr_1hr_NSEWB_VOLUME_0101_0616_2025.csv",
+    ),
+    "intersection_washington_ave50": (
+        "VOLUME/KMOB/October302024_December312024/Washington_Ave50_1hr_NESWB_VOLUME_1030_12312024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Ave_50_1hr_NSEWB_VOLUME_0101_06162025.csv",
+    ),
+    "intersection_washington_sagebrush": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Sagebrush_Ave_1hr_NSEWB_VOLUME_1030_12312024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Sagebrush_Ave_1hr_NSEWB_VOLUME_0101_06162025.csv",
+    ),
+    "intersection_washington_eisenhower": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Eisenhower_1hr_NSEWB_VOLUME_1030_12312024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Eisenhower_1hr_NSEWB_VOLUME_0101_0616.csv",
+    ),
+    "intersection_washington_ave48": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Ave48_1hr_NSEWB_VOLUME_1030_12242024.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Ave48_1hr_NSEWB_VOLUME_0527_06162025.csv",
+    ),
+    "intersection_washington_ave47": (
+        "VOLUME/KMOB/October302024_December312024/Washington_and_Ave47_1hr_NSEWB_VOLUME_1030_123124.csv",
+        "VOLUME/KMOB/January12025_June152025/Washington_and_Ave47_1hr_NSEWB_VOLUME_0101_06162026.csv",
+    ),
+}
+
+
+def get_washington_st_data_paths():
+    """Return paths for Washington St Corridor segment, intersection and corridor-wide datasets"""
+    base_url = BASE_URL
+
+    data_paths = {
+        # === SEGMENT DATA (Speed, Travel Time, Delay) - 9 segments ===
+        # Data Source: Iteris ClearGuide
+        # Each segment contains: NB/SB average_delay, average_traveltime, average_speed
+
+        "segment_ave52_to_calle_tampico": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/1_2_NSB_Ave52_CalleTampico_WashSt_1hr_septojuly.csv",
+            "segment_name": "Ave 52 to Calle Tampico",
+            "segment_description": "Avenue 52 → Calle Tampico (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_calle_tampico_to_village": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/2_3_NSB_CalleTampico_VillageShoppingCtr_WashSt_1hr_septojuly.csv",
+            "segment_name": "Calle Tampico to Village Shopping Center",
+            "segment_description": "Calle Tampico → Village Shopping Center (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_village_to_ave50": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/3_4_NSB_VillageShoppingCtr_Avenue50_WashSt_1hr_septojuly.csv",
+            "segment_name": "Village Shopping Center to Avenue 50",
+            "segment_description": "Village Shopping Center → Avenue 50 (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_ave50_to_sagebrush": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/4_5_NSB_Ave50_SagebrushAve_WashSt_1hr_septojuly.csv",
+            "segment_name": "Avenue 50 to Sagebrush Avenue",
+            "segment_description": "Avenue 50 → Sagebrush Avenue (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_sagebrush_to_eisenhower": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/5_6_NSB_SagebrushAve_EisenhowerDr_WashSt_1hr_septojuly.csv",
+            "segment_name": "Sagebrush Avenue to Eisenhower Drive",
+            "segment_description": "Sagebrush Avenue → Eisenhower Drive (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_eisenhower_to_ave48": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/6_7_NSB_EisenhowerDr_Avenue48_WashSt_1hr_septojuly.csv",
+            "segment_name": "Eisenhower Drive to Avenue 48",
+            "segment_description": "Eisenhower Drive → Avenue 48 (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_ave48_to_ave47": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/7_8_NSB_Ave48_Ave47_WashSt_1hr_septojuly.csv",
+            "segment_name": "Avenue 48 to Avenue 47",
+            "segment_description": "Avenue 48 → Avenue 47 (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_ave47_to_point_happy": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/8_9_NSB_Ave47_PointHappySimon_WashSt_1hr_septojuly.csv",
+            "segment_name": "Avenue 47 to Point Happy Simon",
+            "segment_description": "Avenue 47 → Point Happy Simon (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        "segment_point_happy_to_hwy111": {
+            "url": base_url + "DELAY_TRAVELTIME_SPEED_byintersection/9_10_NSB_PointHappySimon_Hwy111_WashSt_1hr_septojuly.csv",
+            "segment_name": "Point Happy Simon to Highway 111",
+            "segment_description": "Point Happy Simon → Highway 111 (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_delay": "NB_average_delay",
+                "sb_delay": "SB_average_delay",
+                "nb_travel_time": "NB_average_traveltime",
+                "sb_travel_time": "SB_average_traveltime",
+                "nb_speed": "NB_average_speed",
+                "sb_speed": "SB_average_speed"
+            },
+            "date_range": "2024-09-01 to 2025-07-31",
+            "source": "Iteris ClearGuide",
+            "data_type": "segment"
+        },
+
+        # === INTERSECTION DATA (Volume Only) - 8 intersections ===
+        # Data Source: Kinetic Mobility
+        # Each intersection contains: NB/SB total_volume
+
+        "intersection_washington_ave52": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washingtonst_and_Ave52_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Avenue 52",
+            "intersection_description": "Washington Street & Avenue 52 Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_calle_tampico": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Calle_Tampico_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Calle Tampico",
+            "intersection_description": "Washington Street & Calle Tampico Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_village": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Village_Shop_Ctr_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Village Shopping Center",
+            "intersection_description": "Washington Street & Village Shopping Center Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_ave50": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_Ave50_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Avenue 50",
+            "intersection_description": "Washington Street & Avenue 50 Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_sagebrush": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Sagebrush_Ave_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Sagebrush Avenue",
+            "intersection_description": "Washington Street & Sagebrush Avenue Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_eisenhower": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Eisenhower_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Eisenhower Drive",
+            "intersection_description": "Washington Street & Eisenhower Drive Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_ave48": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Ave48_1hr_NS_VOLUME_OctToDec_MayToJune.csv",
+            "intersection_name": "Washington St & Avenue 48",
+            "intersection_description": "Washington Street & Avenue 48 Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        "intersection_washington_ave47": {
+            "url": base_url + "VOLUME/KMOB_MELTED/MELTED_Washington_and_Ave47_1hr_NS_VOLUME_OctoberTOJune.csv",
+            "intersection_name": "Washington St & Avenue 47",
+            "intersection_description": "Washington Street & Avenue 47 Intersection",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "source": "Kinetic Mobility",
+            "data_type": "intersection"
+        },
+
+        # === CORRIDOR DATA (whole corridor) - hourly plus a pre-aggregated daily file each ===
+        # "daily" is the same data summed (volume) or averaged per day by the data provider
+
+        "corridor_washington_speed": {
+            "url": base_url + "SPEED/Iteris/september_to_june/NSB_WashingtonCorridor_Ave52_to_HWY111_1hr_SPEED_090124to062325.csv",
+            "corridor_name": "Washington St Corridor (Ave 52 to Hwy 111)",
+            "corridor_description": "Avenue 52 → Highway 111, whole corridor (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_speed": "NB_avg_speed",
+                "sb_speed": "SB_avg_speed"
+            },
+            "date_range": "2024-09-01 to 2025-06-24",
+            "daily": {
+                "url": base_url + "SPEED/Iteris/september_to_june/NSB_WashingtonCorridor_Ave52_to_HWY111_Daily__SPEED_090124to061725.csv",
+                "columns": {
+                    "datetime": "local_datetime",
+                    "nb_speed": "NB_average_speed",
+                    "sb_speed": "SB_average_speed"
+                },
+                "date_range": "2024-09-01 to 2025-06-17"
+            },
+            "source": "Iteris ClearGuide",
+            "data_type": "corridor"
+        },
+
+        "corridor_washington_travel_time": {
+            "url": base_url + "TRAVEL_TIME/Iteris/september_to_june/TrvltimeNSB_WashingtonCorr_Ave52_to_HWY111_1hr_901to0623.csv",
+            "corridor_name": "Washington St Corridor (Ave 52 to Hwy 111)",
+            "corridor_description": "Avenue 52 → Highway 111, whole corridor (and reverse)",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_travel_time": "NB_avg_travel_time",
+                "sb_travel_time": "SB_avg_travel_time"
+            },
+            "date_range": "2024-09-01 to 2025-06-24",
+            "daily": {
+                "url": base_url + "TRAVEL_TIME/Iteris/september_to_june/TrvltimeNSB_WashingtonCorr_Ave52_to_HWY111_Daily_901to06172025.csv",
+                "columns": {
+                    "datetime": "local_datetime",
+                    "nb_travel_time": "Northbound_average_time",
+                    "sb_travel_time": "Southbound_average_time"
+                },
+                "date_range": "2024-09-01 to 2025-06-17"
+            },
+            "source": "Iteris ClearGuide",
+            "data_type": "corridor"
+        },
+
+        "corridor_washington_volume": {
+            "url": base_url + "VOLUME/KMOB_MELTED/ALL_MELTED_Washington_Ave52TOAve47__1hr_SUM_NS_VOLUME_OctoberTOJune.csv",
+            "corridor_name": "Washington St Corridor (Ave 52 to Ave 47, all intersections)",
+            "corridor_description": "Sum of the eight Washington Street intersections",
+            "columns": {
+                "datetime": "local_datetime",
+                "nb_volume": "NB_total_volume",
+                "sb_volume": "SB_total_volume"
+            },
+            "date_range": "2024-10-30 to 2025-06-15",
+            "daily": {
+                "url": base_url + "VOLUME/KMOB/September2024_to_June2025/ALL_Washington_Ave52TOAve47__Daily_SUM_NS_VOLUME_OctoberTOJune.csv",
+                "columns": {
+                    "datetime": "local_datetime",
+                    "nb_volume": "NB_total_volume",
+                    "sb_volume": "SB_total_volume"
+                },
+                "date_range": "2024-10-30 to 2025-06-15"
+            },
+            "source": "Kinetic Mobility",
+            "data_type": "corridor"
+        }
+    }
+
+    # Same relative layout as the repository, so every dataset also has a local copy
+    for dataset_info in data_paths.values():
+        for source in (dataset_info, dataset_info.get("daily")):
+            if source:
+                relative_path = source["url"][len(base_url):]
+                source["path"] = os.path.join(DATA_DIR, *relative_path.split("/"))
+        # Column roles of the source file (time, nb/sb, nb_<metric>/sb_<metric>, units)
+        dataset_info["schema"] = resolve_schema(tuple(dataset_info["columns"].values()))
+
+    return data_paths
+
+
+def resolve_dataset_source(dataset_info, prefer_local=False):
+    """Return the local file path when requested and present, otherwise the GitHub URL"""
+    if prefer_local and os.path.exists(dataset_info.get("path", "")):
+        return dataset_info["path"]
+    return dataset_info["url"]
+
+
+def approach_volume_sources(location_key, prefer_local=False):
+    """Local paths (when requested and present) or GitHub URLs of an intersection's four-approach files"""
+    sources = []
+    for relative_path in APPROACH_VOLUME_FILES.get(location_key, ()):
+        path = os.path.join(DATA_DIR, *relative_path.split("/"))
+        sources.append(path if prefer_local and os.path.exists(path) else BASE_URL + relative_path)
+    return sources
+
+
+def paired_locations(location_key):
+    """(intersection_key, segment_key) of the volume/speed pair a location belongs to, or (None, None)"""
+    if location_key in ADJACENT_SEGMENTS:
+        return location_key, ADJACENT_SEGMENTS[location_key]
+    for intersection_key, segment_key in ADJACENT_SEGMENTS.items():
+        if segment_key == location_key:
+            return intersection_key, segment_key
+    return None, None
+
+
+def load_hourly_series(location_key, prefer_local=False):
+    """Load every metric of a catalog dataset into a compact HourlySeries"""
+    dataset_info = get_washington_st_data_paths().get(location_key)
+    if not dataset_info:
+        return None, None
+
+    columns = dict(dataset_info["columns"])
+    datetime_col = columns.pop("datetime")
+    df = http_cache.read_csv(resolve_dataset_source(dataset_info, prefer_local))
+    meta = {"timezone": TIMEZONE, "source": dataset_info["source"]}
+    return HourlySeries.from_frame(df, datetime_col, columns, meta), dataset_info
+
+
+def frame_columns(variable, direction):
+    """Output column -> metric name for the frame shape load_washington_st_data returns"""
+    prefix = VARIABLE_METRICS[variable]
+    if direction == "Both":
+        return {"Northbound": f"nb_{prefix}", "Southbound": f"sb_{prefix}"}
+    return {"value": f"{direction.lower()}_{prefix}"}
+
+
+def series_frame(series, variable, direction):
+    """The frame shape load_washington_st_data returns, built from an HourlySeries"""
+    return series.to_frame(frame_columns(variable, direction))
+
+
+def load_washington_st_data(variable, direction, location_key=None, prefer_local=False):
+    """Load the appropriate dataset based on variable, direction, and location"""
+    # If no location_key provided, return None (user needs to select location)
+    if not location_key:
+        return None, None
+
+    try:
+        series, dataset_info = load_hourly_series(location_key, prefer_local)
+        if series is None:
+            return None, None
+        return series_frame(series, variable, direction), dataset_info
+
+    except Exception:
+        return None, None
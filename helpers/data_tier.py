@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from helpers.approach_volumes import ApproachVolumes
+from helpers.data_catalog import APPROACH_VOLUME_FILES, approach_volume_sources, get_washington_st_data_paths, \
+    load_hourly_series
+
+# Memory-mapped columnar copy of the catalog: each dataset is a directory of .npy columns (hourly
+# values plus daily rollups) that worker processes open with np.load(mmap_mode="r"), so the OS
+# page cache holds one copy however many workers map it
+MANIFEST = "manifest.json"
+
+# Four-approach volumes of every intersection (one array) with their Webster cycle lengths
+APPROACH_DIR = "approach_volumes"
+
+# Daily rollups: counts are summed, everything else averaged (same as the batch report)
+ROLLUP_AGGREGATIONS = {"volume": "sum"}
+
+
+def _rollup_agg(metric):
+    return ROLLUP_AGGREGATIONS.get(metric.split("_", 1)[1], "mean")
+
+
+def _write_columns(directory, columns):
+    os.makedirs(directory, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(values))
+
+
+def daily_rollup(datetimes, metrics):
+    """Daily columns of hourly ``metrics`` (name -> values): datetime, hours with a row, one column per metric.
+
+    Averaged metrics also get ``<name>_sum`` and ``<name>_count`` (sum and number of non-missing hourly
+    values), so coarser periods can be averaged over the hours rather than over the daily means.
+    """
+    hourly = pd.DataFrame(metrics, index=datetimes)
+    grouped = hourly.resample("D")
+    daily = grouped.agg({name: _rollup_agg(name) for name in metrics})
+    columns = {name: daily[name].to_numpy() for name in metrics}
+    averaged = [name for name in metrics if _rollup_agg(name) == "mean"]
+    if averaged:
+        sums, counts = grouped[averaged].sum(), grouped[averaged].count()
+        for name in averaged:
+            columns[f"{name}_sum"] = sums[name].to_numpy()
+            columns[f"{name}_count"] = counts[name].to_numpy().astype("int32")
+    columns["datetime"] = daily.index.to_numpy()
+    columns["hours"] = grouped.size().to_numpy().astype("int32")
+    return columns
+
+
+def _write_approach_volumes(directory, approaches):
+    _write_columns(directory, {"volumes": approaches.volumes, "times": approaches.times.to_numpy(),
+                               "flow_ratios": approaches.flow_ratios, "cycle_lengths": approaches.cycle_lengths})
+    with open(os.path.join(directory, "info.json"), "w", encoding="utf-8") as f:
+        json.dump({"intersections": list(approaches.intersections)}, f, indent=2)
+
+
+def build_data_tier(output_dir, data_paths=None, prefer_local=True):
+    """Write every catalog dataset (hourly columns + daily rollups) under ``output_dir``.
+
+    Built in a sibling directory and swapped in at the end, so running workers never see a half-written tier.
+    """
+    data_paths = data_paths or get_washington_st_data_paths()
+    staging = output_dir.rstrip(os.sep) + ".building"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    sources = {}
+    for key in data_paths:
+        series, info = load_hourly_series(key, prefer_local)
+        if series is None:
+            continue
+        metrics = {name: series.column(name) for name in series.metrics}
+        _write_columns(os.path.join(staging, key, "hourly"), {**metrics, "datetime": series.datetimes()})
+        _write_columns(os.path.join(staging, key, "daily"), daily_rollup(series.datetimes(), metrics))
+        with open(os.path.join(staging, key, "info.json"), "w", encoding="utf-8") as f:
+            json.dump({"info": info, "meta": series.meta, "metrics": list(series.metrics)}, f, indent=2)
+        sources[key] = info["path"] if os.path.exists(info.get("path", "")) else info["url"]
+
+    approach_sources = {key: approach_volume_sources(key, prefer_local) for key in APPROACH_VOLUME_FILES}
+    _write_approach_volumes(os.path.join(staging, APPROACH_DIR), ApproachVolumes.from_files(approach_sources))
+
+    with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"built_at": time.time(), "datasets": sources,
+                   "approach_files": [source for files in approach_sources.values() for source in files]}, f, indent=2)
+
+    previous = output_dir.rstrip(os.sep) + ".old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.rename(output_dir, previous)
+    os.rename(staging, output_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    return sources
+
+
+def tier_is_current(tier_dir):
+    """Whether the tier exists and no local source CSV changed since it was built"""
+    try:
+        with open(os.path.join(tier_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if "approach_files" not in manifest:
+        return False  # built before the approach volumes were part of the tier
+    sources = [*manifest["datasets"].values(), *manifest["approach_files"]]
+    return all(not os.path.exists(source) or os.path.getmtime(source) <= manifest["built_at"] for source in sources)
+
+
+def _load_columns(directory, names):
+    # Plain ndarray views over the mapping, so pandas never sees the np.memmap subclass
+    return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r").view(np.ndarray)
+            for name in names}
+
+
+def load_mapped(tier_dir, location_key):
+    """(datetime, columns, dataset_info, meta) with memory-mapped read-only arrays, or None when absent"""
+    dataset_dir = os.path.join(tier_dir, location_key)
+    try:
+        with open(os.path.join(dataset_dir, "info.json"), encoding="utf-8") as f:
+            described = json.load(f)
+    except OSError:
+        return None
+    columns = _load_columns(os.path.join(dataset_dir, "hourly"), ["datetime", *described["metrics"]])
+    return columns.pop("datetime"), columns, described["info"], described["meta"]
+
+
+def load_approach_volumes_mapped(tier_dir):
+    """ApproachVolumes over the tier's memory-mapped volumes, flow ratios and Webster cycles, or None when absent"""
+    directory = os.path.join(tier_dir, APPROACH_DIR)
+    try:
+        with open(os.path.join(directory, "info.json"), encoding="utf-8") as f:
+            described = json.load(f)
+    except OSError:
+        return None
+    columns = _load_columns(directory, ["volumes", "times", "flow_ratios", "cycle_lengths"])
+    return ApproachVolumes(described["intersections"], columns["times"], columns["volumes"],
+                           columns["flow_ratios"], columns["cycle_lengths"])
+
+
+def _weight_columns(metrics):
+    return [f"{name}_{part}" for name in metrics if _rollup_agg(name) == "mean" for part in ("sum", "count")]
+
+
+def daily_frame(tier_dir, location_key, output_columns, start=None, end=None, empty_days=True, weights=False):
+    """Precomputed daily rollup as a frame (output name -> metric), or None when the tier lacks it.
+
+    Matches resampling the hourly rows between ``start`` and ``end`` (inclusive days): days are
+    trimmed to the first and last one that actually has hourly rows in the range. With
+    ``empty_days=False`` days without any hourly row inside that span are left out as well.
+    ``weights=True`` adds the sum / count columns of averaged metrics (see rollup_frame).
+    """
+    dataset_dir = os.path.join(tier_dir, location_key, "daily")
+    names = ["datetime", "hours", *output_columns.values()]
+    if weights:
+        names += _weight_columns(output_columns.values())
+    if not all(os.path.exists(os.path.join(dataset_dir, f"{name}.npy")) for name in names):
+        return None  # no tier, or one built before the rollup kept sums and counts
+    return rollup_frame(_load_columns(dataset_dir, names), output_columns, start, end, empty_days, weights)
+
+
+def rollup_frame(columns, output_columns, start=None, end=None, empty_days=True, weights=False):
+    """Frame over daily_rollup columns (output name -> metric) for inclusive days start..end, trimmed as daily_frame.
+
+    With ``weights=True`` every averaged output also gets ``<output>_sum`` and ``<output>_count`` columns.
+    """
+    days = columns["datetime"]
+
+    keep = np.ones(len(days), dtype=bool)
+    if start is not None:
+        keep &= days >= np.datetime64(pd.Timestamp(start).normalize())
+    if end is not None:
+        keep &= days <= np.datetime64(pd.Timestamp(end).normalize())
+    with_data = np.flatnonzero(keep & (columns["hours"] > 0))
+    if not len(with_data):
+        return pd.DataFrame(columns=["datetime", *output_columns])
+    rows = slice(with_data[0], with_data[-1] + 1) if empty_days else with_data
+
+    data = {"datetime": days[rows]}
+    for output, name in output_columns.items():
+        data[output] = columns[name][rows]
+        if weights and _rollup_agg(name) == "mean":
+            data[f"{output}_sum"] = columns[f"{name}_sum"][rows]
+            data[f"{output}_count"] = columns[f"{name}_count"][rows]
+    return pd.DataFrame(data, copy=False)
+
+
+def main(argv=None):
+    """Build the tier, e.g. python -m helpers.data_tier data_tier"""
+    parser = argparse.ArgumentParser(prog="python -m helpers.data_tier",
+                                     description="Build the memory-mapped corridor data tier from the catalog CSVs")
+    parser.add_argument("output_dir")
+    parser.add_argument("--remote", action="store_true", help="read the GitHub copies instead of local files")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    sources = build_data_tier(args.output_dir, prefer_local=not args.remote)
+    print(f"wrote {len(sources)} datasets to {args.output_dir} in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pandas as pd
+
+from helpers.data_catalog import frame_columns, load_hourly_series
+from helpers.data_tier import daily_rollup, load_mapped, rollup_frame
+from helpers.single_flight import SingleFlight
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+class SharedDataset:
+    """One corridor dataset as read-only arrays (decoded in memory, or memory-mapped from the data tier)"""
+
+    def __init__(self, datetime, columns, info, meta):
+        self.info = info
+        self.meta = meta
+        self.datetime = datetime
+        self.columns = columns
+        self._daily = None
+
+    @classmethod
+    def from_series(cls, series, info):
+        columns = {name: _read_only(series.column(name)) for name in series.metrics}
+        return cls(_read_only(series.datetimes()), columns, info, series.meta)
+
+    @property
+    def nbytes(self):
+        return self.datetime.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def frame(self, columns):
+        """DataFrame over the shared arrays (no copy); ``columns`` maps output name -> metric name"""
+        data = {"datetime": self.datetime}
+        for output, name in columns.items():
+            data[output] = self.columns[name]
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def daily(self):
+        """Daily rollup columns (helpers.data_tier.daily_rollup), computed once and shared"""
+        if self._daily is None:
+            self._daily = {name: _read_only(values)
+                           for name, values in daily_rollup(self.datetime, self.columns).items()}
+        return self._daily
+
+    def daily_frame(self, columns, start=None, end=None, weights=False):
+        """Daily rollup of the days start..end (inclusive) that have hourly rows; ``columns`` maps output -> metric"""
+        return rollup_frame(self.daily, columns, start, end, empty_days=False, weights=weights)
+
+
+class DatasetStore:
+    """Process-wide read-only corridor datasets handed to every session as zero-copy frames.
+
+    st.cache_data unpickles a private copy of its value on every hit; this store is meant to live
+    in st.cache_resource so all sessions read the same arrays. Cold loads are coalesced: however
+    many sessions ask for a dataset at once, one load runs and the others wait for its result (or
+    its error). With ``ttl`` (seconds) a dataset older than that is still returned at once while a
+    single background reload replaces it (stale-while-revalidate); a failed reload keeps the stale
+    copy and is retried after another ``ttl``. Without it datasets live as long as the process.
+    With ``data_tier`` (see helpers.data_tier) datasets are memory-mapped, so several worker
+    processes share one copy through the page cache; keys missing from the tier fall back to the CSVs.
+    """
+
+    def __init__(self, prefer_local=False, data_tier=None, ttl=None):
+        self.prefer_local = prefer_local
+        self.data_tier = data_tier
+        self.ttl = ttl
+        self._datasets = {}
+        self._checked_at = {}
+        self._flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self.stats = {"loads": 0, "stale_served": 0, "refresh_failures": 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def __contains__(self, location_key):
+        return location_key in self._datasets
+
+    def get(self, location_key):
+        """Shared dataset for a catalog key (None when it cannot be loaded; retried on the next call)"""
+        dataset = self._datasets.get(location_key)
+        if dataset is None:
+            return self._flight.do(location_key, lambda: self._load_and_store(location_key))
+
+        if self.ttl is not None and time.monotonic() - self._checked_at[location_key] > self.ttl:
+            self._count("stale_served")
+            self._flight.start(location_key, lambda: self._refresh(location_key))
+        return dataset
+
+    def _load_and_store(self, location_key):
+        dataset = self._datasets.get(location_key)  # loaded by a flight that finished just before
+        if dataset is None:
+            dataset = self._load(location_key)
+            if dataset is not None:
+                self._checked_at[location_key] = time.monotonic()
+                self._datasets[location_key] = dataset
+        return dataset
+
+    def _refresh(self, location_key):
+        try:
+            dataset = self._load(location_key)
+        except Exception:
+            dataset = None
+        self._checked_at[location_key] = time.monotonic()
+        if dataset is None:
+            self._count("refresh_failures")
+            return self._datasets[location_key]
+        self._datasets[location_key] = dataset
+        return dataset
+
+    def _load(self, location_key):
+        self._count("loads")
+        mapped = load_mapped(self.data_tier, location_key) if self.data_tier else None
+        if mapped is not None:
+            return SharedDataset(*mapped)
+        series, info = load_hourly_series(location_key, self.prefer_local)
+        return None if series is None else SharedDataset.from_series(series, info)
+
+    def frame(self, variable, direction, location_key):
+        """Same (df, dataset_info) as load_washington_st_data, backed by the shared arrays"""
+        try:
+            dataset = self.get(location_key)
+        except Exception:
+            return None, None
+        if dataset is None:
+            return None, None
+
+        return dataset.frame(frame_columns(variable, direction)), dataset.info
+
+    def daily_frame(self, variable, direction, location_key, start=None, end=None, weights=False):
+        """Daily rollup with the same columns as frame() (volumes summed, the rest averaged; days without rows left out).
+
+        ``weights=True`` adds the hourly sum / count columns of averaged values (helpers.data_tier.rollup_frame).
+        """
+        try:
+            dataset = self.get(location_key)
+        except Exception:
+            return None
+        if dataset is None:
+            return None
+        return dataset.daily_frame(frame_columns(variable, direction), start, end, weights)
+
+    @property
+    def nbytes(self):
+        return sum(dataset.nbytes for dataset in list(self._datasets.values()))
+
+    def __len__(self):
+        return len(self._datasets)
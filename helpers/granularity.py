@@ -0,0 +1,174 @@
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+from helpers import http_cache
+from helpers.data_catalog import frame_columns, get_washington_st_data_paths, load_washington_st_data, \
+    resolve_dataset_source
+from helpers.data_tier import daily_frame
+
+# Sidebar granularity -> pandas resample rule, bucketed like helpers.sql_source: fixed widths count
+# from the Unix epoch, weeks start on Monday ("W-MON"; two-week buckets from Monday 1970-01-05 as
+# in SQL) and months on the 1st of the calendar month
+GRANULARITIES = {
+    "1 Hour": "1h",
+    "2 Hours": "2h",
+    "4 Hours": "4h",
+    "6 Hours": "6h",
+    "12 Hours": "12h",
+    "1 Day": "1D",
+    "2 Days": "2D",
+    "3 Days": "3D",
+    "1 Week": "W-MON",
+    "2 Weeks": "14D",
+    "1 Month": "MS",
+}
+
+WEEK_ORIGIN = pd.Timestamp("1970-01-05")
+
+# Volumes are totals per period; speed / travel time / delay are averaged
+AGGREGATIONS = {
+    "Speed": "mean",
+    "Travel Time": "mean",
+    "Delay": "mean",
+    "Vehicle Volume": "sum",
+}
+
+# Timestamp format of the corridor CSVs ("9/1/2024 0:00")
+DATETIME_FORMAT = "%m/%d/%Y %H:%M"
+
+
+def _last_day(source_info):
+    return pd.Timestamp(source_info["date_range"].split(" to ")[1])
+
+
+def available_sources(dataset_info):
+    """Hours per row -> source name for every copy of a dataset, finest first.
+
+    "hourly" is the dataset itself; "daily file" is a pre-aggregated file registered in the catalog
+    (``dataset_info["daily"]``, the whole-corridor datasets); every other dataset has a "daily rollup":
+    the data tier's precomputed copy (helpers.data_tier) when there is one, else the in-memory rollup
+    of the hourly rows (DatasetStore.daily_frame).
+    """
+    sources = {1: "hourly", 24: "daily rollup"}
+    if "daily" in dataset_info:
+        sources[24] = "daily file"
+    return sources
+
+
+def rows_fit(granularity, hours):
+    """Whether every period of a granularity starts and ends on a boundary of ``hours``-hour rows"""
+    offset = to_offset(GRANULARITIES[granularity])
+    if isinstance(offset, Tick):
+        return offset.nanos % pd.Timedelta(hours=hours).value == 0
+    return 24 % hours == 0  # calendar weeks and months are whole days from midnight
+
+
+def _resample(df, granularity):
+    rule = GRANULARITIES[granularity]
+    offset = to_offset(rule)
+    if isinstance(offset, Tick):
+        # Same buckets as the SQL pushdown: from the epoch, or from a Monday for whole weeks
+        origin = WEEK_ORIGIN if offset.nanos % pd.Timedelta(days=7).value == 0 else "epoch"
+        return df.resample(rule, origin=origin)
+    return df.resample(rule, closed="left", label="left")  # a week / month labelled by its first day
+
+
+def select_source(sources, granularity, dataset_info=None, end=None):
+    """(hours per row, source name) of the coarsest source whose rows tile the requested periods (rows_fit).
+
+    A daily file that stops before the requested end (or the dataset's own last day) is skipped,
+    so the chart never loses days the hourly file has.
+    """
+    for hours in sorted(sources, reverse=True):
+        if not rows_fit(granularity, hours):
+            continue
+        if sources[hours] == "daily file" and dataset_info is not None:
+            wanted_end = _last_day(dataset_info)
+            if end is not None:
+                wanted_end = min(wanted_end, pd.Timestamp(end))
+            if _last_day(dataset_info["daily"]) < wanted_end.normalize():
+                continue
+        return hours, sources[hours]
+    return 1, sources[1]
+
+
+def _read_daily_file(daily_info, variable, direction, prefer_local=False):
+    df = http_cache.read_csv(resolve_dataset_source(daily_info, prefer_local))
+    columns = daily_info["columns"]
+    data = {"datetime": pd.to_datetime(df[columns["datetime"]], format=DATETIME_FORMAT)}
+    for output, name in frame_columns(variable, direction).items():
+        data[output] = df[columns[name]].to_numpy()
+    return pd.DataFrame(data)
+
+
+def _clip(df, start=None, end=None):
+    if start is not None:
+        df = df[df["datetime"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["datetime"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+    return df
+
+
+def _rebin(df, granularity, how):
+    """Resampled frame without empty periods; ``<column>_sum`` / ``<column>_count`` pairs become hour-weighted means"""
+    resampled = _resample(df.set_index("datetime"), granularity)
+    weighted = [column[:-len("_count")] for column in df.columns if column.endswith("_count")]
+    if weighted:
+        totals = resampled.sum()
+        for column in weighted:
+            totals[column] = totals.pop(f"{column}_sum") / totals.pop(f"{column}_count")
+    else:
+        totals = resampled.agg(how)
+    # Periods without any rows are dropped rather than shown as zero volume
+    return totals[resampled.size() > 0].reset_index()
+
+
+def load_at_granularity(variable, direction, location_key, granularity, start=None, end=None,
+                        hourly_loader=None, daily_loader=None, data_tier=None, prefer_local=False):
+    """Dataset resampled to a sidebar granularity, read from the coarsest source that can produce it.
+
+    Returns (df, stats): df has "datetime" plus the same value columns as load_washington_st_data;
+    stats = {"source", "rows_read", "rows"}. ``hourly_loader(variable, direction, location_key)``
+    and ``daily_loader(variable, direction, location_key, start, end, weights=True)`` supply the
+    hourly frame and the daily rollup (the app passes its shared DatasetStore); by default the hourly
+    frame is read through the catalog and the rollup is taken from ``data_tier``, else resampled from
+    the hourly rows. Averages coarser than a day are taken over the hours, not over daily means.
+    Returns (None, None) for an unknown location.
+    """
+    dataset_info = get_washington_st_data_paths().get(location_key)
+    if not dataset_info:
+        return None, None
+
+    sources = available_sources(dataset_info)
+    if sources[24] == "daily file" and AGGREGATIONS[variable] == "mean" and \
+            to_offset(GRANULARITIES[granularity]) != to_offset("1D"):
+        # The daily files only hold each day's average; the rollup keeps the hourly sums and counts
+        sources[24] = "daily rollup"
+    hours, source = select_source(sources, granularity, dataset_info, end)
+    df = None
+    if source == "daily file":
+        df = _clip(_read_daily_file(dataset_info["daily"], variable, direction, prefer_local), start, end)
+    elif source == "daily rollup":
+        if data_tier:
+            df = daily_frame(data_tier, location_key, frame_columns(variable, direction), start, end,
+                             empty_days=False, weights=True)
+        if df is None and daily_loader is not None:
+            df = daily_loader(variable, direction, location_key, start, end, weights=True)
+        if df is None:
+            hours, source = 1, sources[1]
+    if df is None:
+        if hourly_loader is None:
+            df, _ = load_washington_st_data(variable, direction, location_key, prefer_local)
+        else:
+            df, _ = hourly_loader(variable, direction, location_key)
+        if df is None:
+            return None, None
+        df = _clip(df, start, end)
+
+    rows_read = len(df)
+    if to_offset(GRANULARITIES[granularity]) != to_offset(f"{hours}h") and rows_read:
+        df = _rebin(df, granularity, AGGREGATIONS[variable])
+    else:
+        df = df[[column for column in df.columns if not column.endswith(("_sum", "_count"))]]
+    return df, {"source": source, "rows_read": rows_read, "rows": len(df)}
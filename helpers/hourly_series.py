@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# int16 code for a missing reading (NaN has no integer representation)
+MISSING = np.iinfo(np.int16).min
+INT16_LIMIT = np.iinfo(np.int16).max
+
+# Decimal scales tried before falling back to float32 (Iteris values carry 1-2 decimals)
+SCALES = (1, 10, 100)
+
+NS_PER_HOUR = 3_600_000_000_000
+
+
+def _encode(values):
+    """Pack a numeric column as scaled int16 when that is lossless, otherwise float32"""
+    values = np.asarray(values, dtype="float64")
+    present = ~np.isnan(values)
+    for scale in SCALES:
+        scaled = np.round(values[present] * scale)
+        if scaled.size and np.abs(scaled).max() > INT16_LIMIT:
+            break
+        if np.array_equal(scaled / scale, values[present]):
+            packed = np.full(values.shape, MISSING, dtype="int16")
+            packed[present] = scaled.astype("int16")
+            return packed, scale
+    return values.astype("float32"), None
+
+
+def _decode(packed, scale):
+    if scale is None:
+        return packed.astype("float64")
+    values = packed.astype("float64")
+    values[packed == MISSING] = np.nan
+    return values / scale if scale != 1 else values
+
+
+class HourlySeries:
+    """Compact hourly corridor series: epoch-hour index, packed metric arrays, units and timezone stored once"""
+
+    def __init__(self, epoch_hours, metrics, meta=None):
+        self.epoch_hours = epoch_hours
+        self.metrics = metrics  # name -> (packed array, scale or None, decoded dtype)
+        self.meta = meta or {}
+
+    @classmethod
+    def from_frame(cls, df, datetime_col, columns, meta=None):
+        """Build from a loaded frame; ``columns`` maps metric name -> source column.
+
+        Text columns holding a single value on every row (units, timezone) move into ``meta``.
+        """
+        timestamps = pd.to_datetime(df[datetime_col])
+        nanoseconds = timestamps.to_numpy(dtype="datetime64[ns]").astype("int64")
+        if (nanoseconds % NS_PER_HOUR).any():
+            raise ValueError(f"{datetime_col} is not on whole hours")
+
+        metrics = {}
+        for name, source in columns.items():
+            column = df[source]
+            packed, scale = _encode(column)
+            dtype = "int64" if pd.api.types.is_integer_dtype(column) else "float64"
+            metrics[name] = (packed, scale, dtype)
+
+        meta = dict(meta or {})
+        for column in df.columns.difference([datetime_col, *columns.values()]):
+            if df[column].dtype == object and df[column].nunique(dropna=True) == 1:
+                meta[column] = df[column].dropna().iloc[0]
+
+        return cls((nanoseconds // NS_PER_HOUR).astype("int32"), metrics, meta)
+
+    def __len__(self):
+        return len(self.epoch_hours)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the index and metric arrays"""
+        return self.epoch_hours.nbytes + sum(packed.nbytes for packed, _, _ in self.metrics.values())
+
+    def datetimes(self):
+        return (self.epoch_hours.astype("int64") * NS_PER_HOUR).view("datetime64[ns]")
+
+    def column(self, name):
+        """Decoded values of one metric (float64, or int64 for count columns without gaps)"""
+        packed, scale, dtype = self.metrics[name]
+        values = _decode(packed, scale)
+        if dtype == "int64" and not np.isnan(values).any():
+            return values.astype("int64")
+        return values
+
+    def slice(self, start=None, end=None):
+        """Rows with start <= datetime < end"""
+        keep = np.ones(len(self), dtype=bool)
+        if start is not None:
+            keep &= self.epoch_hours >= pd.Timestamp(start).value // NS_PER_HOUR
+        if end is not None:
+            keep &= self.epoch_hours < pd.Timestamp(end).value // NS_PER_HOUR
+        metrics = {name: (packed[keep], scale, dtype) for name, (packed, scale, dtype) in self.metrics.items()}
+        return HourlySeries(self.epoch_hours[keep], metrics, self.meta)
+
+    def to_frame(self, columns):
+        """DataFrame with a datetime column plus ``columns`` (output name -> metric name)"""
+        data = {"datetime": self.datetimes()}
+        for output, name in columns.items():
+            data[output] = self.column(name)
+        return pd.DataFrame(data)
@@ -0,0 +1,168 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import requests
+
+from helpers.api_connector import build_session
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DASHBOARD_HTTP_CACHE: cache directory, or "off" to always download
+CACHE_ENV = "DASHBOARD_HTTP_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(APP_DIR, ".http_cache")
+
+# DASHBOARD_HTTP_CACHE_MAX_AGE: seconds a cached copy is served without asking the server again
+MAX_AGE_ENV = "DASHBOARD_HTTP_CACHE_MAX_AGE"
+DEFAULT_MAX_AGE = 300
+
+
+class HttpCsvCache:
+    """On-disk cache of remote CSV files, revalidated with conditional GET.
+
+    Each URL keeps its validators (ETag / Last-Modified) in a small JSON file next to a parquet copy
+    of the parsed frame. A copy checked within the last ``max_age`` seconds is read back without any
+    request. An older one is fetched with If-None-Match / If-Modified-Since: on a 304 the parquet
+    copy is read back (no download, no CSV parsing) and counts as checked again, otherwise the new
+    body is parsed and stored. When the server cannot be reached the cached copy is served. Entries are written to a
+    temporary file and renamed, so concurrent processes never read a half-written copy.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, session=None, timeout=30, max_age=DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.session = session or build_session()
+        self.timeout = timeout
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "downloads": 0, "not_modified": 0, "offline": 0, "bytes": 0}
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".parquet"
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    @staticmethod
+    def _replace(path, write):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(temp_path)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_meta(meta_path, data_path):
+        if not os.path.exists(data_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        self._replace(meta_path, write)
+
+    def _store(self, url, response, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, data_path = self._paths(url)
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "checked_at": now,
+        }
+        self._replace(data_path, lambda path: df.to_parquet(path, index=False))
+        self._write_meta(meta_path, meta)
+
+    def _is_fresh(self, meta):
+        checked_at = meta.get("checked_at", meta.get("fetched_at", 0))
+        return time.time() - checked_at < self.max_age
+
+    def read_csv(self, url):
+        """DataFrame of a remote CSV, downloaded only when the server reports it changed"""
+        meta_path, data_path = self._paths(url)
+        meta = self._read_meta(meta_path, data_path)
+        if meta and self._is_fresh(meta):
+            self._count("fresh")
+            return pd.read_parquet(data_path)
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            if meta is None:
+                raise
+            self._count("offline")
+            return pd.read_parquet(data_path)
+
+        if response.status_code == 304 and meta is not None:
+            self._count("not_modified")
+            try:
+                self._write_meta(meta_path, {**meta, "checked_at": time.time()})
+            except OSError:
+                pass  # read-only disk: revalidated again next time
+            return pd.read_parquet(data_path)
+        response.raise_for_status()
+
+        self._count("downloads")
+        self._count("bytes", len(response.content))
+        df = pd.read_csv(io.BytesIO(response.content))
+        try:
+            self._store(url, response, df)
+        except (OSError, ImportError, ValueError):
+            pass  # read-only disk or no parquet engine: the frame is still good, just not cached
+        return df
+
+    def clear(self):
+        """Drop every cached file (the next read of each URL downloads it again)"""
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith((".json", ".parquet", ".tmp")):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Process-wide cache in $DASHBOARD_HTTP_CACHE (default .http_cache/); None when set to "off".
+
+    $DASHBOARD_HTTP_CACHE_MAX_AGE sets how long a copy is served before the server is asked again.
+    """
+    global _default_cache
+    cache_dir = os.environ.get(CACHE_ENV, DEFAULT_CACHE_DIR)
+    if cache_dir.lower() in ("off", "0", "false", ""):
+        return None
+    max_age = float(os.environ.get(MAX_AGE_ENV, DEFAULT_MAX_AGE))
+    with _default_lock:
+        if _default_cache is None or (_default_cache.cache_dir, _default_cache.max_age) != (cache_dir, max_age):
+            _default_cache = HttpCsvCache(cache_dir, max_age=max_age)
+        return _default_cache
+
+
+def read_csv(source):
+    """pd.read_csv for a local path; remote URLs go through the conditional-GET disk cache"""
+    if isinstance(source, str) and source.startswith(("http://", "https://")):
+        cache = default_cache()
+        if cache is not None:
+            return cache.read_csv(source)
+    return pd.read_csv(source)
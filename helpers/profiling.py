@@ -0,0 +1,186 @@
+import functools
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Each Streamlit session runs its script on its own thread, so the active profile is thread-local
+_local = threading.local()
+
+# Process-wide cache counters (st.cache_data is shared by every session)
+_cache_totals = OrderedDict()
+_cache_totals_lock = threading.Lock()
+
+
+class RerunProfile:
+    """Stage timings and cache hit/miss counts for one script rerun"""
+
+    def __init__(self, session_id=None):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.stages = OrderedDict()
+        self.cache = OrderedDict()
+        self.events = []
+        self.exported = False
+        self.finished_ms = None
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def stage(self, name):
+        start_ms = self._elapsed_ms()
+        try:
+            yield
+        finally:
+            duration_ms = self._elapsed_ms() - start_ms
+            totals = self.stages.setdefault(name, {"calls": 0, "ms": 0.0})
+            totals["calls"] += 1
+            totals["ms"] += duration_ms
+            self.events.append({"stage": name, "start_ms": round(start_ms, 3), "ms": round(duration_ms, 3)})
+
+    def record_cache(self, name, miss=False):
+        counts = self.cache.setdefault(name, {"calls": 0, "misses": 0})
+        if miss:
+            counts["misses"] += 1
+        else:
+            counts["calls"] += 1
+
+    def finish(self):
+        """Mark the end of the script"""
+        self.finished_ms = self._elapsed_ms()
+
+    @property
+    def total_ms(self):
+        """Script run time; reruns ended by st.stop() never call finish(), so fall back to the last event"""
+        if self.finished_ms is not None:
+            return self.finished_ms
+        if not self.events:
+            return 0.0
+        return max(event["start_ms"] + event["ms"] for event in self.events)
+
+    def to_record(self):
+        return {
+            "rerun_id": self.id,
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 3),
+            "finished": self.finished_ms is not None,
+            "stages": {name: {"calls": s["calls"], "ms": round(s["ms"], 3)} for name, s in self.stages.items()},
+            "cache": {name: {"calls": c["calls"], "hits": c["calls"] - c["misses"], "misses": c["misses"]}
+                      for name, c in self.cache.items()},
+            "events": self.events,
+        }
+
+
+# === ACTIVE PROFILE ===
+def activate(profile):
+    """Make ``profile`` the one stages/caches on this thread report to (None turns profiling off)"""
+    _local.profile = profile
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as a named stage of the active rerun (no-op when profiling is off)"""
+    profile = current()
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
+
+
+def timed(stage_name, func):
+    """Wrap a function so every call is timed as ``stage_name``"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with stage(stage_name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class TimedNamespace:
+    """Proxy over a module (e.g. plotly.express) that times every function called through it"""
+
+    def __init__(self, module, stage_name):
+        self._module = module
+        self._stage_name = stage_name
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        return timed(self._stage_name, attr) if callable(attr) else attr
+
+
+# === CACHE COUNTERS ===
+def _record_cache(name, miss):
+    with _cache_totals_lock:
+        counts = _cache_totals.setdefault(name, {"calls": 0, "misses": 0})
+        counts["misses" if miss else "calls"] += 1
+    profile = current()
+    if profile is not None:
+        profile.record_cache(name, miss)
+
+
+def count_cache_calls(cache_decorator):
+    """Wrap a caching decorator (st.cache_data) so calls and misses are counted per function.
+
+    A miss is a call that actually ran the function body; hits are calls minus misses.
+    Supports both ``@decorator`` and ``@decorator(ttl=...)`` forms.
+    """
+    def decorate(func, **cache_kwargs):
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _record_cache(name, miss=True)
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(**cache_kwargs)(compute) if cache_kwargs else cache_decorator(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            _record_cache(name, miss=False)
+            return cached(*args, **kwargs)
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+
+    def decorator(func=None, **cache_kwargs):
+        if func is None:
+            return lambda f: decorate(f, **cache_kwargs)
+        return decorate(func, **cache_kwargs)
+
+    return decorator
+
+
+def record_lookup(name, hit):
+    """Count one lookup in a cache that is not wrapped by count_cache_calls (e.g. a shared store)"""
+    _record_cache(name, miss=False)
+    if not hit:
+        _record_cache(name, miss=True)
+
+
+def cache_totals():
+    """Process-wide calls / hits / misses per cached function since the server started"""
+    with _cache_totals_lock:
+        return {name: {"calls": c["calls"], "hits": c["calls"] - c["misses"], "misses": c["misses"]}
+                for name, c in _cache_totals.items()}
+
+
+# === TRACE EXPORT ===
+def to_jsonl(profiles):
+    return "".join(json.dumps(profile.to_record()) + "\n" for profile in profiles)
+
+
+def append_jsonl(path, profiles):
+    """Append rerun records to a JSONL trace file"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(to_jsonl(profiles))
@@ -0,0 +1,221 @@
+import os
+
+from analytics.periods import PERIOD_HOURS
+from helpers.data_catalog import get_washington_st_data_paths
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional - the dashboard falls back to pandas
+    duckdb = None
+
+# Variable -> canonical column prefix in the registered views
+VARIABLE_COLUMNS = {
+    "Speed": "speed",
+    "Travel Time": "travel_time",
+    "Delay": "delay",
+    "Vehicle Volume": "volume",
+}
+
+DATETIME_FORMAT = "%m/%d/%Y %H:%M"
+
+
+def duckdb_available():
+    """Whether the optional DuckDB engine can be used"""
+    return duckdb is not None
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _period_clause(period, column="datetime"):
+    if period not in PERIOD_HOURS:
+        return "TRUE"
+    start_hour, end_hour = PERIOD_HOURS[period]
+    return f"hour({column}) BETWEEN {start_hour} AND {end_hour}"
+
+
+def _date_clause(start=None, end=None, column="datetime"):
+    clauses = []
+    if start is not None:
+        clauses.append(f"{column} >= CAST({_literal(start)} AS TIMESTAMP)")
+    if end is not None:
+        # Sidebar end dates are inclusive
+        clauses.append(f"{column} < CAST({_literal(end)} AS DATE) + INTERVAL 1 DAY")
+    return " AND ".join(clauses) if clauses else "TRUE"
+
+
+class CorridorQueryEngine:
+    """DuckDB-backed query engine over every corridor dataset in the catalog"""
+
+    def __init__(self, data_paths=None, threads=None, materialize=True, lock=True):
+        if duckdb is None:
+            raise ImportError("DuckDB is not installed. Install it with: pip install duckdb")
+
+        self.data_paths = data_paths or get_washington_st_data_paths()
+        self.con = duckdb.connect(database=":memory:")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        self.materialize = materialize
+        self.table_names = set()
+        self._register_datasets()
+
+        # Materialized tables never touch the files again, so the shared connection can be sealed:
+        # no file/network access (read_csv, COPY, ATTACH, INSTALL) and no settings changes afterwards
+        self.locked = lock and materialize
+        if self.locked:
+            self.con.execute("SET enable_external_access = false")
+            self.con.execute("SET lock_configuration = true")
+
+    # === REGISTRATION ===
+    def _register_datasets(self):
+        """Register each catalog dataset plus long-format corridor-wide views"""
+        segment_selects = []
+        volume_selects = []
+        kind = "TABLE" if self.materialize else "VIEW"
+
+        for key, info in self.data_paths.items():
+            path = info["path"] if os.path.exists(info.get("path", "")) else info["url"]
+            columns = info["columns"]
+            select_list = [f"strptime({_quote(columns['datetime'])}, {_literal(DATETIME_FORMAT)}) AS datetime"]
+            select_list += [f"{_quote(source)} AS {name}" for name, source in columns.items() if name != "datetime"]
+
+            self.con.execute(
+                f"CREATE OR REPLACE {kind} {_quote(key)} AS "
+                f"SELECT {', '.join(select_list)} FROM read_csv({_literal(path)}, header = true)"
+            )
+            self.table_names.add(key)
+
+            if info["data_type"] == "segment":
+                for direction in ("NB", "SB"):
+                    prefix = direction.lower()
+                    segment_selects.append(
+                        f"SELECT {_literal(key)} AS location_key, datetime, {_literal(direction)} AS direction, "
+                        f"{prefix}_speed AS speed, {prefix}_travel_time AS travel_time, {prefix}_delay AS delay "
+                        f"FROM {_quote(key)}"
+                    )
+            elif info["data_type"] == "intersection":
+                for direction in ("NB", "SB"):
+                    volume_selects.append(
+                        f"SELECT {_literal(key)} AS location_key, datetime, {_literal(direction)} AS direction, "
+                        f"{direction.lower()}_volume AS volume FROM {_quote(key)}"
+                    )
+
+        if segment_selects:
+            self.con.execute(f"CREATE OR REPLACE VIEW corridor_segments AS {' UNION ALL '.join(segment_selects)}")
+            self.table_names.add("corridor_segments")
+        if volume_selects:
+            self.con.execute(f"CREATE OR REPLACE VIEW corridor_volume AS {' UNION ALL '.join(volume_selects)}")
+            self.table_names.add("corridor_volume")
+
+    def export_parquet(self, output_dir):
+        """Write every registered dataset to Parquet for faster cold starts"""
+        if self.locked:
+            raise RuntimeError("File access is disabled on a locked engine; build it with lock=False to export")
+        os.makedirs(output_dir, exist_ok=True)
+        written = {}
+        for key in self.data_paths:
+            target = os.path.join(output_dir, f"{key}.parquet")
+            self.con.execute(f"COPY {_quote(key)} TO {_literal(target)} (FORMAT PARQUET)")
+            written[key] = target
+        return written
+
+    # === QUERIES ===
+    def query(self, sql, params=None):
+        """Run trusted SQL built by this class against the registered views and return a DataFrame"""
+        cursor = self.con.cursor()  # each caller gets its own cursor so sessions can query concurrently
+        try:
+            return cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+
+    def select(self, sql):
+        """Run user-supplied SQL: a single SELECT over the registered views only, else ValueError"""
+        if not self.locked:
+            raise ValueError("Ad-hoc SQL needs a materialized, locked engine")
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Only a single SELECT statement is allowed")
+        unknown = self.con.get_table_names(sql) - self.table_names
+        if unknown:
+            raise ValueError(f"Unknown table(s): {', '.join(sorted(unknown))}")
+        return self.query(sql)
+
+    def _long_view(self, variable):
+        return "corridor_volume" if variable == "Vehicle Volume" else "corridor_segments"
+
+    def load_series(self, variable, direction, location_key, start=None, end=None):
+        """Same shape as load_washington_st_data, with the date range filtered in SQL"""
+        prefix = VARIABLE_COLUMNS[variable]
+        where = _date_clause(start, end)
+        if direction == "Both":
+            sql = (f"SELECT datetime, nb_{prefix} AS Northbound, sb_{prefix} AS Southbound "
+                   f"FROM {_quote(location_key)} WHERE {where} ORDER BY datetime")
+        else:
+            sql = (f"SELECT datetime, {direction.lower()}_{prefix} AS value "
+                   f"FROM {_quote(location_key)} WHERE {where} ORDER BY datetime")
+        return self.query(sql)
+
+    def period_totals(self, location_key, period, start=None, end=None):
+        """NB/SB volume totals for a KPI period (AM/MD/PM)"""
+        sql = (f"SELECT sum(nb_volume) AS nb_total, sum(sb_volume) AS sb_total "
+               f"FROM {_quote(location_key)} WHERE {_period_clause(period)} AND {_date_clause(start, end)}")
+        return self.query(sql).iloc[0].to_dict()
+
+    def hourly_profile(self, variable, location_key, direction, start=None, end=None, agg="avg"):
+        """Typical-day profile: value aggregated by hour of day"""
+        prefix = VARIABLE_COLUMNS[variable]
+        column = f"nb_{prefix} + sb_{prefix}" if direction == "Both" else f"{direction.lower()}_{prefix}"
+        sql = (f"SELECT hour(datetime) AS hour, {agg}({column}) AS value "
+               f"FROM {_quote(location_key)} WHERE {_date_clause(start, end)} "
+               f"GROUP BY hour ORDER BY hour")
+        return self.query(sql)
+
+    def heatmap_matrix(self, variable, location_key, direction, start=None, end=None):
+        """Day x hour matrix behind the Heatmap chart type (pivoted in SQL)"""
+        prefix = VARIABLE_COLUMNS[variable]
+        column = f"{direction.lower()}_{prefix}"
+        sql = (f"PIVOT (SELECT CAST(datetime AS DATE) AS day, hour(datetime) AS hour, {column} AS value "
+               f"FROM {_quote(location_key)} WHERE {_date_clause(start, end)}) "
+               f"ON hour USING avg(value) GROUP BY day ORDER BY day")
+        matrix = self.query(sql).set_index("day")
+        matrix.columns = matrix.columns.astype(int)
+        return matrix[sorted(matrix.columns)]
+
+    def cycle_length_hours(self, location_key, direction, period=None, start=None, end=None):
+        """Hourly volume sums with the CVAG cycle-length bins evaluated in SQL"""
+        column = "nb_volume + sb_volume" if direction == "Both" else f"{direction.lower()}_volume"
+        sql = f"""
+            SELECT hour, volume,
+                   CASE WHEN volume >= 2400 THEN '140 sec'
+                        WHEN volume >= 1500 THEN '130 sec'
+                        WHEN volume >= 600 THEN '120 sec'
+                        WHEN volume >= 300 THEN '110 sec'
+                        ELSE 'Free mode' END AS cvag_recommendation,
+                   CASE WHEN volume >= 300 THEN '140 sec' ELSE 'Free mode' END AS current_system
+            FROM (
+                SELECT hour(datetime) AS hour, sum({column}) AS volume
+                FROM {_quote(location_key)}
+                WHERE {_period_clause(period)} AND {_date_clause(start, end)}
+                GROUP BY hour
+            )
+            ORDER BY hour
+        """
+        return self.query(sql)
+
+    def top_hours(self, variable="Vehicle Volume", direction="SB", n=10, start=None, end=None, descending=True):
+        """Top-N hourly values across every intersection / segment in the corridor"""
+        value = VARIABLE_COLUMNS[variable]
+        direction_clause = "TRUE" if direction == "Both" else f"direction = {_literal(direction)}"
+        sql = (f"SELECT location_key, datetime, direction, {value} AS value "
+               f"FROM {self._long_view(variable)} "
+               f"WHERE {direction_clause} AND {_date_clause(start, end)} AND {value} IS NOT NULL "
+               f"ORDER BY value {'DESC' if descending else 'ASC'} LIMIT {int(n)}")
+        df = self.query(sql)
+        names = {k: v.get("intersection_name") or v.get("segment_name") for k, v in self.data_paths.items()}
+        df.insert(1, "location", df["location_key"].map(names))
+        return df
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers.batch_report import create_batch_report
+from helpers.reporting import create_pdf_report, start_image_exporter
+
+
+def figure_hash(chart_fig):
+    """Stable hash of a plotly figure's JSON (None when there is no chart)"""
+    if chart_fig is None:
+        return None
+    return hashlib.sha1(chart_fig.to_json().encode("utf-8")).hexdigest()
+
+
+class ReportJob:
+    """Handle for a report that is being built in the background"""
+
+    def __init__(self, cache_key):
+        self.id = uuid.uuid4().hex
+        self.cache_key = cache_key
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.progress = 0.0
+        self.stage = "Queued"
+        self.future = None
+        self.pdf_bytes = None
+        self.stats = None
+        self.error = None
+        self.from_cache = False
+
+    def update(self, fraction, stage):
+        self.progress = fraction
+        self.stage = stage
+
+    def done(self):
+        return self.pdf_bytes is not None or self.error is not None
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.submitted_at
+
+
+class ReportWorkerPool:
+    """Build PDF reports on worker threads, caching finished PDFs by their inputs"""
+
+    def __init__(self, max_workers=2, cache_size=32, max_jobs=256):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-worker")
+        self.cache_size = cache_size
+        self.max_jobs = max_jobs
+        self._cache = OrderedDict()
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Start the shared Kaleido renderer off the script thread so the first report is not cold
+        self.executor.submit(start_image_exporter)
+
+    @staticmethod
+    def make_cache_key(variable, date_range, chart_fig):
+        return (variable, str(date_range), figure_hash(chart_fig))
+
+    @staticmethod
+    def make_batch_cache_key(start=None, end=None, resample_rule="D"):
+        return ("batch", str(start), str(end), resample_rule)
+
+    def submit(self, variable, date_range, chart_fig, data_source_info):
+        """Queue a report and return its job handle immediately"""
+        cache_key = self.make_cache_key(variable, date_range, chart_fig)
+
+        def build(progress_callback):
+            buffer = create_pdf_report(variable, date_range, chart_fig, data_source_info,
+                                       progress_callback=progress_callback)
+            return buffer, None
+
+        return self._submit(cache_key, build)
+
+    def submit_batch(self, start=None, end=None, resample_rule="D"):
+        """Queue the multi-page corridor report (every intersection and segment)"""
+        cache_key = self.make_batch_cache_key(start, end, resample_rule)
+
+        def build(progress_callback):
+            return create_batch_report(start, end, resample_rule, progress_callback=progress_callback)
+
+        return self._submit(cache_key, build)
+
+    def _submit(self, cache_key, build):
+        job = ReportJob(cache_key)
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                job.pdf_bytes, job.stats = cached
+                job.from_cache = True
+                job.update(1.0, "Done (cached)")
+                job.finished_at = time.time()
+            self._remember(job)
+
+        if not job.done():
+            job.future = self.executor.submit(self._build, job, build)
+        return job
+
+    def _remember(self, job):
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    def _build(self, job, build):
+        try:
+            buffer, stats = build(job.update)
+            pdf_bytes = buffer.getvalue()
+            with self._lock:
+                self._cache[job.cache_key] = (pdf_bytes, stats)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            job.stats = stats
+            job.pdf_bytes = pdf_bytes
+        except Exception as e:
+            job.error = str(e)
+            job.stage = "Failed"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,47 +1,62 @@
+import argparse
 import io
+import os
+import sys
+import threading
+import time
 import urllib.parse
-import streamlit as st
 from datetime import datetime
+
+import pandas as pd
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
+from reportlab.graphics import renderPDF
+from helpers.vector_charts import build_line_drawing, figure_series
+# Pure analytics live in the analytics package; re-exported here for existing imports
+from analytics import get_hourly_cycle_length, get_existing_cycle_length, get_cycle_length_recommendation, \
+    filter_by_period, volume_kpis, speed_kpis, cycle_length_table, corridor_rollup
+
+# "vector" draws line charts with reportlab primitives; "png" rasterizes through Kaleido
+CHART_MODES = ("vector", "png")
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_image_exporter():
+    """Keep one warm Kaleido browser for every chart export instead of launching one per image"""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return True
+        try:
+            import kaleido
+            if hasattr(kaleido, "start_sync_server"):
+                # Constructing Kaleido raises when Chrome is missing; a server started without
+                # a browser would leave every later export waiting on a dead thread
+                kaleido.Kaleido()
+                kaleido.start_sync_server(silence_warnings=True)
+                _exporter_started = True
+        except Exception:
+            # Older Kaleido (or none): plotly falls back to a one-shot renderer per image
+            _exporter_started = False
+        return _exporter_started
+
+
+def render_chart_image(chart_fig, width=500, height=300):
+    """Rasterize a plotly figure to PNG bytes"""
+    return chart_fig.to_image(format="png", width=width, height=height)
 
-@st.cache_data
-def get_hourly_cycle_length(volume):
-    """Get CVAG recommended cycle length based on volume"""
-    if volume >= 2400:
-        return "140 sec"
-    elif volume >= 1500:
-        return "130 sec"
-    elif volume >= 600:
-        return "120 sec"
-    elif volume >= 300:
-        return "110 sec"
-    else:
-        return "Free mode"
-
-@st.cache_data
-def get_existing_cycle_length(volume):
-    """Get current system cycle length based on volume"""
-    if volume >= 300:
-        return "140 sec"
-    else:
-        return "Free mode"
-
-@st.cache_data
-def filter_by_period(df, time_col, period):
-    """Filter dataframe by time period"""
-    if period == "AM":
-        return df[(df[time_col].dt.hour >= 5) & (df[time_col].dt.hour <= 10)]
-    elif period == "MD":
-        return df[(df[time_col].dt.hour >= 11) & (df[time_col].dt.hour <= 15)]
-    elif period == "PM":
-        return df[(df[time_col].dt.hour >= 16) & (df[time_col].dt.hour <= 20)]
-    else:
-        return df
-
-def create_pdf_report(variable, date_range, chart_fig, data_source_info):
+
+def create_pdf_report(variable, date_range, chart_fig, data_source_info, progress_callback=None,
+                      chart_mode="vector"):
     """Create a PDF report with current screen info"""
+    def report_progress(fraction, stage):
+        if progress_callback is not None:
+            progress_callback(fraction, stage)
+
+    report_progress(0.05, "Building report header")
     buffer = io.BytesIO()
 
     # Create PDF
@@ -68,15 +83,24 @@ def create_pdf_report(variable, date_range, chart_fig, data_source_info):
 
     # Save chart as image and add to PDF
     if chart_fig:
-        # Convert plotly figure to image
-        img_bytes = chart_fig.to_image(format="png", width=500, height=300)
-        img = ImageReader(io.BytesIO(img_bytes))
-        p.drawImage(img, 50, height - 500, width=500, height=300)
+        report_progress(0.2, "Rendering chart")
+        # Line charts are redrawn natively; anything else (bars, heatmaps...) is rasterized
+        series = figure_series(chart_fig) if chart_mode == "vector" else None
+        if series:
+            title = chart_fig.layout.title.text if chart_fig.layout.title else None
+            renderPDF.draw(build_line_drawing(series, width=500, height=300, title=title), p, 50, height - 500)
+        else:
+            # Convert plotly figure to image
+            img_bytes = render_chart_image(chart_fig, width=500, height=300)
+            img = ImageReader(io.BytesIO(img_bytes))
+            p.drawImage(img, 50, height - 500, width=500, height=300)
 
+    report_progress(0.9, "Writing PDF")
     p.showPage()
     p.save()
 
     buffer.seek(0)
+    report_progress(1.0, "Done")
     return buffer
 
 def generate_email_details(variable, date_range):
@@ -94,4 +118,100 @@ Best regards,
 Traffic Data System
 """
     mailto_url = f"mailto:{to_emails}?subject={urllib.parse.quote(subject)}&body={urllib.parse.quote(body)}"
-    return to_emails, subject, body, mailto_url
\ No newline at end of file
+    return to_emails, subject, body, mailto_url
+
+# === COMMAND LINE ===
+def _filter_dates(df, since=None, until=None, time_col="datetime"):
+    if since is not None:
+        df = df[df[time_col] >= pd.Timestamp(since)]
+    if until is not None:
+        df = df[df[time_col] < pd.Timestamp(until) + pd.Timedelta(days=1)]
+    return df
+
+
+def build_kpi_tables(location_keys, period, since=None, until=None):
+    """KPI and cycle-length tables for the given catalog locations, loaded from the local data store"""
+    from helpers.data_catalog import get_washington_st_data_paths, load_washington_st_data
+
+    data_paths = get_washington_st_data_paths()
+    volume_frames, cycle_frames, speed_frames = [], [], []
+    intersection_frames = {}
+    for key in location_keys:
+        info = data_paths[key]
+        name = info.get("intersection_name") or info.get("segment_name")
+        variable = "Vehicle Volume" if info["data_type"] == "intersection" else "Speed"
+        df, _ = load_washington_st_data(variable, "Both", key, prefer_local=True)
+        if df is None:
+            print(f"  skipped {key}: could not load data", file=sys.stderr)
+            continue
+        df = _filter_dates(df, since, until)
+
+        if info["data_type"] == "intersection":
+            intersection_frames[name] = df
+            targets = ((volume_frames, volume_kpis(df, period)), (cycle_frames, cycle_length_table(df, period)))
+        else:
+            targets = ((speed_frames, speed_kpis(df, period)),)
+        for frames, table in targets:
+            if not table.empty:
+                table.insert(0, "Location", name)
+                frames.append(table)
+
+    def combine(frames):
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    return {"volume_kpis": combine(volume_frames), "cycle_lengths": combine(cycle_frames),
+            "speed_kpis": combine(speed_frames), "corridor_rollup": corridor_rollup(intersection_frames, period)}
+
+
+def main(argv=None):
+    """Headless report run, e.g. python -m helpers.reporting --all --period AM --since 2025-05-01"""
+    parser = argparse.ArgumentParser(prog="python -m helpers.reporting",
+                                     description="Write corridor KPI CSVs and PDF reports without the dashboard")
+    targets = parser.add_mutually_exclusive_group(required=True)
+    targets.add_argument("--all", action="store_true", help="every intersection and segment in the catalog")
+    targets.add_argument("--location", action="append", metavar="KEY",
+                         help="catalog key, e.g. intersection_washington_ave50 (repeatable)")
+    parser.add_argument("--period", choices=["AM", "MD", "PM", "All"], default="All")
+    parser.add_argument("--since", help="first date to include (YYYY-MM-DD)")
+    parser.add_argument("--until", help="last date to include (YYYY-MM-DD)")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--pdf", action=argparse.BooleanOptionalAction, default=True,
+                        help="also write the multi-page corridor PDF (default: on)")
+    args = parser.parse_args(argv)
+
+    from helpers.data_catalog import get_washington_st_data_paths
+
+    data_paths = get_washington_st_data_paths()
+    location_keys = ([key for key, info in data_paths.items() if info["data_type"] in ("intersection", "segment")]
+                     if args.all else args.location)
+    unknown = [key for key in location_keys if key not in data_paths]
+    if unknown:
+        parser.error(f"unknown location key(s): {', '.join(unknown)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    suffix = f"{args.period}_{args.since or 'start'}_{args.until or 'end'}"
+    started = time.perf_counter()
+
+    for table_name, table in build_kpi_tables(location_keys, args.period, args.since, args.until).items():
+        if table.empty:
+            continue
+        path = os.path.join(args.output_dir, f"{table_name}_{suffix}.csv")
+        table.to_csv(path, index=False)
+        print(f"wrote {path} ({len(table):,} rows)")
+
+    if args.pdf:
+        from helpers.batch_report import create_batch_report
+
+        selected = {key: data_paths[key] for key in location_keys}
+        buffer, stats = create_batch_report(args.since, args.until, data_paths=selected)
+        path = os.path.join(args.output_dir, f"corridor_report_{suffix}.pdf")
+        with open(path, "wb") as f:
+            f.write(buffer.getvalue())
+        print(f"wrote {path} ({len(stats['pages'])} location pages in {stats['total_seconds']:.1f}s)")
+
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
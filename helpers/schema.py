@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+# Column-name patterns per role, in priority order (matched case-insensitively, exact before substring)
+TIME_PATTERNS = ("time", "timestamp", "datetime", "date", "hour", "period",
+                 "time_period", "time_hour", "hour_period", "interval")
+DIRECTION_PATTERNS = {
+    "nb": ("northbound", "nb", "north"),
+    "sb": ("southbound", "sb", "south"),
+}
+METRIC_PATTERNS = {
+    "speed": ("speed",),
+    "travel_time": ("traveltime", "travel_time", "travel time"),
+    "delay": ("delay",),
+    "volume": ("volume",),
+}
+
+# Display unit of each metric
+UNITS = {"speed": "mph", "travel_time": "min", "delay": "min", "volume": "vehicles"}
+
+
+def _matches(column, patterns):
+    name = column.strip().lower()
+    return any(pattern in name for pattern in patterns)
+
+
+@lru_cache(maxsize=1024)
+def find_column(columns, patterns):
+    """First column equal to a pattern, else the first containing one (case-insensitive); both args are tuples"""
+    for pattern in patterns:
+        for column in columns:
+            if column.strip().lower() == pattern.lower():
+                return column
+    for pattern in patterns:
+        for column in columns:
+            if pattern.lower() in column.strip().lower():
+                return column
+    return None
+
+
+@lru_cache(maxsize=256)
+def resolve_schema(columns):
+    """Column roles of a dataset, resolved once per tuple of column names.
+
+    Keys: "time", "nb" / "sb" (first column of each direction), "nb_<metric>" / "sb_<metric>" for
+    every metric found, and "units" (metric -> display unit). Missing roles are None. The dict is
+    shared between callers - read it, don't modify it.
+    """
+    columns = tuple(columns)
+    schema = {"time": find_column(columns, TIME_PATTERNS)}
+    for direction, patterns in DIRECTION_PATTERNS.items():
+        schema[direction] = find_column(columns, patterns)
+
+    units = {}
+    for metric, metric_patterns in METRIC_PATTERNS.items():
+        for direction, patterns in DIRECTION_PATTERNS.items():
+            schema[f"{direction}_{metric}"] = next(
+                (column for column in columns
+                 if _matches(column, patterns) and _matches(column, metric_patterns)), None)
+            if schema[f"{direction}_{metric}"]:
+                units[metric] = UNITS[metric]
+    schema["units"] = units
+    return schema
+
+
+def frame_schema(df):
+    """Column roles of a DataFrame (only its column names are looked at)"""
+    return resolve_schema(tuple(df.columns))
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import ipaddress
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from helpers.data_tier import build_data_tier, tier_is_current
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "streamlit_app.py")
+DEFAULT_TIER = os.path.join(APP_DIR, "data_tier")
+
+
+# === WORKERS ===
+def start_worker(port, data_tier, extra_env=None):
+    """One headless Streamlit process bound to localhost, reading the shared data tier"""
+    env = {**os.environ, "DASHBOARD_DATA_TIER": data_tier, **(extra_env or {})}
+    command = [sys.executable, "-m", "streamlit", "run", APP_SCRIPT,
+               "--server.port", str(port), "--server.address", "127.0.0.1",
+               "--server.headless", "true", "--browser.gatherUsageStats", "false"]
+    return subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL)
+
+
+def wait_until_healthy(ports, timeout=120):
+    """Block until every worker answers /_stcore/health"""
+    deadline = time.monotonic() + timeout
+    pending = set(ports)
+    while pending:
+        for port in list(pending):
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+                    if response.status == 200:
+                        pending.discard(port)
+            except OSError:
+                pass
+        if pending:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"workers on ports {sorted(pending)} did not become healthy")
+            time.sleep(0.5)
+
+
+# === LOAD BALANCER ===
+class StickyBalancer:
+    """TCP proxy that pins each client IP to one worker.
+
+    A Streamlit session is one websocket, but media downloads (PDFs, images) and file uploads are
+    held by the worker that owns the session, so every connection from a client must land there.
+    """
+
+    def __init__(self, backend_ports):
+        self.backend_ports = backend_ports
+        self.connections = [0] * len(backend_ports)
+
+    def pick(self, client_ip):
+        return int(ipaddress.ip_address(client_ip)) % len(self.backend_ports)
+
+    async def _pipe(self, reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, client_reader, client_writer):
+        index = self.pick(client_writer.get_extra_info("peername")[0])
+        try:
+            backend_reader, backend_writer = await asyncio.open_connection("127.0.0.1", self.backend_ports[index])
+        except OSError:
+            client_writer.close()
+            return
+        self.connections[index] += 1
+        try:
+            await asyncio.gather(self._pipe(client_reader, backend_writer), self._pipe(backend_reader, client_writer))
+        finally:
+            self.connections[index] -= 1
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    """Serve the dashboard from several worker processes, e.g. python -m helpers.serve --workers 4"""
+    parser = argparse.ArgumentParser(prog="python -m helpers.serve",
+                                     description="Run several dashboard workers behind a local load balancer")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501, help="public port of the load balancer")
+    parser.add_argument("--worker-port", type=int, default=8600, help="first worker port (localhost only)")
+    parser.add_argument("--data-tier", default=DEFAULT_TIER, help="memory-mapped dataset directory")
+    parser.add_argument("--rebuild-tier", action="store_true", help="rebuild the data tier even if it is current")
+    args = parser.parse_args(argv)
+
+    if args.rebuild_tier or not tier_is_current(args.data_tier):
+        print(f"building data tier in {args.data_tier}", file=sys.stderr)
+        build_data_tier(args.data_tier)
+
+    ports = [args.worker_port + i for i in range(args.workers)]
+    workers = [start_worker(port, args.data_tier) for port in ports]
+
+    def shutdown(*_):
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        wait_until_healthy(ports)
+        print(f"{args.workers} workers ready on ports {ports[0]}-{ports[-1]}; "
+              f"serving on http://{args.host}:{args.port}", file=sys.stderr)
+        asyncio.run(StickyBalancer(ports).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
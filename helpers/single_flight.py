@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key: the first caller runs the load, the rest wait on its Future.
+
+    Followers get the leader's result or its exception, so a failing load is attempted once per
+    flight rather than once per waiting caller. A key is free again as soon as its flight finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.stats = {"runs": 0, "coalesced": 0}
+
+    def _join(self, key):
+        """(future, is_leader) for the key's current flight, starting one when there is none"""
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            self.stats["runs"] += 1
+            return future, True
+
+    def _run(self, key, load, future):
+        try:
+            future.set_result(load())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def do(self, key, load):
+        """Result of ``load()``, shared with every concurrent caller for the same key"""
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, load, future)
+        return future.result()
+
+    def start(self, key, load):
+        """Run ``load()`` on a background thread unless the key is already in flight; returns its Future"""
+        future, leader = self._join(key)
+        if leader:
+            threading.Thread(target=self._run, args=(key, load, future), daemon=True,
+                             name=f"single-flight-{key}").start()
+        return future
@@ -0,0 +1,180 @@
+import threading
+
+import pandas as pd
+import sqlalchemy as sa
+
+# Fixed-width buckets for the sidebar granularity options ("1 Month" is calendar based)
+GRANULARITY_SECONDS = {
+    "1 Hour": 3600,
+    "2 Hours": 2 * 3600,
+    "4 Hours": 4 * 3600,
+    "6 Hours": 6 * 3600,
+    "12 Hours": 12 * 3600,
+    "1 Day": 86400,
+    "2 Days": 2 * 86400,
+    "3 Days": 3 * 86400,
+    "1 Week": 7 * 86400,
+    "2 Weeks": 14 * 86400,
+}
+
+# Week buckets start on Monday (1970-01-05) instead of the epoch's Thursday, like pandas 'W-MON'
+WEEK_ANCHOR_SECONDS = 4 * 86400
+
+AGGREGATIONS = {"avg": sa.func.avg, "sum": sa.func.sum, "min": sa.func.min, "max": sa.func.max}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+# === POOLED ENGINES ===
+def get_engine(connection_string, pool_size=5, max_overflow=10):
+    """Return one pooled engine per connection string for the lifetime of the process"""
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            kwargs = {"pool_pre_ping": True}
+            if not connection_string.startswith("sqlite"):
+                kwargs.update(pool_size=pool_size, max_overflow=max_overflow)
+            engine = sa.create_engine(connection_string, **kwargs)
+            _engines[connection_string] = engine
+        return engine
+
+
+def dispose_engines():
+    """Close every pooled engine (used on shutdown and in benchmarks)"""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+# === BUCKET EXPRESSIONS ===
+def _epoch_seconds(dialect, column):
+    """Dialect-specific expression for a naive timestamp column as integer epoch seconds (no time zone shift)"""
+    if dialect == "sqlite":
+        return sa.cast(sa.func.strftime('%s', column), sa.Integer)
+    if dialect == "mysql":
+        # unix_timestamp() converts from the session time zone; the difference from the epoch does not
+        return sa.func.timestampdiff(sa.text("SECOND"), sa.literal("1970-01-01 00:00:00"), column)
+    if dialect == "duckdb":
+        return sa.func.epoch(column)
+    # PostgreSQL and most ANSI databases: EXTRACT returns numeric, so floor it to an integer before the
+    # bucket division (otherwise "/" divides exactly and the buckets collapse back to the raw epoch)
+    return sa.cast(sa.func.floor(sa.extract('epoch', column)), sa.BigInteger)
+
+
+def _bucket_expression(dialect, column, granularity):
+    """Expression that truncates a timestamp column to the requested granularity"""
+    if granularity == "1 Month":
+        if dialect == "sqlite":
+            return sa.func.strftime('%Y-%m-01', column)
+        if dialect == "mysql":
+            return sa.func.date_format(column, '%Y-%m-01')
+        return sa.func.date_trunc('month', column)
+
+    seconds = GRANULARITY_SECONDS.get(granularity)
+    if seconds is None:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+    anchor = WEEK_ANCHOR_SECONDS if seconds % (7 * 86400) == 0 else 0
+    epoch = _epoch_seconds(dialect, column)
+    return (epoch - anchor) // seconds * seconds + anchor
+
+
+def _where_clauses(date_col, direction_col, start=None, end=None, direction=None):
+    clauses = []
+    if start is not None:
+        clauses.append(date_col >= pd.Timestamp(start).to_pydatetime())
+    if end is not None:
+        # End date is inclusive in the sidebar, so compare against the following midnight
+        end_ts = pd.Timestamp(end)
+        if end_ts == end_ts.normalize():
+            end_ts = end_ts + pd.Timedelta(days=1)
+        clauses.append(date_col < end_ts.to_pydatetime())
+    if direction and direction != "Both":
+        clauses.append(direction_col == direction)
+    return clauses
+
+
+# === QUERY BUILDERS ===
+def build_aggregate_query(table, date_column="date", direction_column="direction", value_column="value",
+                          start=None, end=None, direction=None, granularity="1 Hour", agg="avg",
+                          dialect="sqlite"):
+    """Build a SELECT that filters and aggregates server-side (WHERE + GROUP BY)"""
+    date_col = sa.column(date_column)
+    direction_col = sa.column(direction_column)
+    value_col = sa.column(value_column)
+
+    bucket = _bucket_expression(dialect, date_col, granularity).label("bucket")
+    value = AGGREGATIONS[agg](value_col).label("value")
+
+    stmt = (
+        sa.select(bucket, direction_col.label("direction"), value)
+        .select_from(sa.table(table))
+        .where(*_where_clauses(date_col, direction_col, start, end, direction))
+        .group_by(bucket, direction_col)
+        .order_by(bucket, direction_col)
+    )
+    return stmt
+
+
+def build_raw_query(table, date_column="date", direction_column="direction", value_column="value",
+                    start=None, end=None, direction=None):
+    """Build a SELECT that returns raw rows with only the filters pushed down"""
+    date_col = sa.column(date_column)
+    direction_col = sa.column(direction_column)
+    value_col = sa.column(value_column)
+
+    return (
+        sa.select(date_col.label("date"), direction_col.label("direction"), value_col.label("value"))
+        .select_from(sa.table(table))
+        .where(*_where_clauses(date_col, direction_col, start, end, direction))
+        .order_by(date_col)
+    )
+
+
+# === CHUNKED EXECUTION ===
+def stream_query(engine, stmt, chunksize=50000, params=None):
+    """Yield DataFrame chunks using a server-side cursor where the driver supports one"""
+    with engine.connect().execution_options(stream_results=True) as conn:
+        for chunk in pd.read_sql(stmt, conn, params=params, chunksize=chunksize):
+            yield chunk
+
+
+def _to_canonical(df, granularity):
+    """Convert bucket keys back to timestamps and return the canonical date/direction/value frame"""
+    if "bucket" in df.columns:
+        if granularity == "1 Month":
+            df["date"] = pd.to_datetime(df.pop("bucket"))
+        else:
+            df["date"] = pd.to_datetime(df.pop("bucket").astype("int64"), unit="s")
+    else:
+        df["date"] = pd.to_datetime(df["date"])
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return df[["date", "direction", "value"]]
+
+
+def load_aggregated(engine, table, granularity="1 Hour", agg="avg", chunksize=50000, **filters):
+    """Run a pushdown aggregate query and return the canonical frame"""
+    stmt = build_aggregate_query(table, granularity=granularity, agg=agg, dialect=engine.dialect.name, **filters)
+    chunks = [_to_canonical(chunk, granularity) for chunk in stream_query(engine, stmt, chunksize)]
+    if not chunks:
+        return pd.DataFrame(columns=["date", "direction", "value"])
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_raw(engine, table, chunksize=50000, **filters):
+    """Pull filtered raw rows (no server-side aggregation) into the canonical frame"""
+    stmt = build_raw_query(table, **filters)
+    chunks = [_to_canonical(chunk, None) for chunk in stream_query(engine, stmt, chunksize)]
+    if not chunks:
+        return pd.DataFrame(columns=["date", "direction", "value"])
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_custom_query(engine, query, chunksize=50000):
+    """Run a user-supplied SQL query with chunked fetch"""
+    chunks = list(stream_query(engine, sa.text(query), chunksize))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
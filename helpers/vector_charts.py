@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from reportlab.graphics import renderPDF
+from reportlab.graphics.charts.legends import LineLegend
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+
+DEFAULT_COLORS = ["#2E86C1", "#C0392B", "#27AE60", "#8E44AD"]
+
+# More points than this per series are min/max decimated; a 500pt wide chart cannot show more
+MAX_POINTS = 1000
+
+
+def _to_epoch_seconds(values, numbers_per_second=1):
+    """Datetime-like or numeric x values as float seconds"""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float) / numbers_per_second
+    return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]").astype("int64") / 1e9
+
+
+def decimate_min_max(x, y, max_points=MAX_POINTS):
+    """Keep the min and max of each bucket so peaks survive downsampling"""
+    if len(x) <= max_points:
+        return x, y
+    buckets = max_points // 2
+    edges = np.linspace(0, len(x), buckets + 1, dtype=int)
+    keep = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunk = y[start:end]
+        if np.isnan(chunk).all():
+            continue
+        low, high = start + np.nanargmin(chunk), start + np.nanargmax(chunk)
+        keep.extend(sorted({low, high}))
+    keep = np.asarray(keep, dtype=int)
+    return x[keep], y[keep]
+
+
+def frame_series(df, x_col, y_cols, names=None):
+    """(name, x seconds, y values) tuples from DataFrame columns"""
+    x = _to_epoch_seconds(df[x_col])
+    return [(name, x, pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float))
+            for col, name in zip(y_cols, names or y_cols)]
+
+
+def figure_series(chart_fig):
+    """Series from a plotly figure's line traces, or None when a trace cannot be drawn natively"""
+    series = []
+    # Numbers on a date axis are epoch milliseconds (how chart_components.charts sends times)
+    numbers_per_second = 1000 if chart_fig.layout.xaxis.type == "date" else 1
+    for trace in chart_fig.data:
+        if trace.type not in ("scatter", "scattergl") or trace.x is None or trace.y is None:
+            return None
+        try:
+            x = _to_epoch_seconds(trace.x, numbers_per_second)
+        except (TypeError, ValueError):
+            return None
+        series.append((trace.name or f"Series {len(series) + 1}", x,
+                       pd.to_numeric(pd.Series(trace.y), errors="coerce").to_numpy(dtype=float)))
+    return series or None
+
+
+def _date_label(seconds, span_seconds):
+    timestamp = pd.Timestamp(seconds, unit="s")
+    return timestamp.strftime("%m/%d %H:%M" if span_seconds <= 3 * 86400 else "%m/%d/%y")
+
+
+def build_line_drawing(series, width=500, height=300, title=None, y_label=None, series_colors=None):
+    """Line chart as a reportlab Drawing (vector output, no browser needed)"""
+    series_colors = series_colors or DEFAULT_COLORS
+    drawing = Drawing(width, height)
+
+    plot_data = []
+    x_min, x_max = np.inf, -np.inf
+    for _, x, y in series:
+        valid = ~np.isnan(y)
+        x, y = decimate_min_max(x[valid], y[valid])
+        if len(x):
+            x_min, x_max = min(x_min, x.min()), max(x_max, x.max())
+        plot_data.append(list(zip(x.tolist(), y.tolist())))
+
+    top = 28 if title else 10
+    plot = LinePlot()
+    plot.x, plot.y = 50, 40
+    plot.width, plot.height = width - 70, height - 40 - top - 18
+    plot.data = [points or [(0, 0)] for points in plot_data]
+    for i in range(len(plot_data)):
+        plot.lines[i].strokeColor = colors.HexColor(series_colors[i % len(series_colors)])
+        plot.lines[i].strokeWidth = 1
+
+    if np.isfinite(x_min):
+        span = max(x_max - x_min, 1)
+        plot.xValueAxis.valueMin, plot.xValueAxis.valueMax = x_min, x_max
+        plot.xValueAxis.valueSteps = np.linspace(x_min, x_max, 6).tolist()
+        plot.xValueAxis.labelTextFormat = lambda value: _date_label(value, span)
+    plot.xValueAxis.labels.fontSize = 7
+    plot.yValueAxis.labels.fontSize = 7
+    plot.yValueAxis.visibleGrid = True
+    plot.yValueAxis.gridStrokeColor = colors.HexColor("#DDDDDD")
+    drawing.add(plot)
+
+    legend = LineLegend()
+    legend.x, legend.y = width - 160, height - top - 6
+    legend.fontSize = 7
+    legend.dx, legend.dy = 12, 2
+    legend.columnMaximum = 1
+    legend.alignment = "right"
+    legend.colorNamePairs = [(colors.HexColor(series_colors[i % len(series_colors)]), name)
+                             for i, (name, _, _) in enumerate(series)]
+    drawing.add(legend)
+
+    if title:
+        drawing.add(String(width / 2, height - 14, title, fontName="Helvetica-Bold", fontSize=10,
+                           textAnchor="middle"))
+    if y_label:
+        drawing.add(String(plot.x - 40, height - top - 8, y_label, fontSize=7))
+    return drawing
+
+
+def draw_line_chart(p, series, x, y, width=500, height=300, title=None, y_label=None):
+    """Draw a vector line chart straight onto a reportlab canvas"""
+    renderPDF.draw(build_line_drawing(series, width, height, title, y_label), p, x, y)